@@ -233,6 +233,16 @@ def _format_edit_file_description(
     )
 
 
+def _format_batch_edit_file_description(
+    tool_call: ToolCall, _state: AgentState, _runtime: Runtime
+) -> str:
+    """Format batch_edit_file tool call for approval prompt."""
+    edits = tool_call["args"].get("edits", [])
+    file_paths = [edit.get("file_path", "unknown") for edit in edits]
+
+    return f"Files: {', '.join(file_paths) or 'none'}\nAction: Replace text in {len(edits)} file(s)"
+
+
 def _format_web_search_description(
     tool_call: ToolCall, _state: AgentState, _runtime: Runtime
 ) -> str:
@@ -316,6 +326,11 @@ def _add_interrupt_on() -> dict[str, InterruptOnConfig]:
         "description": _format_edit_file_description,
     }
 
+    batch_edit_file_interrupt_config: InterruptOnConfig = {
+        "allowed_decisions": ["approve", "reject"],
+        "description": _format_batch_edit_file_description,
+    }
+
     web_search_interrupt_config: InterruptOnConfig = {
         "allowed_decisions": ["approve", "reject"],
         "description": _format_web_search_description,
@@ -335,6 +350,7 @@ def _add_interrupt_on() -> dict[str, InterruptOnConfig]:
         "execute": execute_interrupt_config,
         "write_file": write_file_interrupt_config,
         "edit_file": edit_file_interrupt_config,
+        "batch_edit_file": batch_edit_file_interrupt_config,
         "web_search": web_search_interrupt_config,
         "fetch_url": fetch_url_interrupt_config,
         "task": task_interrupt_config,
@@ -357,6 +357,40 @@ class CompositeBackend(BackendProtocol):
         results.sort(key=lambda x: x.get("path", ""))
         return results
 
+    def glob_paths(self, pattern: str, path: str = "/") -> list[str]:
+        """Get paths matching glob pattern, routing like `glob_info`."""
+        for route_prefix, backend in self.sorted_routes:
+            if path.startswith(route_prefix.rstrip("/")):
+                search_path = path[len(route_prefix) - 1 :]
+                prefix = route_prefix[:-1]
+                return [f"{prefix}{p}" for p in backend.glob_paths(pattern, search_path if search_path else "/")]
+
+        results = self.default.glob_paths(pattern, path)
+        for route_prefix, backend in self.routes.items():
+            prefix = route_prefix[:-1]
+            results.extend(f"{prefix}{p}" for p in backend.glob_paths(pattern, "/"))
+
+        # Deterministic ordering
+        results.sort()
+        return results
+
+    async def aglob_paths(self, pattern: str, path: str = "/") -> list[str]:
+        """Async version of glob_paths."""
+        for route_prefix, backend in self.sorted_routes:
+            if path.startswith(route_prefix.rstrip("/")):
+                search_path = path[len(route_prefix) - 1 :]
+                prefix = route_prefix[:-1]
+                return [f"{prefix}{p}" for p in await backend.aglob_paths(pattern, search_path if search_path else "/")]
+
+        results = await self.default.aglob_paths(pattern, path)
+        for route_prefix, backend in self.routes.items():
+            prefix = route_prefix[:-1]
+            results.extend(f"{prefix}{p}" for p in await backend.aglob_paths(pattern, "/"))
+
+        # Deterministic ordering
+        results.sort()
+        return results
+
     def write(
         self,
         file_path: str,
@@ -373,6 +373,22 @@ class BackendProtocol(abc.ABC):
         """Async version of glob_info."""
         return await asyncio.to_thread(self.glob_info, pattern, path)
 
+    def glob_paths(self, pattern: str, path: str = "/") -> list[str]:
+        """Find paths matching a glob pattern.
+
+        Same matching semantics as `glob_info`, but returns only the paths.
+        Backends that can produce paths without building FileInfo dicts
+        should override this.
+
+        Returns:
+            list of matching paths
+        """
+        return [fi.get("path", "") for fi in self.glob_info(pattern, path)]
+
+    async def aglob_paths(self, pattern: str, path: str = "/") -> list[str]:
+        """Async version of glob_paths."""
+        return [fi.get("path", "") for fi in await self.aglob_info(pattern, path)]
+
     def write(
         self,
         file_path: str,
@@ -397,6 +413,28 @@ class BackendProtocol(abc.ABC):
         """Async version of write."""
         return await asyncio.to_thread(self.write, file_path, content)
 
+    def write_many(self, files: list[tuple[str, str]]) -> list[WriteResult]:
+        """Write several new files in one call.
+
+        The default implementation calls `write` for each file. Backends with a
+        per-operation round trip (remote stores, sandboxes) can override this to
+        submit all writes at once.
+
+        Args:
+            files: List of (file_path, content) tuples to write.
+
+        Returns:
+            List of WriteResult objects, one per input file, in input order.
+        """
+        return [self.write(file_path, content) for file_path, content in files]
+
+    async def awrite_many(self, files: list[tuple[str, str]]) -> list[WriteResult]:
+        """Async version of write_many.
+
+        The default implementation runs `awrite` for all files concurrently.
+        """
+        return list(await asyncio.gather(*(self.awrite(file_path, content) for file_path, content in files)))
+
     def edit(
         self,
         file_path: str,
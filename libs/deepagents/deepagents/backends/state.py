@@ -74,7 +74,7 @@ class StateBackend(BackendProtocol):
                 continue
 
             # This is a file directly in the current directory
-            size = len("\n".join(fd.get("content", [])))
+            size = len(file_data_to_string(fd))
             infos.append(
                 {
                     "path": k,
@@ -183,7 +183,7 @@ class StateBackend(BackendProtocol):
         infos: list[FileInfo] = []
         for p in paths:
             fd = files.get(p)
-            size = len("\n".join(fd.get("content", []))) if fd else 0
+            size = len(file_data_to_string(fd)) if fd else 0
             infos.append(
                 {
                     "path": p,
@@ -194,6 +194,13 @@ class StateBackend(BackendProtocol):
             )
         return infos
 
+    def glob_paths(self, pattern: str, path: str = "/") -> list[str]:
+        """Get paths of files matching glob pattern."""
+        result = _glob_search_files(self.runtime.state.get("files", {}), pattern, path)
+        if result == "No files found":
+            return []
+        return result.split("\n")
+
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to state.
 
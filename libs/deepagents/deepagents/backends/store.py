@@ -106,7 +106,7 @@ class StoreBackend(BackendProtocol):
         Raises:
             ValueError: If required fields are missing or have incorrect types.
         """
-        if "content" not in store_item.value or not isinstance(store_item.value["content"], list):
+        if "content" not in store_item.value or not isinstance(store_item.value["content"], (str, list)):
             msg = f"Store item does not contain valid content field. Got: {store_item.value.keys()}"
             raise ValueError(msg)
         if "created_at" not in store_item.value or not isinstance(store_item.value["created_at"], str):
@@ -225,7 +225,7 @@ class StoreBackend(BackendProtocol):
                 fd = self._convert_store_item_to_file_data(item)
             except ValueError:
                 continue
-            size = len("\n".join(fd.get("content", [])))
+            size = len(file_data_to_string(fd))
             infos.append(
                 {
                     "path": item.key,
@@ -374,7 +374,7 @@ class StoreBackend(BackendProtocol):
         infos: list[FileInfo] = []
         for p in paths:
             fd = files.get(p)
-            size = len("\n".join(fd.get("content", []))) if fd else 0
+            size = len(file_data_to_string(fd)) if fd else 0
             infos.append(
                 {
                     "path": p,
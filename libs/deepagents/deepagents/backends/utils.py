@@ -5,7 +5,9 @@ helpers used by backends and the composite router. Structured helpers
 enable composition without fragile string parsing.
 """
 
+import io
 import re
+from collections.abc import Iterable
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Literal
@@ -26,13 +28,15 @@ FileInfo = _FileInfo
 GrepMatch = _GrepMatch
 
 
+_TOOL_CALL_ID_TRANSLATION = str.maketrans({".": "_", "/": "_", "\\": "_"})
+
+
 def sanitize_tool_call_id(tool_call_id: str) -> str:
     r"""Sanitize tool_call_id to prevent path traversal and separator issues.
 
     Replaces dangerous characters (., /, \) with underscores.
     """
-    sanitized = tool_call_id.replace(".", "_").replace("/", "_").replace("\\", "_")
-    return sanitized
+    return tool_call_id.translate(_TOOL_CALL_ID_TRANSLATION)
 
 
 def format_content_with_line_numbers(
@@ -57,28 +61,45 @@ def format_content_with_line_numbers(
     else:
         lines = content
 
-    result_lines = []
-    for i, line in enumerate(lines):
-        line_num = i + start_line
+    buf = io.StringIO()
+    format_content_with_line_numbers_to_buffer(lines, buf, start_line=start_line)
+    return buf.getvalue()
+
+
+def format_content_with_line_numbers_to_buffer(
+    lines: Iterable[str],
+    buf: io.StringIO,
+    start_line: int = 1,
+) -> None:
+    """Write lines into `buf` with line numbers (cat -n style).
 
+    Same output as `format_content_with_line_numbers`, but each line is written
+    straight into the buffer instead of being formatted into an intermediate
+    list and joined.
+
+    Args:
+        lines: Lines to format, without trailing newlines
+        buf: Buffer to write the formatted output into
+        start_line: Line number of the first line (default: 1)
+    """
+    write = buf.write
+    separator = ""
+    for line_num, line in enumerate(lines, start_line):
+        write(separator)
+        separator = "\n"
         if len(line) <= MAX_LINE_LENGTH:
-            result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{line}")
-        else:
-            # Split long line into chunks with continuation markers
-            num_chunks = (len(line) + MAX_LINE_LENGTH - 1) // MAX_LINE_LENGTH
-            for chunk_idx in range(num_chunks):
-                start = chunk_idx * MAX_LINE_LENGTH
-                end = min(start + MAX_LINE_LENGTH, len(line))
-                chunk = line[start:end]
-                if chunk_idx == 0:
-                    # First chunk: use normal line number
-                    result_lines.append(f"{line_num:{LINE_NUMBER_WIDTH}d}\t{chunk}")
-                else:
-                    # Continuation chunks: use decimal notation (e.g., 5.1, 5.2)
-                    continuation_marker = f"{line_num}.{chunk_idx}"
-                    result_lines.append(f"{continuation_marker:>{LINE_NUMBER_WIDTH}}\t{chunk}")
-
-    return "\n".join(result_lines)
+            write(f"{line_num:{LINE_NUMBER_WIDTH}d}\t")
+            write(line)
+            continue
+
+        # Split long line into chunks with continuation markers
+        write(f"{line_num:{LINE_NUMBER_WIDTH}d}\t")
+        write(line[:MAX_LINE_LENGTH])
+        for chunk_idx, start in enumerate(range(MAX_LINE_LENGTH, len(line), MAX_LINE_LENGTH), 1):
+            # Continuation chunks: use decimal notation (e.g., 5.1, 5.2)
+            continuation_marker = f"{line_num}.{chunk_idx}"
+            write(f"\n{continuation_marker:>{LINE_NUMBER_WIDTH}}\t")
+            write(line[start : start + MAX_LINE_LENGTH])
 
 
 def check_empty_content(content: str) -> str | None:
@@ -98,13 +119,32 @@ def check_empty_content(content: str) -> str | None:
 def file_data_to_string(file_data: dict[str, Any]) -> str:
     """Convert FileData to plain string content.
 
+    Args:
+        file_data: FileData dict with 'content' key. Content stored in the
+            legacy list-of-lines format is joined with newlines.
+
+    Returns:
+        Content as a single string
+    """
+    content = file_data.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "\n".join(content)
+
+
+def file_data_lines(file_data: dict[str, Any]) -> list[str]:
+    """Split FileData content into lines.
+
     Args:
         file_data: FileData dict with 'content' key
 
     Returns:
-        Content as string with lines joined by newlines
+        Lines of the file, split on newlines
     """
-    return "\n".join(file_data["content"])
+    content = file_data.get("content", "")
+    if isinstance(content, str):
+        return content.split("\n")
+    return content
 
 
 def create_file_data(content: str, created_at: str | None = None) -> dict[str, Any]:
@@ -117,11 +157,10 @@ def create_file_data(content: str, created_at: str | None = None) -> dict[str, A
     Returns:
         FileData dict with content and timestamps
     """
-    lines = content.split("\n") if isinstance(content, str) else content
     now = datetime.now(UTC).isoformat()
 
     return {
-        "content": lines,
+        "content": content if isinstance(content, str) else "\n".join(content),
         "created_at": created_at or now,
         "modified_at": now,
     }
@@ -137,11 +176,10 @@ def update_file_data(file_data: dict[str, Any], content: str) -> dict[str, Any]:
     Returns:
         Updated FileData dict
     """
-    lines = content.split("\n") if isinstance(content, str) else content
     now = datetime.now(UTC).isoformat()
 
     return {
-        "content": lines,
+        "content": content if isinstance(content, str) else "\n".join(content),
         "created_at": file_data["created_at"],
         "modified_at": now,
     }
@@ -347,7 +385,7 @@ def _grep_search_files(
 
     Example:
         ```python
-        files = {"/file.py": FileData(content=["import os", "print('hi')"], ...)}
+        files = {"/file.py": FileData(content="import os\nprint('hi')", ...)}
         _grep_search_files(files, "import", "/")
         # Returns: "/file.py" (with output_mode="files_with_matches")
         ```
@@ -369,7 +407,7 @@ def _grep_search_files(
 
     results: dict[str, list[tuple[int, str]]] = {}
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
+        for line_num, line in enumerate(file_data_lines(file_data), 1):
             if regex.search(line):
                 if file_path not in results:
                     results[file_path] = []
@@ -412,7 +450,7 @@ def grep_matches_from_files(
 
     matches: list[GrepMatch] = []
     for file_path, file_data in filtered.items():
-        for line_num, line in enumerate(file_data["content"], 1):
+        for line_num, line in enumerate(file_data_lines(file_data), 1):
             if regex.search(line):
                 matches.append({"path": file_path, "line": int(line_num), "text": line})
     return matches
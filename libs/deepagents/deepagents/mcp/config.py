@@ -113,6 +113,35 @@ class MCPServerConfig(BaseModel):
         description="Enable prompt fetching tools",
     )
 
+    # Lazy loading
+    lazy: bool = Field(
+        default=False,
+        description="Defer connecting until the agent first uses this server; exposes list/call proxy tools instead of one tool per server tool",
+    )
+
+    max_resource_bytes: int | None = Field(
+        default=10 * 1024 * 1024,
+        ge=1,
+        description="Truncate resources larger than this many bytes (characters for text resources; None = unlimited)",
+    )
+
+    # Session reuse for resource/prompt tools
+    session_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of sessions kept open for resource/prompt tools",
+    )
+    session_idle_timeout_s: float = Field(
+        default=60.0,
+        ge=0,
+        description="Close a pooled session after this many idle seconds (0 = close after each call)",
+    )
+    session_max_reuse: int | None = Field(
+        default=None,
+        ge=1,
+        description="Recycle a pooled session after this many calls (None = unlimited)",
+    )
+
     # Tenant readiness fields
     tenant_mode: TenantMode = Field(
         default=TenantMode.SINGLE,
@@ -223,6 +252,11 @@ class MCPConfig(BaseModel):
         default=FailBehavior.FAIL_OPEN,
         description="Default behavior when server connections fail",
     )
+    max_parallel_connections: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum number of servers connected to concurrently while loading tools",
+    )
 
     model_config = {"extra": "forbid"}
 
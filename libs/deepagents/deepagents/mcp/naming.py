@@ -7,6 +7,8 @@ deterministic and unique tool names across multiple MCP servers.
 from __future__ import annotations
 
 import re
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 
@@ -67,6 +69,21 @@ def create_prefixed_name(server_name: str, tool_name: str, separator: str = "_")
     return f"{prefix}{separator}{normalized_tool}"
 
 
+def resolve_tool_name(original_name: str, prefix: str = "") -> str:
+    """Resolve the final name of a tool.
+
+    Args:
+        original_name: Original tool name from MCP server.
+        prefix: Prefix to apply (empty string for no prefix).
+
+    Returns:
+        The prefixed name, or the normalized original name without a prefix.
+    """
+    if prefix:
+        return create_prefixed_name(prefix, original_name)
+    return normalize_tool_name(original_name)
+
+
 class ToolNameRegistry:
     """Registry for tracking tool names and detecting collisions.
 
@@ -98,10 +115,7 @@ class ToolNameRegistry:
         Raises:
             ValueError: If the tool name collides with an existing tool.
         """
-        if prefix:
-            prefixed_name = create_prefixed_name(prefix, original_name)
-        else:
-            prefixed_name = normalize_tool_name(original_name)
+        prefixed_name = resolve_tool_name(original_name, prefix)
 
         # Check for collision
         if prefixed_name in self._tools:
@@ -123,6 +137,39 @@ class ToolNameRegistry:
         self._tools[prefixed_name] = info
         return info
 
+    def register_tools(self, entries: Sequence[tuple[str, str, str]]) -> list[ToolNameInfo | ValueError]:
+        """Register a batch of tools, resolving collisions in one pass.
+
+        Names are resolved and counted up front, so tools whose name is unique
+        are registered directly. When names collide, the first entry wins, the
+        same as registering the entries one by one.
+
+        Args:
+            entries: `(original_name, server_name, prefix)` tuples, in priority order.
+
+        Returns:
+            One result per entry: its ToolNameInfo, or the collision ValueError.
+        """
+        names = [resolve_tool_name(original_name, prefix) for original_name, _, prefix in entries]
+        counts = Counter(names)
+        results: list[ToolNameInfo | ValueError] = []
+        for (original_name, server_name, prefix), prefixed_name in zip(entries, names, strict=True):
+            if counts[prefixed_name] == 1 and prefixed_name not in self._tools:
+                info = ToolNameInfo(
+                    original_name=original_name,
+                    server_name=server_name,
+                    prefixed_name=prefixed_name,
+                    prefix=prefix,
+                )
+                self._tools[prefixed_name] = info
+                results.append(info)
+                continue
+            try:
+                results.append(self.register_tool(original_name, server_name, prefix))
+            except ValueError as e:
+                results.append(e)
+        return results
+
     def get_all_tools(self) -> dict[str, ToolNameInfo]:
         """Get all registered tools.
 
@@ -17,7 +17,7 @@ from deepagents.middleware.filesystem import FilesystemMiddleware
 from deepagents.middleware.image_generation import ImageGenerationMiddleware
 from deepagents.middleware.memory import MemoryMiddleware
 from deepagents.middleware.patch_tool_calls import PatchToolCallsMiddleware
-from deepagents.middleware.prompt_caching import PromptCachingMiddleware
+from deepagents.middleware.prompt_caching import PromptCachingMiddleware, create_prompt_caching_middleware
 from deepagents.middleware.skills import SkillsMiddleware
 from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
 from deepagents.middleware.utilities import UtilitiesMiddleware
@@ -41,6 +41,7 @@ __all__ = [
     "UtilitiesMiddleware",
     "ValidationResult",
     "WebMiddleware",
+    "create_prompt_caching_middleware",
     "get_librarian_subagent",
     "get_oracle_subagent",
     "validate_middleware_stack",
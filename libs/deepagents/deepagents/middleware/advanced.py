@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import mimetypes
+import re
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -16,6 +18,10 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; bound methods skip the per-call attribute lookup
+_WORD_FINDALL = re.compile(r"\b\w+\b").findall
+_WINDOWS_DRIVE_MATCH = re.compile(r"^[A-Za-z]:\\").match
+
 # --- Tool Descriptions ---
 
 FINDER_DESCRIPTION = """Semantic codebase search - find code by functionality, not just text.
@@ -209,9 +215,7 @@ async def _keyword_grep_search(query: str, backend: BackendProtocol) -> str:
     Returns:
         Formatted results.
     """
-    import re
-
-    words = re.findall(r"\b\w+\b", query.lower())
+    words = _WORD_FINDALL(query.lower())
     stopwords = {
         "the",
         "a",
@@ -364,9 +368,7 @@ async def _look_at_file(
     Returns:
         Analysis result or file info.
     """
-    import mimetypes
     import os
-    import re
 
     # Determine file type
     suffix = Path(path).suffix.lower()
@@ -379,7 +381,7 @@ async def _look_at_file(
     # On Windows: C:\... or D:\...
     # On Unix: /home/... /Users/... etc.
     is_absolute_external = (
-        (os.name == "nt" and re.match(r"^[A-Za-z]:\\", path))  # Windows absolute
+        (os.name == "nt" and _WINDOWS_DRIVE_MATCH(path) is not None)  # Windows absolute
         or (os.name != "nt" and path.startswith("/") and not path.startswith("/workspace"))  # Unix absolute
     )
 
@@ -12,7 +12,6 @@ proper ordering to prevent conflicts and token bloat.
 
 from __future__ import annotations
 
-import logging
 from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import TYPE_CHECKING
@@ -20,8 +19,6 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from langchain.agents.middleware.types import AgentMiddleware
 
-logger = logging.getLogger(__name__)
-
 
 class MiddlewarePhase(IntEnum):
     """Canonical ordering phases for middleware.
@@ -142,7 +139,7 @@ MIDDLEWARE_CONTRACTS: dict[str, MiddlewareContract] = {
         phase=MiddlewarePhase.TOOL_REGISTRATION,
         injects_prompt=True,
         registers_tools=True,
-        tool_names=["ls", "read_file", "write_file", "edit_file", "glob", "grep", "execute"],
+        tool_names=["ls", "read_file", "write_file", "edit_file", "batch_edit_file", "glob", "grep", "execute"],
         prompt_budget=PromptBudget(max_tokens=800, priority=90),
         description="Provides filesystem and execution tools",
     ),
@@ -1,9 +1,11 @@
 """Middleware for providing filesystem tools to an agent."""
 
-import os
-import re
+import functools
+import mimetypes
+import posixpath
+import sys
 from collections.abc import Awaitable, Callable, Sequence
-from typing import Annotated, Literal, NotRequired
+from typing import Annotated, Any, Literal, NotRequired
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -18,13 +20,15 @@ from langchain_core.tools import BaseTool, StructuredTool
 from langgraph.types import Command
 from typing_extensions import TypedDict
 
-from deepagents.backends import StateBackend
+from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend
 
 # Re-export type here for backwards compatibility
 from deepagents.backends.protocol import BACKEND_TYPES as BACKEND_TYPES
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
+    ExecuteResponse,
+    GrepMatch,
     SandboxBackendProtocol,
     WriteResult,
 )
@@ -40,13 +44,19 @@ MAX_LINE_LENGTH = 2000
 LINE_NUMBER_WIDTH = 6
 DEFAULT_READ_OFFSET = 0
 DEFAULT_READ_LIMIT = 500
+MAX_INTERNED_PATH_LENGTH = 256
 
 
 class FileData(TypedDict):
-    """Data structure for storing file contents with metadata."""
+    """Data structure for storing file contents with metadata.
 
-    content: list[str]
-    """Lines of the file."""
+    This stays a plain dict rather than a slotted dataclass: the `files` channel is
+    checkpointed and mirrored into `BaseStore` items, both of which expect
+    JSON-compatible values.
+    """
+
+    content: str | list[str]
+    """Contents of the file. Older state may still hold a list of lines."""
 
     created_at: str
     """ISO 8601 timestamp of file creation."""
@@ -55,6 +65,32 @@ class FileData(TypedDict):
     """ISO 8601 timestamp of last modification."""
 
 
+class EditSpec(TypedDict):
+    """A single string replacement for the batch_edit_file tool."""
+
+    file_path: str
+    """Absolute path of the file to edit."""
+
+    old_string: str
+    """Exact text to replace."""
+
+    new_string: str
+    """Replacement text."""
+
+    replace_all: NotRequired[bool]
+    """Replace every occurrence instead of requiring a unique match."""
+
+
+def _intern_path(path: str) -> str:
+    """Intern a file path so repeated state keys share a single string object.
+
+    Long paths are returned unchanged to keep the interned set bounded.
+    """
+    if len(path) < MAX_INTERNED_PATH_LENGTH:
+        return sys.intern(path)
+    return path
+
+
 def _file_data_reducer(left: dict[str, FileData] | None, right: dict[str, FileData | None]) -> dict[str, FileData]:
     """Merge file updates with support for deletions.
 
@@ -79,18 +115,73 @@ def _file_data_reducer(left: dict[str, FileData] | None, right: dict[str, FileDa
         # Result: {"/file1.txt": FileData(...), "/file3.txt": FileData(...)}
         ```
     """
-    if left is None:
-        return {k: v for k, v in right.items() if v is not None}
+    if not right:
+        return dict(left) if left else {}
 
-    result = {**left}
+    # One pass handles overwrites and deletions; merged keys are interned
+    # even when they didn't come through _validate_path.
+    result: dict[str, FileData] = left.copy() if left else {}
     for key, value in right.items():
         if value is None:
             result.pop(key, None)
         else:
-            result[key] = value
+            result[_intern_path(key)] = value
     return result
 
 
+def _has_windows_drive(path: str) -> bool:
+    """Check whether a path starts with a Windows drive letter (e.g. `C:`)."""
+    if len(path) < 2 or path[1] != ":":
+        return False
+    c = path[0]
+    return ("A" <= c <= "Z") or ("a" <= c <= "z")
+
+
+def _is_normalized_virtual_path(path: str) -> bool:
+    """Check whether a virtual path is already in canonical form.
+
+    Most paths coming from the agent look like `/dir/file.ext` and would come
+    out of `os.path.normpath` unchanged. Callers must reject `..` first.
+
+    Args:
+        path: The path to check.
+
+    Returns:
+        True if the path starts with `/` and has no backslashes, empty or `.`
+        segments, or trailing slash.
+    """
+    return path.startswith("/") and "\\" not in path and "//" not in path and "/./" not in path and (path == "/" or not path.endswith(("/", "/.")))
+
+
+def _collapse_path_segments(path: str) -> str:
+    """Normalize separators and drop empty and `.` segments.
+
+    A cheaper stand-in for `os.path.normpath` that only handles what can
+    remain once `..` has been rejected: backslashes, repeated slashes, `.`
+    segments and a trailing slash.
+
+    Args:
+        path: The path to normalize. Must not contain `..`.
+
+    Returns:
+        The path with forward slashes only and no empty or `.` segments.
+    """
+    normalized = path.replace("\\", "/")
+    while "//" in normalized:
+        normalized = normalized.replace("//", "/")
+    while "/./" in normalized:
+        normalized = normalized.replace("/./", "/")
+    normalized = normalized.removeprefix("./")
+    if normalized == ".":
+        return ""
+    if normalized.endswith("/."):
+        normalized = normalized[:-1]
+    # Keep the slash of a bare root ("/" or "C:/")
+    if len(normalized) > 1 and normalized.endswith("/") and normalized[-2] != ":":
+        normalized = normalized[:-1]
+    return normalized
+
+
 def _validate_path(
     path: str,
     *,
@@ -111,8 +202,9 @@ def _validate_path(
 
     Args:
         path: The path to validate and normalize.
-        allowed_prefixes: Optional list of allowed path prefixes. If provided,
-            the normalized path must start with one of these prefixes.
+        allowed_prefixes: Optional sequence of allowed path prefixes. If provided,
+            the normalized path must start with one of these prefixes. Passing
+            a tuple avoids a conversion on every call.
         allow_native_absolute: If True, allow native absolute paths (including
             Windows paths like C:\...) and return them normalized but not
             converted to virtual paths. This is useful for local filesystem
@@ -139,34 +231,58 @@ def _validate_path(
         _validate_path("/etc/file.txt", allowed_prefixes=["/data/"])  # Raises ValueError
         ```
     """
-    if ".." in path or path.startswith("~"):
-        msg = f"Path traversal not allowed: {path}"
-        raise ValueError(msg)
+    prefixes = allowed_prefixes if allowed_prefixes is None or isinstance(allowed_prefixes, tuple) else tuple(allowed_prefixes)
+    ok, value = _validate_path_cached(path, prefixes, allow_native_absolute)
+    if not ok:
+        raise ValueError(value)
+    return value
 
-    # Check for Windows absolute paths (e.g., C:\..., D:/...)
-    is_windows_absolute = bool(re.match(r"^[a-zA-Z]:", path))
 
-    if is_windows_absolute:
-        if not allow_native_absolute:
-            msg = f"Windows absolute paths are not supported: {path}. Please use virtual paths starting with / (e.g., /workspace/file.txt)"
-            raise ValueError(msg)
-        # For native absolute paths, normalize but preserve the drive letter
-        normalized = os.path.normpath(path)
-        normalized = normalized.replace("\\", "/")
-        # Skip prefix checks for native absolute paths
-        return normalized
+@functools.lru_cache(maxsize=4096)
+def _validate_path_cached(
+    path: str,
+    allowed_prefixes: tuple[str, ...] | None,
+    allow_native_absolute: bool,
+) -> tuple[bool, str]:
+    """Memoized implementation of `_validate_path`.
 
-    normalized = os.path.normpath(path)
-    normalized = normalized.replace("\\", "/")
+    Validation is pure in its arguments, and agents tend to touch the same few
+    paths repeatedly. Rejections are returned rather than raised so they are
+    cached too.
 
-    if not normalized.startswith("/"):
-        normalized = f"/{normalized}"
+    Returns:
+        `(True, normalized_path)` on success, `(False, error_message)` otherwise.
+    """
+    if ".." in path or path.startswith("~"):
+        return False, f"Path traversal not allowed: {path}"
+
+    if _is_normalized_virtual_path(path):
+        # Fast path: already canonical, nothing to normalize
+        normalized = path
+    else:
+        # Check for Windows absolute paths (e.g., C:\..., D:/...)
+        is_windows_absolute = _has_windows_drive(path)
+
+        if is_windows_absolute:
+            if not allow_native_absolute:
+                return (
+                    False,
+                    f"Windows absolute paths are not supported: {path}. Please use virtual paths starting with / (e.g., /workspace/file.txt)",
+                )
+            # For native absolute paths, normalize but preserve the drive letter
+            # Skip prefix checks for native absolute paths
+            return True, _collapse_path_segments(path)
 
-    if allowed_prefixes is not None and not any(normalized.startswith(prefix) for prefix in allowed_prefixes):
-        msg = f"Path must start with one of {allowed_prefixes}: {path}"
-        raise ValueError(msg)
+        normalized = _collapse_path_segments(path)
 
-    return normalized
+        if not normalized.startswith("/"):
+            normalized = f"/{normalized}"
+
+    # str.startswith checks a whole tuple of prefixes in one C-level call
+    if allowed_prefixes is not None and not normalized.startswith(allowed_prefixes):
+        return False, f"Path must start with one of {list(allowed_prefixes)}: {path}"
+
+    return True, _intern_path(normalized)
 
 
 class FilesystemState(AgentState):
@@ -247,6 +363,19 @@ Best practices:
 - Only use emojis if the user explicitly requests it"""
 
 
+BATCH_EDIT_FILE_TOOL_DESCRIPTION = """Performs several exact string replacements in one call.
+
+Usage:
+- `edits` is a list of edits, each with `file_path`, `old_string`, `new_string` and optional `replace_all`
+- Each edit follows the same rules as `edit_file`: the file MUST exist, `old_string` MUST be unique unless `replace_all=true`
+- Each file may appear at most once per batch; combine changes to the same file into a single edit or use separate calls
+- Edits are applied in order and reported individually; a failing edit does not undo earlier ones
+
+Best practices:
+- Prefer this over many sequential `edit_file` calls when applying scripted or mechanical changes across files
+- Use `edit_file` when you need to inspect the result of one edit before making the next"""
+
+
 WRITE_FILE_TOOL_DESCRIPTION = """Create or overwrite a file in the filesystem.
 
 Use this tool when:
@@ -455,7 +584,7 @@ Examples:
     - Create directory: mkdir(path="/projects/new_project")
     - Create nested: mkdir(path="/a/b/c/d")  # Creates all parent directories"""
 
-FILESYSTEM_SYSTEM_PROMPT = """## Filesystem Tools `ls`, `read_file`, `write_file`, `edit_file`, `glob`, `grep`, `move_file`, `copy_file`, `delete_file`, `mkdir`
+FILESYSTEM_SYSTEM_PROMPT = """## Filesystem Tools `ls`, `read_file`, `write_file`, `edit_file`, `batch_edit_file`, `glob`, `grep`, `move_file`, `copy_file`, `delete_file`, `mkdir`
 
 You have access to a filesystem which you can interact with using these tools.
 All file paths must start with a /.
@@ -464,6 +593,7 @@ All file paths must start with a /.
 - read_file: read a file from the filesystem
 - write_file: write to a file in the filesystem
 - edit_file: edit a file in the filesystem
+- batch_edit_file: apply edits to several files in one call
 - glob: find files matching a pattern (e.g., "**/*.py")
 - grep: search for text within files
 - move_file: move or rename a file/directory
@@ -479,19 +609,14 @@ Use this tool to run commands, scripts, tests, builds, and other shell operation
 - execute: run a shell command in the sandbox (returns output and exit code)"""
 
 
-def _get_backend(backend: BACKEND_TYPES, runtime: ToolRuntime) -> BackendProtocol:
-    """Get the resolved backend instance from backend or factory.
+# Prompt used when the execute tool is available, joined once at import
+_FILESYSTEM_WITH_EXECUTION_SYSTEM_PROMPT = f"{FILESYSTEM_SYSTEM_PROMPT}\n\n{EXECUTION_SYSTEM_PROMPT}"
 
-    Args:
-        backend: Backend instance or factory function.
-        runtime: The tool runtime context.
 
-    Returns:
-        Resolved backend instance.
-    """
-    if callable(backend):
-        return backend(runtime)
-    return backend
+def _tool_name(tool: BaseTool | dict[str, Any]) -> str | None:
+    """Get the name of a tool or tool dict."""
+    name = getattr(tool, "name", None)
+    return name if name is not None else tool.get("name")
 
 
 def _supports_native_paths(resolved_backend: BackendProtocol) -> bool:
@@ -507,10 +632,6 @@ def _supports_native_paths(resolved_backend: BackendProtocol) -> bool:
     Returns:
         True if native absolute paths are supported, False otherwise.
     """
-    # Import here to avoid circular imports
-    from deepagents.backends.composite import CompositeBackend
-    from deepagents.backends.filesystem import FilesystemBackend
-
     # Check if it's a FilesystemBackend with virtual_mode=False
     if isinstance(resolved_backend, FilesystemBackend):
         return not resolved_backend.virtual_mode
@@ -522,6 +643,32 @@ def _supports_native_paths(resolved_backend: BackendProtocol) -> bool:
     return False
 
 
+def _make_backend_resolver(
+    backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
+) -> Callable[[ToolRuntime], tuple[BackendProtocol, bool]]:
+    """Build a function resolving the backend and its native path support for a tool call.
+
+    When `backend` is a concrete instance the result never changes, so it is
+    computed once here instead of on every tool invocation.
+
+    Args:
+        backend: Backend instance or factory function.
+
+    Returns:
+        Function mapping a tool runtime to `(resolved_backend, allow_native_paths)`.
+    """
+    if callable(backend):
+
+        def resolve(runtime: ToolRuntime) -> tuple[BackendProtocol, bool]:
+            resolved_backend = backend(runtime)
+            return resolved_backend, _supports_native_paths(resolved_backend)
+
+        return resolve
+
+    resolved = (backend, _supports_native_paths(backend))
+    return lambda _runtime: resolved
+
+
 def _ls_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
@@ -536,11 +683,11 @@ def _ls_tool_generator(
         Configured ls tool that lists files using the backend.
     """
     tool_description = custom_description or LIST_FILES_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_ls(runtime: ToolRuntime[None, FilesystemState], path: str) -> str:
         """Synchronous wrapper for ls tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         validated_path = _validate_path(path, allow_native_absolute=allow_native)
         infos = resolved_backend.ls_info(validated_path)
         paths = [fi.get("path", "") for fi in infos]
@@ -549,8 +696,7 @@ def _ls_tool_generator(
 
     async def async_ls(runtime: ToolRuntime[None, FilesystemState], path: str) -> str:
         """Asynchronous wrapper for ls tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         validated_path = _validate_path(path, allow_native_absolute=allow_native)
         infos = await resolved_backend.als_info(validated_path)
         paths = [fi.get("path", "") for fi in infos]
@@ -579,6 +725,7 @@ def _read_file_tool_generator(
         Configured read_file tool that reads files using the backend.
     """
     tool_description = custom_description or READ_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_read_file(
         file_path: str,
@@ -587,8 +734,7 @@ def _read_file_tool_generator(
         limit: int = DEFAULT_READ_LIMIT,
     ) -> str:
         """Synchronous wrapper for read_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         return resolved_backend.read(file_path, offset=offset, limit=limit)
 
@@ -599,8 +745,7 @@ def _read_file_tool_generator(
         limit: int = DEFAULT_READ_LIMIT,
     ) -> str:
         """Asynchronous wrapper for read_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         return await resolved_backend.aread(file_path, offset=offset, limit=limit)
 
@@ -612,6 +757,20 @@ def _read_file_tool_generator(
     )
 
 
+_WRITE_SUCCESS_MSG = "Updated file {}"
+_EDIT_SUCCESS_MSG = "Successfully replaced {} instance(s) of the string in '{}'"
+
+
+def _files_update_command(files_update: dict[str, FileData | None], content: str, tool_call_id: str | None) -> Command:
+    """Wrap a backend `files_update` and its tool result into a state update."""
+    return Command(
+        update={
+            "files": files_update,
+            "messages": [ToolMessage(content=content, tool_call_id=tool_call_id)],
+        }
+    )
+
+
 def _write_file_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
@@ -626,6 +785,7 @@ def _write_file_tool_generator(
         Configured write_file tool that creates new files using the backend.
     """
     tool_description = custom_description or WRITE_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_write_file(
         file_path: str,
@@ -633,26 +793,15 @@ def _write_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> Command | str:
         """Synchronous wrapper for write_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         res: WriteResult = resolved_backend.write(file_path, content)
         if res.error:
             return res.error
         # If backend returns state update, wrap into Command with ToolMessage
         if res.files_update is not None:
-            return Command(
-                update={
-                    "files": res.files_update,
-                    "messages": [
-                        ToolMessage(
-                            content=f"Updated file {res.path}",
-                            tool_call_id=runtime.tool_call_id,
-                        )
-                    ],
-                }
-            )
-        return f"Updated file {res.path}"
+            return _files_update_command(res.files_update, _WRITE_SUCCESS_MSG.format(res.path), runtime.tool_call_id)
+        return _WRITE_SUCCESS_MSG.format(res.path)
 
     async def async_write_file(
         file_path: str,
@@ -660,26 +809,15 @@ def _write_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> Command | str:
         """Asynchronous wrapper for write_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         res: WriteResult = await resolved_backend.awrite(file_path, content)
         if res.error:
             return res.error
         # If backend returns state update, wrap into Command with ToolMessage
         if res.files_update is not None:
-            return Command(
-                update={
-                    "files": res.files_update,
-                    "messages": [
-                        ToolMessage(
-                            content=f"Updated file {res.path}",
-                            tool_call_id=runtime.tool_call_id,
-                        )
-                    ],
-                }
-            )
-        return f"Updated file {res.path}"
+            return _files_update_command(res.files_update, _WRITE_SUCCESS_MSG.format(res.path), runtime.tool_call_id)
+        return _WRITE_SUCCESS_MSG.format(res.path)
 
     return StructuredTool.from_function(
         name="write_file",
@@ -703,6 +841,7 @@ def _edit_file_tool_generator(
         Configured edit_file tool that performs string replacements in files using the backend.
     """
     tool_description = custom_description or EDIT_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_edit_file(
         file_path: str,
@@ -713,25 +852,14 @@ def _edit_file_tool_generator(
         replace_all: bool = False,
     ) -> Command | str:
         """Synchronous wrapper for edit_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         res: EditResult = resolved_backend.edit(file_path, old_string, new_string, replace_all=replace_all)
         if res.error:
             return res.error
         if res.files_update is not None:
-            return Command(
-                update={
-                    "files": res.files_update,
-                    "messages": [
-                        ToolMessage(
-                            content=f"Successfully replaced {res.occurrences} instance(s) of the string in '{res.path}'",
-                            tool_call_id=runtime.tool_call_id,
-                        )
-                    ],
-                }
-            )
-        return f"Successfully replaced {res.occurrences} instance(s) of the string in '{res.path}'"
+            return _files_update_command(res.files_update, _EDIT_SUCCESS_MSG.format(res.occurrences, res.path), runtime.tool_call_id)
+        return _EDIT_SUCCESS_MSG.format(res.occurrences, res.path)
 
     async def async_edit_file(
         file_path: str,
@@ -742,25 +870,14 @@ def _edit_file_tool_generator(
         replace_all: bool = False,
     ) -> Command | str:
         """Asynchronous wrapper for edit_file tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        allow_native = _supports_native_paths(resolved_backend)
+        resolved_backend, allow_native = resolve_backend(runtime)
         file_path = _validate_path(file_path, allow_native_absolute=allow_native)
         res: EditResult = await resolved_backend.aedit(file_path, old_string, new_string, replace_all=replace_all)
         if res.error:
             return res.error
         if res.files_update is not None:
-            return Command(
-                update={
-                    "files": res.files_update,
-                    "messages": [
-                        ToolMessage(
-                            content=f"Successfully replaced {res.occurrences} instance(s) of the string in '{res.path}'",
-                            tool_call_id=runtime.tool_call_id,
-                        )
-                    ],
-                }
-            )
-        return f"Successfully replaced {res.occurrences} instance(s) of the string in '{res.path}'"
+            return _files_update_command(res.files_update, _EDIT_SUCCESS_MSG.format(res.occurrences, res.path), runtime.tool_call_id)
+        return _EDIT_SUCCESS_MSG.format(res.occurrences, res.path)
 
     return StructuredTool.from_function(
         name="edit_file",
@@ -770,6 +887,106 @@ def _edit_file_tool_generator(
     )
 
 
+def _batch_edit_file_tool_generator(
+    backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
+    custom_description: str | None = None,
+) -> BaseTool:
+    """Generate the batch_edit_file tool.
+
+    Applies several edits and returns a single state update, so backends that
+    return `files_update` (e.g. StateBackend) go through the files reducer once
+    per batch instead of once per edit.
+
+    Args:
+        backend: Backend to use for file storage, or a factory function that takes runtime and returns a backend.
+        custom_description: Optional custom description for the tool.
+
+    Returns:
+        Configured batch_edit_file tool that performs string replacements across files using the backend.
+    """
+    tool_description = custom_description or BATCH_EDIT_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
+
+    def _validate_edits(edits: list[EditSpec], allow_native: bool) -> list[str] | str:
+        """Validate edit paths, returning them or an error message."""
+        file_paths = []
+        seen: set[str] = set()
+        for edit in edits:
+            file_path = _validate_path(edit["file_path"], allow_native_absolute=allow_native)
+            if file_path in seen:
+                return f"Error: '{file_path}' appears more than once in the batch. Combine edits to the same file or use separate calls."
+            seen.add(file_path)
+            file_paths.append(file_path)
+        return file_paths
+
+    def _build_result(
+        messages: list[str],
+        files_update: dict[str, FileData],
+        runtime: ToolRuntime[None, FilesystemState],
+    ) -> Command | str:
+        """Combine per-edit messages and state updates into one tool result."""
+        content = "\n".join(messages)
+        if files_update:
+            return _files_update_command(files_update, content, runtime.tool_call_id)
+        return content
+
+    def sync_batch_edit_file(
+        edits: list[EditSpec],
+        runtime: ToolRuntime[None, FilesystemState],
+    ) -> Command | str:
+        """Synchronous wrapper for batch_edit_file tool."""
+        resolved_backend, allow_native = resolve_backend(runtime)
+        file_paths = _validate_edits(edits, allow_native)
+        if isinstance(file_paths, str):
+            return file_paths
+        messages = []
+        files_update: dict[str, FileData] = {}
+        for edit, file_path in zip(edits, file_paths, strict=True):
+            res: EditResult = resolved_backend.edit(file_path, edit["old_string"], edit["new_string"], replace_all=edit.get("replace_all", False))
+            if res.error:
+                messages.append(res.error)
+                continue
+            if res.files_update is not None:
+                files_update.update(res.files_update)
+            messages.append(_EDIT_SUCCESS_MSG.format(res.occurrences, res.path))
+        return _build_result(messages, files_update, runtime)
+
+    async def async_batch_edit_file(
+        edits: list[EditSpec],
+        runtime: ToolRuntime[None, FilesystemState],
+    ) -> Command | str:
+        """Asynchronous wrapper for batch_edit_file tool."""
+        resolved_backend, allow_native = resolve_backend(runtime)
+        file_paths = _validate_edits(edits, allow_native)
+        if isinstance(file_paths, str):
+            return file_paths
+        messages = []
+        files_update: dict[str, FileData] = {}
+        for edit, file_path in zip(edits, file_paths, strict=True):
+            res: EditResult = await resolved_backend.aedit(
+                file_path, edit["old_string"], edit["new_string"], replace_all=edit.get("replace_all", False)
+            )
+            if res.error:
+                messages.append(res.error)
+                continue
+            if res.files_update is not None:
+                files_update.update(res.files_update)
+            messages.append(_EDIT_SUCCESS_MSG.format(res.occurrences, res.path))
+        return _build_result(messages, files_update, runtime)
+
+    return StructuredTool.from_function(
+        name="batch_edit_file",
+        description=tool_description,
+        func=sync_batch_edit_file,
+        coroutine=async_batch_edit_file,
+    )
+
+
+def _format_glob_result(paths: list[str]) -> str:
+    """Format glob matches for the model."""
+    return str(truncate_if_too_long(paths))
+
+
 def _glob_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
@@ -784,22 +1001,15 @@ def _glob_tool_generator(
         Configured glob tool that finds files by pattern using the backend.
     """
     tool_description = custom_description or GLOB_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_glob(pattern: str, runtime: ToolRuntime[None, FilesystemState], path: str = "/") -> str:
         """Synchronous wrapper for glob tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        infos = resolved_backend.glob_info(pattern, path=path)
-        paths = [fi.get("path", "") for fi in infos]
-        result = truncate_if_too_long(paths)
-        return str(result)
+        return _format_glob_result(resolve_backend(runtime)[0].glob_paths(pattern, path=path))
 
     async def async_glob(pattern: str, runtime: ToolRuntime[None, FilesystemState], path: str = "/") -> str:
         """Asynchronous wrapper for glob tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        infos = await resolved_backend.aglob_info(pattern, path=path)
-        paths = [fi.get("path", "") for fi in infos]
-        result = truncate_if_too_long(paths)
-        return str(result)
+        return _format_glob_result(await resolve_backend(runtime)[0].aglob_paths(pattern, path=path))
 
     return StructuredTool.from_function(
         name="glob",
@@ -809,6 +1019,17 @@ def _glob_tool_generator(
     )
 
 
+def _format_grep_result(
+    raw: list[GrepMatch] | str,
+    output_mode: Literal["files_with_matches", "content", "count"],
+) -> str:
+    """Format grep matches for the model, passing backend error strings through."""
+    if isinstance(raw, str):
+        return raw
+    formatted = format_grep_matches(raw, output_mode)
+    return truncate_if_too_long(formatted)  # type: ignore[arg-type]
+
+
 def _grep_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
@@ -823,6 +1044,7 @@ def _grep_tool_generator(
         Configured grep tool that searches for patterns in files using the backend.
     """
     tool_description = custom_description or GREP_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_grep(
         pattern: str,
@@ -832,12 +1054,8 @@ def _grep_tool_generator(
         output_mode: Literal["files_with_matches", "content", "count"] = "files_with_matches",
     ) -> str:
         """Synchronous wrapper for grep tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        raw = resolved_backend.grep_raw(pattern, path=path, glob=glob)
-        if isinstance(raw, str):
-            return raw
-        formatted = format_grep_matches(raw, output_mode)
-        return truncate_if_too_long(formatted)  # type: ignore[arg-type]
+        raw = resolve_backend(runtime)[0].grep_raw(pattern, path=path, glob=glob)
+        return _format_grep_result(raw, output_mode)
 
     async def async_grep(
         pattern: str,
@@ -847,12 +1065,8 @@ def _grep_tool_generator(
         output_mode: Literal["files_with_matches", "content", "count"] = "files_with_matches",
     ) -> str:
         """Asynchronous wrapper for grep tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        raw = await resolved_backend.agrep_raw(pattern, path=path, glob=glob)
-        if isinstance(raw, str):
-            return raw
-        formatted = format_grep_matches(raw, output_mode)
-        return truncate_if_too_long(formatted)  # type: ignore[arg-type]
+        raw = await resolve_backend(runtime)[0].agrep_raw(pattern, path=path, glob=glob)
+        return _format_grep_result(raw, output_mode)
 
     return StructuredTool.from_function(
         name="grep",
@@ -874,17 +1088,33 @@ def _supports_execution(backend: BackendProtocol) -> bool:
     Returns:
         True if the backend supports execution, False otherwise.
     """
-    # Import here to avoid circular dependency
-    from deepagents.backends.composite import CompositeBackend
-
     # For CompositeBackend, check the default backend
     if isinstance(backend, CompositeBackend):
-        return isinstance(backend.default, SandboxBackendProtocol)
-
-    # For other backends, use isinstance check
+        backend = backend.default
     return isinstance(backend, SandboxBackendProtocol)
 
 
+_EXECUTION_UNAVAILABLE_MSG = (
+    "Error: Execution not available. This agent's backend "
+    "does not support command execution (SandboxBackendProtocol). "
+    "To use the execute tool, provide a backend that implements SandboxBackendProtocol."
+)
+
+
+def _format_execute_response(result: ExecuteResponse) -> str:
+    """Format command output for LLM consumption."""
+    parts = [result.output]
+
+    if result.exit_code is not None:
+        status = "succeeded" if result.exit_code == 0 else "failed"
+        parts.append(f"\n[Command {status} with exit code {result.exit_code}]")
+
+    if result.truncated:
+        parts.append("\n[Output was truncated due to size limits]")
+
+    return "".join(parts)
+
+
 def _execute_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
@@ -899,21 +1129,18 @@ def _execute_tool_generator(
         Configured execute tool that runs commands if backend supports SandboxBackendProtocol.
     """
     tool_description = custom_description or EXECUTE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_execute(
         command: str,
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Synchronous wrapper for execute tool."""
-        resolved_backend = _get_backend(backend, runtime)
+        resolved_backend = resolve_backend(runtime)[0]
 
         # Runtime check - fail gracefully if not supported
         if not _supports_execution(resolved_backend):
-            return (
-                "Error: Execution not available. This agent's backend "
-                "does not support command execution (SandboxBackendProtocol). "
-                "To use the execute tool, provide a backend that implements SandboxBackendProtocol."
-            )
+            return _EXECUTION_UNAVAILABLE_MSG
 
         try:
             result = resolved_backend.execute(command)
@@ -921,32 +1148,18 @@ def _execute_tool_generator(
             # Handle case where execute() exists but raises NotImplementedError
             return f"Error: Execution not available. {e}"
 
-        # Format output for LLM consumption
-        parts = [result.output]
-
-        if result.exit_code is not None:
-            status = "succeeded" if result.exit_code == 0 else "failed"
-            parts.append(f"\n[Command {status} with exit code {result.exit_code}]")
-
-        if result.truncated:
-            parts.append("\n[Output was truncated due to size limits]")
-
-        return "".join(parts)
+        return _format_execute_response(result)
 
     async def async_execute(
         command: str,
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Asynchronous wrapper for execute tool."""
-        resolved_backend = _get_backend(backend, runtime)
+        resolved_backend = resolve_backend(runtime)[0]
 
         # Runtime check - fail gracefully if not supported
         if not _supports_execution(resolved_backend):
-            return (
-                "Error: Execution not available. This agent's backend "
-                "does not support command execution (SandboxBackendProtocol). "
-                "To use the execute tool, provide a backend that implements SandboxBackendProtocol."
-            )
+            return _EXECUTION_UNAVAILABLE_MSG
 
         try:
             result = await resolved_backend.aexecute(command)
@@ -954,17 +1167,7 @@ def _execute_tool_generator(
             # Handle case where execute() exists but raises NotImplementedError
             return f"Error: Execution not available. {e}"
 
-        # Format output for LLM consumption
-        parts = [result.output]
-
-        if result.exit_code is not None:
-            status = "succeeded" if result.exit_code == 0 else "failed"
-            parts.append(f"\n[Command {status} with exit code {result.exit_code}]")
-
-        if result.truncated:
-            parts.append("\n[Output was truncated due to size limits]")
-
-        return "".join(parts)
+        return _format_execute_response(result)
 
     return StructuredTool.from_function(
         name="execute",
@@ -974,12 +1177,40 @@ def _execute_tool_generator(
     )
 
 
+# Backend method names (sync, async) and success message template for each
+# file-operation tool. The template is formatted with the backend's result.
+_FILE_OPERATION_TABLE: dict[str, tuple[str, str, str]] = {
+    "move_file": ("move", "amove", "Moved {0.source} to {0.destination}"),
+    "copy_file": ("copy", "acopy", "Copied {0.source} to {0.destination}"),
+    "delete_file": ("delete", "adelete", "Deleted {0.path}"),
+    "mkdir": ("mkdir", "amkdir", "Created directory {0.path}"),
+}
+
+
+def _format_file_operation_result(result: Any, message: str) -> str:
+    """Format a file-operation result, preferring its error if one is set."""
+    return f"Error: {result.error}" if result.error else message.format(result)
+
+
+def _dispatch_file_operation(op: str, resolved_backend: BackendProtocol, *args: Any, **kwargs: Any) -> str:
+    """Run a file-operation tool against a resolved backend and format the result."""
+    method_name, _, message = _FILE_OPERATION_TABLE[op]
+    return _format_file_operation_result(getattr(resolved_backend, method_name)(*args, **kwargs), message)
+
+
+async def _adispatch_file_operation(op: str, resolved_backend: BackendProtocol, *args: Any, **kwargs: Any) -> str:
+    """Async version of `_dispatch_file_operation`."""
+    _, method_name, message = _FILE_OPERATION_TABLE[op]
+    return _format_file_operation_result(await getattr(resolved_backend, method_name)(*args, **kwargs), message)
+
+
 def _move_file_tool_generator(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
     custom_description: str | None = None,
 ) -> BaseTool:
     """Generate the move_file tool for moving/renaming files and directories."""
     tool_description = custom_description or MOVE_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_move(
         source: str,
@@ -987,11 +1218,7 @@ def _move_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Synchronous wrapper for move tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = resolved_backend.move(source, destination)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Moved {result.source} to {result.destination}"
+        return _dispatch_file_operation("move_file", resolve_backend(runtime)[0], source, destination)
 
     async def async_move(
         source: str,
@@ -999,11 +1226,7 @@ def _move_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Asynchronous wrapper for move tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = await resolved_backend.amove(source, destination)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Moved {result.source} to {result.destination}"
+        return await _adispatch_file_operation("move_file", resolve_backend(runtime)[0], source, destination)
 
     return StructuredTool.from_function(
         name="move_file",
@@ -1019,6 +1242,7 @@ def _copy_file_tool_generator(
 ) -> BaseTool:
     """Generate the copy_file tool for copying files and directories."""
     tool_description = custom_description or COPY_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_copy(
         source: str,
@@ -1026,11 +1250,7 @@ def _copy_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Synchronous wrapper for copy tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = resolved_backend.copy(source, destination)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Copied {result.source} to {result.destination}"
+        return _dispatch_file_operation("copy_file", resolve_backend(runtime)[0], source, destination)
 
     async def async_copy(
         source: str,
@@ -1038,11 +1258,7 @@ def _copy_file_tool_generator(
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Asynchronous wrapper for copy tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = await resolved_backend.acopy(source, destination)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Copied {result.source} to {result.destination}"
+        return await _adispatch_file_operation("copy_file", resolve_backend(runtime)[0], source, destination)
 
     return StructuredTool.from_function(
         name="copy_file",
@@ -1058,28 +1274,21 @@ def _delete_file_tool_generator(
 ) -> BaseTool:
     """Generate the delete_file tool for deleting files and directories."""
     tool_description = custom_description or DELETE_FILE_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_delete(
         path: str,
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Synchronous wrapper for delete tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = resolved_backend.delete(path)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Deleted {result.path}"
+        return _dispatch_file_operation("delete_file", resolve_backend(runtime)[0], path)
 
     async def async_delete(
         path: str,
         runtime: ToolRuntime[None, FilesystemState],
     ) -> str:
         """Asynchronous wrapper for delete tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = await resolved_backend.adelete(path)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Deleted {result.path}"
+        return await _adispatch_file_operation("delete_file", resolve_backend(runtime)[0], path)
 
     return StructuredTool.from_function(
         name="delete_file",
@@ -1095,6 +1304,7 @@ def _mkdir_tool_generator(
 ) -> BaseTool:
     """Generate the mkdir tool for creating directories."""
     tool_description = custom_description or MKDIR_TOOL_DESCRIPTION
+    resolve_backend = _make_backend_resolver(backend)
 
     def sync_mkdir(
         path: str,
@@ -1102,11 +1312,7 @@ def _mkdir_tool_generator(
         parents: bool = True,
     ) -> str:
         """Synchronous wrapper for mkdir tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = resolved_backend.mkdir(path, parents=parents)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Created directory {result.path}"
+        return _dispatch_file_operation("mkdir", resolve_backend(runtime)[0], path, parents=parents)
 
     async def async_mkdir(
         path: str,
@@ -1114,11 +1320,7 @@ def _mkdir_tool_generator(
         parents: bool = True,
     ) -> str:
         """Asynchronous wrapper for mkdir tool."""
-        resolved_backend = _get_backend(backend, runtime)
-        result = await resolved_backend.amkdir(path, parents=parents)
-        if result.error:
-            return f"Error: {result.error}"
-        return f"Created directory {result.path}"
+        return await _adispatch_file_operation("mkdir", resolve_backend(runtime)[0], path, parents=parents)
 
     return StructuredTool.from_function(
         name="mkdir",
@@ -1133,13 +1335,21 @@ def _mkdir_tool_generator(
 VisionModelCallable = Callable[[bytes, str, str | None, str], str]
 AsyncVisionModelCallable = Callable[[bytes, str, str | None, str], Awaitable[str]]
 
+_guess_type = mimetypes.guess_type
+
 
 def _get_file_type_from_extension(path: str) -> str:
     """Get MIME type from file extension."""
-    import mimetypes
+    # guess_type only looks at the last two suffixes (type plus an optional
+    # encoding such as .gz), so those are all that needs caching
+    root, ext = posixpath.splitext(path)
+    return _mime_type_for_suffixes(posixpath.splitext(root)[1] + ext)
 
-    mime_type, _ = mimetypes.guess_type(path)
-    return mime_type or "application/octet-stream"
+
+@functools.lru_cache(maxsize=256)
+def _mime_type_for_suffixes(suffixes: str) -> str:
+    """Memoized MIME lookup for a file name suffix like `.png` or `.tar.gz`."""
+    return _guess_type(f"file{suffixes}")[0] or "application/octet-stream"
 
 
 TOOL_GENERATORS = {
@@ -1147,6 +1357,7 @@ TOOL_GENERATORS = {
     "read_file": _read_file_tool_generator,
     "write_file": _write_file_tool_generator,
     "edit_file": _edit_file_tool_generator,
+    "batch_edit_file": _batch_edit_file_tool_generator,
     "glob": _glob_tool_generator,
     "grep": _grep_tool_generator,
     "execute": _execute_tool_generator,
@@ -1168,7 +1379,7 @@ def _get_filesystem_tools(
         custom_tool_descriptions: Optional custom descriptions for tools.
 
     Returns:
-        List of configured tools: ls, read_file, write_file, edit_file, glob, grep, execute, move_file, copy_file, delete_file, mkdir.
+        List of configured tools: ls, read_file, write_file, edit_file, batch_edit_file, glob, grep, execute, move_file, copy_file, delete_file, mkdir.
     """
     if custom_tool_descriptions is None:
         custom_tool_descriptions = {}
@@ -1190,6 +1401,31 @@ Here are the first 10 lines of the result:
 """
 
 
+def _preview_lines(text: str, max_lines: int = 10, max_line_length: int = 1000) -> list[str]:
+    r"""Return the first `max_lines` lines of `text`, each cut to `max_line_length` characters.
+
+    Scans forward one newline at a time instead of splitting the whole string,
+    so building a preview of an evicted tool result costs O(preview), not
+    O(content). Lines are split on `\n`, with a trailing `\r` dropped.
+    """
+    lines: list[str] = []
+    start = 0
+    text_length = len(text)
+    while start < text_length and len(lines) < max_lines:
+        newline = text.find("\n", start)
+        if newline == -1:
+            newline = text_length
+        line = text[start : min(newline, start + max_line_length)]
+        lines.append(line.removesuffix("\r"))
+        start = newline + 1
+    return lines
+
+
+def _default_backend_factory(runtime: ToolRuntime) -> BackendProtocol:
+    """Default backend factory: ephemeral StateBackend storage in agent state."""
+    return StateBackend(runtime)
+
+
 class FilesystemMiddleware(AgentMiddleware):
     """Middleware for providing filesystem and optional execution tools to an agent.
 
@@ -1255,11 +1491,14 @@ class FilesystemMiddleware(AgentMiddleware):
         self.tool_token_limit_before_evict = tool_token_limit_before_evict
 
         # Use provided backend or default to StateBackend factory
-        self.backend = backend if backend is not None else (lambda rt: StateBackend(rt))
+        self.backend = backend if backend is not None else _default_backend_factory
 
         # Set system prompt (allow full override or None to generate dynamically)
         self._custom_system_prompt = system_prompt
 
+        # Last (base, addition, combined) system prompt, see `_combine_system_prompt`
+        self._combined_system_prompt: tuple[str, str, str] | None = None
+
         self.tools = _get_filesystem_tools(self.backend, custom_tool_descriptions)
 
     def _get_backend(self, runtime: ToolRuntime) -> BackendProtocol:
@@ -1275,22 +1514,18 @@ class FilesystemMiddleware(AgentMiddleware):
             return self.backend(runtime)
         return self.backend
 
-    def wrap_model_call(
-        self,
-        request: ModelRequest,
-        handler: Callable[[ModelRequest], ModelResponse],
-    ) -> ModelResponse:
-        """Update the system prompt and filter tools based on backend capabilities.
+    def _prepare_request(self, request: ModelRequest) -> ModelRequest:
+        """Filter out the execute tool if unsupported and append the filesystem system prompt.
 
         Args:
             request: The model request being processed.
-            handler: The handler function to call with the modified request.
 
         Returns:
-            The model response from the handler.
+            The request to pass on to the handler.
         """
-        # Check if execute tool is present and if backend supports it
-        has_execute_tool = any((tool.name if hasattr(tool, "name") else tool.get("name")) == "execute" for tool in request.tools)
+        # Check if execute tool is present, building the list without it in the same pass
+        filtered_tools = [tool for tool in request.tools if _tool_name(tool) != "execute"]
+        has_execute_tool = len(filtered_tools) != len(request.tools)
 
         backend_supports_execution = False
         if has_execute_tool:
@@ -1300,34 +1535,51 @@ class FilesystemMiddleware(AgentMiddleware):
 
             # If execute tool exists but backend doesn't support it, filter it out
             if not backend_supports_execution:
-                filtered_tools = [tool for tool in request.tools if (tool.name if hasattr(tool, "name") else tool.get("name")) != "execute"]
                 request = request.override(tools=filtered_tools)
-                has_execute_tool = False
 
-        # Use custom system prompt if provided, otherwise generate dynamically
+        # Use custom system prompt if provided, otherwise pick the prebuilt prompt
+        # matching the available tools
         if self._custom_system_prompt is not None:
             system_prompt = self._custom_system_prompt
+        elif backend_supports_execution:
+            system_prompt = _FILESYSTEM_WITH_EXECUTION_SYSTEM_PROMPT
         else:
-            # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
+            system_prompt = FILESYSTEM_SYSTEM_PROMPT
 
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
+        if system_prompt:
+            request = request.override(system_prompt=self._combine_system_prompt(request.system_prompt, system_prompt))
 
-            system_prompt = "\n\n".join(prompt_parts)
+        return request
 
-        if system_prompt:
-            request = request.override(system_prompt=request.system_prompt + "\n\n" + system_prompt if request.system_prompt else system_prompt)
+    def _combine_system_prompt(self, base: str | None, addition: str) -> str:
+        """Append `addition` to the agent's system prompt.
 
-        return handler(request)
+        The incoming system prompt is usually the same string object on every turn, so
+        the last concatenation is remembered and reused instead of rebuilding a
+        potentially large string per model call.
 
-    async def awrap_model_call(
+        Args:
+            base: The system prompt on the incoming request, if any.
+            addition: The filesystem system prompt to append.
+
+        Returns:
+            The combined system prompt.
+        """
+        if not base:
+            return addition
+        cached = self._combined_system_prompt
+        if cached is not None and cached[0] is base and cached[1] is addition:
+            return cached[2]
+        combined = base + "\n\n" + addition
+        self._combined_system_prompt = (base, addition, combined)
+        return combined
+
+    def wrap_model_call(
         self,
         request: ModelRequest,
-        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+        handler: Callable[[ModelRequest], ModelResponse],
     ) -> ModelResponse:
-        """(async) Update the system prompt and filter tools based on backend capabilities.
+        """Update the system prompt and filter tools based on backend capabilities.
 
         Args:
             request: The model request being processed.
@@ -1336,111 +1588,145 @@ class FilesystemMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        # Check if execute tool is present and if backend supports it
-        has_execute_tool = any((tool.name if hasattr(tool, "name") else tool.get("name")) == "execute" for tool in request.tools)
+        return handler(self._prepare_request(request))
 
-        backend_supports_execution = False
-        if has_execute_tool:
-            # Resolve backend to check execution support
-            backend = self._get_backend(request.runtime)
-            backend_supports_execution = _supports_execution(backend)
-
-            # If execute tool exists but backend doesn't support it, filter it out
-            if not backend_supports_execution:
-                filtered_tools = [tool for tool in request.tools if (tool.name if hasattr(tool, "name") else tool.get("name")) != "execute"]
-                request = request.override(tools=filtered_tools)
-                has_execute_tool = False
-
-        # Use custom system prompt if provided, otherwise generate dynamically
-        if self._custom_system_prompt is not None:
-            system_prompt = self._custom_system_prompt
-        else:
-            # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
-
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
-
-            system_prompt = "\n\n".join(prompt_parts)
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """(async) Update the system prompt and filter tools based on backend capabilities.
 
-        if system_prompt:
-            request = request.override(system_prompt=request.system_prompt + "\n\n" + system_prompt if request.system_prompt else system_prompt)
+        Args:
+            request: The model request being processed.
+            handler: The handler function to call with the modified request.
 
-        return await handler(request)
+        Returns:
+            The model response from the handler.
+        """
+        return await handler(self._prepare_request(request))
 
-    def _process_large_message(
-        self,
-        message: ToolMessage,
-        resolved_backend: BackendProtocol,
-    ) -> tuple[ToolMessage, dict[str, FileData] | None]:
-        """Process a large ToolMessage by evicting its content to filesystem.
+    def _eviction_content(self, message: ToolMessage) -> str | None:
+        """Return the content of a ToolMessage as a string if it is too large to keep in context.
 
         Args:
-            message: The ToolMessage with large content to evict.
-            resolved_backend: The filesystem backend to write the content to.
+            message: The ToolMessage to check.
 
         Returns:
-            A tuple of (processed_message, files_update):
-            - processed_message: New ToolMessage with truncated content and file reference
-            - files_update: Dict of file updates to apply to state, or None if eviction failed
+            The content to write to the filesystem, or None if the message should be kept as is.
 
         Note:
-            The entire content is converted to string, written to /large_tool_results/{tool_call_id},
-            and replaced with a truncated preview plus file reference. The replacement is always
-            returned as a plain string for consistency, regardless of original content type.
-
             ToolMessage supports multimodal content blocks (images, audio, etc.), but these are
             uncommon in tool results. For simplicity, all content is stringified and evicted.
             The model can recover by reading the offloaded file from the backend.
         """
         # Early exit if eviction not configured
         if not self.tool_token_limit_before_evict:
-            return message, None
+            return None
 
-        # Convert content to string once for both size check and eviction
+        # Using 4 chars per token as a conservative approximation (actual ratio varies by content)
+        # This errs on the high side to avoid premature eviction of content that might fit
+        char_limit = 4 * self.tool_token_limit_before_evict
+        content = message.content
+
+        # Plain string content is the common case: measure it before doing anything else
+        if isinstance(content, str):
+            if len(content) <= char_limit:
+                return None
+            content_str = content
         # Special case: single text block - extract text directly for readability
-        if (
-            isinstance(message.content, list)
-            and len(message.content) == 1
-            and isinstance(message.content[0], dict)
-            and message.content[0].get("type") == "text"
-            and "text" in message.content[0]
-        ):
-            content_str = str(message.content[0]["text"])
-        elif isinstance(message.content, str):
-            content_str = message.content
+        elif len(content) == 1 and isinstance(content[0], dict) and content[0].get("type") == "text" and "text" in content[0]:
+            text = content[0]["text"]
+            content_str = text if isinstance(text, str) else str(text)
         else:
-            # Multiple blocks or non-text content - stringify entire structure
-            content_str = str(message.content)
+            # Multiple blocks or non-text content - stringify entire structure.
+            # Non-text blocks count towards the size, so there is no cheaper bound.
+            content_str = str(content)
 
         # Check if content exceeds eviction threshold
-        # Using 4 chars per token as a conservative approximation (actual ratio varies by content)
-        # This errs on the high side to avoid premature eviction of content that might fit
-        if len(content_str) <= 4 * self.tool_token_limit_before_evict:
-            return message, None
-
-        # Write content to filesystem
-        sanitized_id = sanitize_tool_call_id(message.tool_call_id)
-        file_path = f"/large_tool_results/{sanitized_id}"
-        result = resolved_backend.write(file_path, content_str)
-        if result.error:
-            return message, None
-
-        # Create truncated preview for the replacement message
-        content_sample = format_content_with_line_numbers([line[:1000] for line in content_str.splitlines()[:10]], start_line=1)
-        replacement_text = TOO_LARGE_TOOL_MSG.format(
-            tool_call_id=message.tool_call_id,
-            file_path=file_path,
-            content_sample=content_sample,
-        )
-
-        # Always return as plain string after eviction
-        processed_message = ToolMessage(
-            content=replacement_text,
-            tool_call_id=message.tool_call_id,
-        )
-        return processed_message, result.files_update
+        if len(content_str) <= char_limit:
+            return None
+        return content_str
+
+    def _collect_evictions(self, messages: list) -> list[tuple[int, str, str]]:
+        """Find the ToolMessages that need to be evicted.
+
+        Args:
+            messages: Messages produced by a tool call.
+
+        Returns:
+            `(index, file_path, content)` for each message to write to the filesystem.
+        """
+        evictions = []
+        for index, message in enumerate(messages):
+            if not isinstance(message, ToolMessage):
+                continue
+            content_str = self._eviction_content(message)
+            if content_str is not None:
+                file_path = f"/large_tool_results/{sanitize_tool_call_id(message.tool_call_id)}"
+                evictions.append((index, file_path, content_str))
+        return evictions
+
+    def _apply_evictions(
+        self,
+        tool_result: ToolMessage | Command,
+        messages: list,
+        evictions: list[tuple[int, str, str]],
+        results: list[WriteResult],
+    ) -> ToolMessage | Command:
+        """Replace evicted messages with a preview and file reference.
+
+        Args:
+            tool_result: The original tool result.
+            messages: The messages of `tool_result`; evicted entries are replaced in place.
+            evictions: Evictions found by `_collect_evictions`.
+            results: Backend write results, one per eviction.
+
+        Returns:
+            The tool result to hand back to the agent. Messages whose write failed are kept as is.
+        """
+        files_update: dict[str, FileData] | None = None
+        for (index, file_path, content_str), result in zip(evictions, results, strict=True):
+            if result.error:
+                continue
+
+            # Create truncated preview for the replacement message. It is taken from the
+            # string that was written, so its line numbers match the evicted file.
+            content_sample = format_content_with_line_numbers(_preview_lines(content_str), start_line=1)
+            tool_call_id = messages[index].tool_call_id
+            replacement_text = TOO_LARGE_TOOL_MSG.format(
+                tool_call_id=tool_call_id,
+                file_path=file_path,
+                content_sample=content_sample,
+            )
+            # Always return as plain string after eviction
+            messages[index] = ToolMessage(content=replacement_text, tool_call_id=tool_call_id)
+            if result.files_update is not None:
+                if files_update is None:
+                    files_update = {}
+                files_update.update(result.files_update)
+
+        if isinstance(tool_result, ToolMessage):
+            if files_update is None:
+                return messages[0]
+            return Command(update={"files": files_update, "messages": messages})
+
+        update = tool_result.update
+        accumulated_file_updates = dict(update.get("files", {}))
+        if files_update:
+            accumulated_file_updates.update(files_update)
+        return Command(update={**update, "messages": messages, "files": accumulated_file_updates})
+
+    @staticmethod
+    def _messages_for_eviction(tool_result: ToolMessage | Command) -> list | None:
+        """Return a mutable copy of the messages in a tool result, or None if there are none to check."""
+        if isinstance(tool_result, ToolMessage):
+            return [tool_result]
+        if isinstance(tool_result, Command):
+            if tool_result.update is None:
+                return None
+            return list(tool_result.update.get("messages", []))
+        raise AssertionError(f"Unreachable code reached in _intercept_large_tool_result: for tool_result of type {type(tool_result)}")
 
     def _intercept_large_tool_result(self, tool_result: ToolMessage | Command, runtime: ToolRuntime) -> ToolMessage | Command:
         """Intercept and process large tool results before they're added to state.
@@ -1455,48 +1741,31 @@ class FilesystemMiddleware(AgentMiddleware):
 
         Note:
             Handles both single ToolMessage results and Command objects containing
-            multiple messages. Large content is automatically offloaded to filesystem
-            to prevent context window overflow.
+            multiple messages. Large content is written to /large_tool_results/{tool_call_id}
+            with one batched `write_many` call, and replaced with a truncated preview plus
+            file reference. The backend is only resolved if something is evicted.
         """
-        if isinstance(tool_result, ToolMessage):
-            resolved_backend = self._get_backend(runtime)
-            processed_message, files_update = self._process_large_message(
-                tool_result,
-                resolved_backend,
-            )
-            return (
-                Command(
-                    update={
-                        "files": files_update,
-                        "messages": [processed_message],
-                    }
-                )
-                if files_update is not None
-                else processed_message
-            )
-
-        if isinstance(tool_result, Command):
-            update = tool_result.update
-            if update is None:
-                return tool_result
-            command_messages = update.get("messages", [])
-            accumulated_file_updates = dict(update.get("files", {}))
-            resolved_backend = self._get_backend(runtime)
-            processed_messages = []
-            for message in command_messages:
-                if not isinstance(message, ToolMessage):
-                    processed_messages.append(message)
-                    continue
-
-                processed_message, files_update = self._process_large_message(
-                    message,
-                    resolved_backend,
-                )
-                processed_messages.append(processed_message)
-                if files_update is not None:
-                    accumulated_file_updates.update(files_update)
-            return Command(update={**update, "messages": processed_messages, "files": accumulated_file_updates})
-        raise AssertionError(f"Unreachable code reached in _intercept_large_tool_result: for tool_result of type {type(tool_result)}")
+        messages = self._messages_for_eviction(tool_result)
+        if messages is None:
+            return tool_result
+        evictions = self._collect_evictions(messages)
+        if evictions:
+            results = self._get_backend(runtime).write_many([(file_path, content) for _, file_path, content in evictions])
+        else:
+            results = []
+        return self._apply_evictions(tool_result, messages, evictions, results)
+
+    async def _aintercept_large_tool_result(self, tool_result: ToolMessage | Command, runtime: ToolRuntime) -> ToolMessage | Command:
+        """Async version of `_intercept_large_tool_result`, writing through the async backend API."""
+        messages = self._messages_for_eviction(tool_result)
+        if messages is None:
+            return tool_result
+        evictions = self._collect_evictions(messages)
+        if evictions:
+            results = await self._get_backend(runtime).awrite_many([(file_path, content) for _, file_path, content in evictions])
+        else:
+            results = []
+        return self._apply_evictions(tool_result, messages, evictions, results)
 
     def wrap_tool_call(
         self,
@@ -1512,7 +1781,8 @@ class FilesystemMiddleware(AgentMiddleware):
         Returns:
             The raw ToolMessage, or a pseudo tool message with the ToolResult in state.
         """
-        if self.tool_token_limit_before_evict is None or request.tool_call["name"] in TOOL_GENERATORS:
+        # Eviction disabled (None or 0): skip interception entirely
+        if not self.tool_token_limit_before_evict or request.tool_call["name"] in TOOL_GENERATORS:
             return handler(request)
 
         tool_result = handler(request)
@@ -1532,8 +1802,9 @@ class FilesystemMiddleware(AgentMiddleware):
         Returns:
             The raw ToolMessage, or a pseudo tool message with the ToolResult in state.
         """
-        if self.tool_token_limit_before_evict is None or request.tool_call["name"] in TOOL_GENERATORS:
+        # Eviction disabled (None or 0): skip interception entirely
+        if not self.tool_token_limit_before_evict or request.tool_call["name"] in TOOL_GENERATORS:
             return await handler(request)
 
         tool_result = await handler(request)
-        return self._intercept_large_tool_result(tool_result, request.runtime)
+        return await self._aintercept_large_tool_result(tool_result, request.runtime)
@@ -15,29 +15,207 @@ Features:
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
 import logging
 import os
-from collections.abc import Awaitable, Callable
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import httpx
 from langchain.agents.middleware.types import AgentMiddleware, ModelRequest, ModelResponse
 from langchain.tools import ToolRuntime
 from langchain_core.tools import BaseTool, StructuredTool
 
+# pybase64 is an optional SIMD-accelerated drop-in for the stdlib encoder
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+# orjson (installed with langsmith on CPython) is much faster on multi-MB base64 payloads
+try:
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
 if TYPE_CHECKING:
     from deepagents.backends.protocol import BackendProtocol
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # --- Configuration ---
 
 DEFAULT_IMAGE_MODEL = "google/gemini-3-pro-image-preview"
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 
+DEFAULT_IMAGE_REQUEST_CONCURRENCY = 8
+
+# Memory budget for base64 encodings of recently edited source images
+DEFAULT_IMAGE_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def _image_request_concurrency() -> int:
+    """Get the cap on concurrent OpenRouter requests from `DEEPAGENTS_IMAGE_CONCURRENCY`.
+
+    Invalid values fall back to `DEFAULT_IMAGE_REQUEST_CONCURRENCY` with a warning.
+    """
+    raw = os.getenv("DEEPAGENTS_IMAGE_CONCURRENCY")
+    if raw is None:
+        return DEFAULT_IMAGE_REQUEST_CONCURRENCY
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.warning(
+            "Invalid DEEPAGENTS_IMAGE_CONCURRENCY=%r, using %d",
+            raw,
+            DEFAULT_IMAGE_REQUEST_CONCURRENCY,
+        )
+        return DEFAULT_IMAGE_REQUEST_CONCURRENCY
+    return value
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client for OpenRouter and image downloads."""
+    return httpx.AsyncClient(
+        timeout=120.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+
+
+class _ImageHTTPClient:
+    """Pooled HTTP client owned by one `ImageGenerationMiddleware`.
+
+    Reusing one client keeps connections to OpenRouter (and image CDNs) alive
+    across tool calls instead of paying connection and TLS setup every time.
+    The client is created on first use and bound to that event loop, since
+    httpx connections cannot cross loops; calls from another loop or from the
+    sync wrappers get a one-off client closed after the call. `aclose`
+    releases the pooled client.
+
+    Limited calls on the pooled client share a semaphore, so bursts of image
+    requests queue on the pooled connections instead of each opening its own.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> tuple[httpx.AsyncClient, asyncio.Semaphore] | None:
+        """Get the pooled client for `loop`, creating it if none is usable, or None if it belongs to another loop."""
+        with self._lock:
+            # A client whose loop has closed has no live connections left to release
+            if self._client is None or self._client.is_closed or self._loop is None or self._loop.is_closed():
+                self._client = _new_http_client()
+                self._loop = loop
+                self._semaphore = asyncio.Semaphore(_image_request_concurrency())
+            if self._loop is not loop or self._semaphore is None:
+                return None
+            return self._client, self._semaphore
+
+    @contextlib.asynccontextmanager
+    async def client(self, *, limited: bool = False) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client, or a one-off client from a sync wrapper or another event loop.
+
+        Args:
+            limited: Wait for a request slot before yielding the pooled client.
+        """
+        bound = None if _IN_SYNC_CALL.get() else self._bind(asyncio.get_running_loop())
+        if bound is None:
+            async with _new_http_client() as one_off:
+                yield one_off
+            return
+        client, semaphore = bound
+        if not limited:
+            yield client
+            return
+        async with semaphore:
+            yield client
+
+    async def aclose(self) -> None:
+        """Close the pooled client; the next call creates a new one."""
+        with self._lock:
+            client, loop = self._client, self._loop
+            self._client = self._loop = self._semaphore = None
+        if client is None or client.is_closed or loop is None or loop.is_closed():
+            return
+        if loop is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            # The client's loop runs on another thread
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+
+
+async def _post_openrouter(http: _ImageHTTPClient, headers: dict[str, str], body: bytes) -> Any:
+    """POST a JSON body to OpenRouter and decode the response.
+
+    Raises:
+        httpx.HTTPStatusError: If OpenRouter returns an error status.
+    """
+    async with http.client(limited=True) as client:
+        response = await client.post(OPENROUTER_API_URL, headers=headers, content=body)
+        response.raise_for_status()
+    return _json_loads(response.content)
+
+
+# Set while a sync tool wrapper drives its coroutine on a short-lived loop
+_IN_SYNC_CALL: contextvars.ContextVar[bool] = contextvars.ContextVar("_IN_SYNC_CALL", default=False)
+
+
+async def _as_sync_call(coro: Coroutine[Any, Any, str]) -> str:
+    _IN_SYNC_CALL.set(True)
+    return await coro
+
+
+def _run_sync(coro: Coroutine[Any, Any, str]) -> str:
+    """Run a tool coroutine to completion from synchronous code.
+
+    Uses `asyncio.run` when no loop is running in this thread, and otherwise a
+    worker thread with its own `asyncio.run`. The loop lives only for the call,
+    so its HTTP requests use a one-off client rather than the pooled one.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_as_sync_call(coro))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, _as_sync_call(coro)).result()
+
+
+@functools.lru_cache(maxsize=1)
+def _project_workspace() -> Path | None:
+    """Find ./workspace under the project root, by walking up from this package."""
+    # Try to find project root by looking for common markers
+    for parent in Path(__file__).resolve().parents:
+        if (parent / ".env").exists() or (parent / "workspace").exists():
+            return parent / "workspace"
+    return None
+
+
 def get_workspace_path() -> Path:
     """Get the workspace directory for generated files.
 
@@ -48,16 +226,8 @@ def get_workspace_path() -> Path:
     if workspace:
         path = Path(workspace)
     else:
-        # Default to ./workspace relative to the deepagents package
-        # Try to find project root by looking for common markers
-        current = Path(__file__).resolve()
-        for parent in current.parents:
-            if (parent / ".env").exists() or (parent / "workspace").exists():
-                path = parent / "workspace"
-                break
-        else:
-            # Fallback to cwd/workspace
-            path = Path.cwd() / "workspace"
+        # Default to ./workspace relative to the deepagents package, else cwd/workspace
+        path = _project_workspace() or Path.cwd() / "workspace"
 
     # Ensure workspace exists
     path.mkdir(parents=True, exist_ok=True)
@@ -80,6 +250,15 @@ ASPECT_RATIOS = {
 
 IMAGE_SIZES = ["1K", "2K", "4K"]
 
+# MIME types for source images, by lowercase file suffix (default: image/jpeg)
+_MIME_BY_SUFFIX = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+}
+
 # --- Tool Descriptions ---
 
 GENERATE_IMAGE_DESCRIPTION = """Generate images from text prompts using AI.
@@ -159,6 +338,33 @@ The image model excels at:
 # --- Core Image Generation Functions ---
 
 
+# Words that indicate the model declined to produce an image
+_DECLINE_RE = re.compile(r"cannot|can't|unable|sorry|inappropriate", re.IGNORECASE)
+
+
+def _image_url_result(url: str) -> dict[str, Any]:
+    """Build a success result from an image URL, unwrapping base64 `data:` URLs."""
+    if url.startswith("data:"):
+        url = url.split(",", 1)[1]
+    return {"success": True, "image_data": url, "error": None}
+
+
+def _fast_extract_image(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Extract image data from the common OpenRouter layout (`images[0].imageUrl.url`).
+
+    Returns:
+        The success result, or None if the response has any other shape, in
+        which case `_extract_image_from_response` should be used.
+    """
+    try:
+        url = data["choices"][0]["message"]["images"][0]["imageUrl"]["url"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if not url or not isinstance(url, str):
+        return None
+    return _image_url_result(url)
+
+
 def _extract_image_from_response(data: dict[str, Any]) -> dict[str, Any]:
     """Extract image data from an OpenRouter/Gemini API response.
 
@@ -170,56 +376,57 @@ def _extract_image_from_response(data: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Dict with 'success', 'image_data' (base64 or URL), 'error' keys.
     """
-    choices = data.get("choices", [])
+    choices = data.get("choices")
     if not choices:
         logger.warning("No choices in response: %s", list(data.keys()))
         return {"success": False, "image_data": None, "error": "No response from model"}
 
-    message = choices[0].get("message", {})
+    message = choices[0].get("message") or {}
     logger.debug("Message keys: %s", list(message.keys()))
 
     # Check for images array in the response (OpenRouter format)
-    images = message.get("images", [])
+    images = message.get("images")
     if images:
         img = images[0]
         # Handle various image URL formats
-        image_url = (
-            img.get("imageUrl", {}).get("url") or img.get("image_url", {}).get("url") or img.get("url") or (img if isinstance(img, str) else None)
-        )
+        if isinstance(img, str):
+            image_url = img
+        else:
+            camel = img.get("imageUrl")
+            snake = img.get("image_url")
+            image_url = (camel and camel.get("url")) or (snake and snake.get("url")) or img.get("url")
         if image_url:
-            if image_url.startswith("data:"):
-                _, b64_data = image_url.split(",", 1)
-                return {"success": True, "image_data": b64_data, "error": None}
-            return {"success": True, "image_data": image_url, "error": None}
+            return _image_url_result(image_url)
 
     # Check content array for image parts
-    content = message.get("content", [])
+    content = message.get("content")
     if isinstance(content, list):
         for part in content:
-            if isinstance(part, dict):
-                part_type = part.get("type", "")
-                # Handle image_url type
-                if part_type == "image_url":
-                    url = part.get("image_url", {}).get("url", "") or part.get("url", "")
-                    if url:
-                        if url.startswith("data:"):
-                            _, b64_data = url.split(",", 1)
-                            return {"success": True, "image_data": b64_data, "error": None}
-                        return {"success": True, "image_data": url, "error": None}
-                # Handle inline_data type (Gemini native format)
-                elif part_type == "inline_data" or "inline_data" in part:
-                    inline = part.get("inline_data", part)
-                    if isinstance(inline, dict) and "data" in inline:
-                        return {"success": True, "image_data": inline["data"], "error": None}
-                # Handle image type
-                elif part_type == "image":
-                    img_data = part.get("source", {}).get("data") or part.get("data")
-                    if img_data:
-                        return {"success": True, "image_data": img_data, "error": None}
+            if not isinstance(part, dict):
+                continue
+            part_get = part.get
+            part_type = part_get("type", "")
+            # Handle image_url type
+            if part_type == "image_url":
+                nested = part_get("image_url")
+                url = (nested and nested.get("url")) or part_get("url")
+                if url:
+                    return _image_url_result(url)
+            # Handle inline_data type (Gemini native format)
+            elif part_type == "inline_data" or "inline_data" in part:
+                inline = part_get("inline_data", part)
+                if isinstance(inline, dict) and "data" in inline:
+                    return {"success": True, "image_data": inline["data"], "error": None}
+            # Handle image type
+            elif part_type == "image":
+                source = part_get("source")
+                img_data = (source and source.get("data")) or part_get("data")
+                if img_data:
+                    return {"success": True, "image_data": img_data, "error": None}
 
     # If content is a string, the model might have declined to generate
     if isinstance(content, str):
-        if any(word in content.lower() for word in ["cannot", "can't", "unable", "sorry", "inappropriate"]):
+        if _DECLINE_RE.search(content):
             return {"success": False, "image_data": None, "error": f"Model declined: {content[:500]}"}
         return {"success": False, "image_data": None, "error": f"No image generated. Model said: {content[:300]}"}
 
@@ -232,6 +439,7 @@ def _extract_image_from_response(data: dict[str, Any]) -> dict[str, Any]:
 
 
 async def _generate_image(
+    http: _ImageHTTPClient,
     prompt: str,
     aspect_ratio: str = "1:1",
     image_size: str = "1K",
@@ -241,6 +449,7 @@ async def _generate_image(
     """Generate an image using OpenRouter's Gemini 3 Pro model.
 
     Args:
+        http: HTTP client to send the request with.
         prompt: Text description of the image to generate.
         aspect_ratio: Aspect ratio (e.g., "16:9", "1:1").
         image_size: Resolution ("1K", "2K", "4K").
@@ -286,12 +495,9 @@ async def _generate_image(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(OPENROUTER_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        data = await _post_openrouter(http, headers, _json_dumps(payload))
 
-        return _extract_image_from_response(data)
+        return _fast_extract_image(data) or _extract_image_from_response(data)
 
     except httpx.HTTPStatusError as e:
         error_text = e.response.text[:500] if e.response.text else str(e)
@@ -301,7 +507,71 @@ async def _generate_image(
         return {"success": False, "image_data": None, "error": f"Error: {e!s}"}
 
 
+class _Base64Cache:
+    """Recently base64-encoded source images owned by one `ImageGenerationMiddleware`.
+
+    Agents often edit the same source image several times in a row; hashing
+    the bytes is several times cheaper than re-encoding a multi-MB image.
+    Entries are keyed by content digest and evicted least recently used once
+    their total size exceeds `max_bytes`; 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def encode(self, image_bytes: bytes) -> bytes:
+        """Base64-encode an image, reusing a cached encoding of the same bytes."""
+        if self._max_bytes <= 0:
+            return _b64encode(image_bytes)
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                return encoded
+        encoded = _b64encode(image_bytes)
+        if len(encoded) <= self._max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = encoded
+                    self._size += len(encoded)
+                    while self._size > self._max_bytes:
+                        self._size -= len(self._entries.popitem(last=False)[1])
+        return encoded
+
+    def clear(self) -> None:
+        """Drop all cached encodings."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+def _splice_json_body(payload: dict[str, Any], splices: list[tuple[str, bytes]]) -> bytes:
+    """Serialize `payload`, substituting raw bytes for placeholder tokens.
+
+    Large base64 blobs are kept out of the JSON encoder: the payload carries a
+    short token in their place, and the encoded bytes are joined into the
+    serialized body once. Base64 needs no JSON escaping, so the result matches
+    serializing the full strings. Tokens must appear in `splices` order.
+    """
+    body = _json_dumps(payload)
+    parts: list[bytes] = []
+    start = 0
+    for token, data in splices:
+        token_bytes = token.encode()
+        index = body.index(token_bytes, start)
+        parts += (body[start:index], data)
+        start = index + len(token_bytes)
+    parts.append(body[start:])
+    return b"".join(parts)
+
+
 async def _edit_image(
+    http: _ImageHTTPClient,
+    base64_cache: _Base64Cache,
     image_bytes: bytes,
     instruction: str,
     additional_images: list[bytes] | None = None,
@@ -314,6 +584,8 @@ async def _edit_image(
     """Edit an image using OpenRouter's Gemini 3 Pro model.
 
     Args:
+        http: HTTP client to send the request with.
+        base64_cache: Cache of recent base64 encodings to encode the images with.
         image_bytes: Raw bytes of the source image.
         instruction: Text describing the desired edit.
         additional_images: Optional list of additional image bytes for reference.
@@ -339,26 +611,15 @@ async def _edit_image(
             "error": f"Invalid image_size. Options: {', '.join(IMAGE_SIZES)}",
         }
 
-    # Encode source image
-    b64_source = base64.b64encode(image_bytes).decode("utf-8")
-    data_url = f"data:{file_type};base64,{b64_source}"
-
-    # Build content array with text and images
-    content: list[dict[str, Any]] = [
-        {"type": "text", "text": instruction},
-        {"type": "image_url", "image_url": {"url": data_url}},
-    ]
-
-    # Add reference images if provided
-    if additional_images:
-        for _i, img_bytes in enumerate(additional_images[:4]):  # Max 5 total images
-            b64_ref = base64.b64encode(img_bytes).decode("utf-8")
-            content.append(
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:{file_type};base64,{b64_ref}"},
-                }
-            )
+    # Encode the source and up to 4 reference images (max 5 total) off the event loop
+    sources = [image_bytes, *(additional_images or [])[:4]]
+    encoded = await asyncio.gather(*(asyncio.to_thread(base64_cache.encode, img_bytes) for img_bytes in sources))
+
+    # Build content array with text and images; the base64 data is spliced in after serialization
+    nonce = secrets.token_hex(8)
+    splices = [(f"__image_{i}_{nonce}__", data) for i, data in enumerate(encoded)]
+    content: list[dict[str, Any]] = [{"type": "text", "text": instruction}]
+    content.extend({"type": "image_url", "image_url": {"url": f"data:{file_type};base64,{token}"}} for token, _ in splices)
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -376,12 +637,9 @@ async def _edit_image(
         payload["image_config"]["aspect_ratio"] = aspect_ratio
 
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(OPENROUTER_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        data = await _post_openrouter(http, headers, _splice_json_body(payload, splices))
 
-        return _extract_image_from_response(data)
+        return _fast_extract_image(data) or _extract_image_from_response(data)
 
     except httpx.HTTPStatusError as e:
         error_text = e.response.text[:500] if e.response.text else str(e)
@@ -391,11 +649,88 @@ async def _edit_image(
         return {"success": False, "image_data": None, "error": f"Error: {e!s}"}
 
 
+# Image saves are queued onto one dedicated writer thread instead of the shared
+# default executor, so bursts of saves run back to back without contending with
+# other blocking work or each other for the disk.
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-save")
+
+
+async def _run_save(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking image-save step on the dedicated writer thread."""
+    return await asyncio.get_running_loop().run_in_executor(_SAVE_EXECUTOR, func, *args)
+
+
+async def _download_image(http: _ImageHTTPClient, url: str, save_file: Path) -> None:
+    """Stream an image URL into `save_file` without buffering the whole body.
+
+    Chunks are written on the image-save thread in ~1 MiB batches so the event
+    loop is never blocked on disk I/O. A partially written file is removed
+    if the download fails.
+    """
+    async with http.client() as client, client.stream("GET", url) as resp:
+        resp.raise_for_status()
+        f = await _run_save(save_file.open, "wb")
+        try:
+            pending = bytearray()
+            async for chunk in resp.aiter_bytes(65536):
+                pending += chunk
+                if len(pending) >= 1 << 20:
+                    await _run_save(f.write, pending)
+                    pending = bytearray()
+            if pending:
+                await _run_save(f.write, pending)
+        except BaseException:
+            f.close()
+            save_file.unlink(missing_ok=True)
+            raise
+        await _run_save(f.close)
+
+
+_IS_WINDOWS = os.name == "nt"
+
+
+def _resolve_save_path(output_path: str, workspace: Path, default_prefix: str) -> Path:
+    """Resolve where a generated or edited image should be saved.
+
+    Args:
+        output_path: Requested output path; empty for a unique name in the workspace.
+        workspace: Workspace directory used for relative and fallback paths.
+        default_prefix: File name prefix used when no output path is given.
+
+    Returns:
+        Path to write the image to.
+    """
+    if not output_path:
+        # Generate unique filename in workspace
+        return workspace / f"{default_prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}.png"
+
+    # Handle Unix-style root paths on Windows (e.g., /ww3_assessment.html)
+    # These should be relative to workspace, not C:\
+    if _IS_WINDOWS and output_path.startswith("/"):
+        return workspace / output_path.lstrip("/")
+
+    # Expand ~ to user home and handle relative paths
+    save_file = Path(output_path).expanduser() if "~" in output_path else Path(output_path)
+    if not save_file.is_absolute():
+        # For relative paths, resolve relative to workspace
+        return workspace / output_path
+
+    # For absolute paths, try to use them directly but fall back to workspace
+    try:
+        # Test if we can write to the parent directory
+        save_file.parent.mkdir(parents=True, exist_ok=True)
+    except PermissionError:
+        # Fall back to workspace with just the filename
+        return workspace / save_file.name
+    return save_file
+
+
 # --- Tool Generators ---
 
 
 def _make_generate_image_tool(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
+    http: _ImageHTTPClient,
 ) -> BaseTool:
     """Create the generate_image tool."""
 
@@ -407,10 +742,8 @@ def _make_generate_image_tool(
         runtime: ToolRuntime = None,
     ) -> str:
         """Generate an image from a text prompt."""
-        import uuid
-        from datetime import datetime
-
         result = await _generate_image(
+            http,
             prompt=prompt,
             aspect_ratio=aspect_ratio,
             image_size=image_size,
@@ -421,51 +754,27 @@ def _make_generate_image_tool(
 
         image_data = result["image_data"]
 
-        # Decode image data
-        try:
-            if not image_data.startswith("http"):
+        # Decode inline image data; remote URLs are streamed to disk when saving
+        img_bytes: bytes | None = None
+        if not image_data.startswith("http"):
+            try:
                 img_bytes = base64.b64decode(image_data)
-            else:
-                async with httpx.AsyncClient() as client:
-                    resp = await client.get(image_data)
-                    img_bytes = resp.content
-        except Exception as e:
-            return f"Image generated but failed to decode: {e}"
+            except Exception as e:
+                return f"Image generated but failed to decode: {e}"
 
         # Determine save path - use workspace if no output_path specified
-        workspace = get_workspace_path()
-        if output_path:
-            # Expand ~ to user home and handle relative paths
-            save_file = Path(output_path).expanduser()
-
-            # Handle Unix-style root paths on Windows (e.g., /ww3_assessment.html)
-            # These should be relative to workspace, not C:\
-            if os.name == "nt" and str(output_path).startswith("/"):
-                # Strip leading slash and make relative to workspace
-                relative_path = output_path.lstrip("/")
-                save_file = workspace / relative_path
-            elif not save_file.is_absolute():
-                # For relative paths, resolve relative to workspace
-                save_file = workspace / output_path
-            # For absolute paths, try to use them directly but fall back to workspace
-            elif save_file.is_absolute():
-                try:
-                    # Test if we can write to the parent directory
-                    save_file.parent.mkdir(parents=True, exist_ok=True)
-                except PermissionError:
-                    # Fall back to workspace with just the filename
-                    save_file = workspace / save_file.name
-        else:
-            # Generate unique filename in workspace
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            short_id = uuid.uuid4().hex[:6]
-            save_file = workspace / f"image_{timestamp}_{short_id}.png"
+        save_file = _resolve_save_path(output_path, get_workspace_path(), "image")
 
         # Save the image directly to filesystem
         try:
             save_file.parent.mkdir(parents=True, exist_ok=True)
-            save_file.write_bytes(img_bytes)
+            if img_bytes is None:
+                await _download_image(http, image_data, save_file)
+            else:
+                await _run_save(save_file.write_bytes, img_bytes)
             return f"Image generated and saved to: {save_file}"
+        except httpx.HTTPError as e:
+            return f"Image generated but failed to download: {e}"
         except Exception as e:
             return f"Image generated but failed to save: {e}"
 
@@ -477,9 +786,7 @@ def _make_generate_image_tool(
         runtime: ToolRuntime = None,
     ) -> str:
         """Sync version of generate_image."""
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_generate_image(prompt, aspect_ratio, image_size, output_path, runtime))
+        return _run_sync(async_generate_image(prompt, aspect_ratio, image_size, output_path, runtime))
 
     return StructuredTool.from_function(
         name="generate_image",
@@ -491,6 +798,8 @@ def _make_generate_image_tool(
 
 def _make_edit_image_tool(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
+    http: _ImageHTTPClient,
+    base64_cache: _Base64Cache,
 ) -> BaseTool:
     """Create the edit_image tool."""
 
@@ -503,14 +812,20 @@ def _make_edit_image_tool(
         runtime: ToolRuntime = None,
     ) -> str:
         """Edit an existing image with text instructions."""
-        import uuid
-        from datetime import datetime
-
         # Try to read source image from filesystem or backend
+        image_bytes: bytes | None = None
         source_path = Path(image_path)
-        if source_path.is_absolute() and source_path.exists():
-            image_bytes = source_path.read_bytes()
-        elif runtime:
+        if source_path.is_absolute():
+            # Read directly rather than exists() + read, saving a stat per call
+            try:
+                image_bytes = await asyncio.to_thread(source_path.read_bytes)
+            except FileNotFoundError:
+                image_bytes = None
+            except OSError as e:
+                return f"Failed to read source image: {e}"
+        if image_bytes is None:
+            if not runtime:
+                return f"Failed to read source image: file not found at {image_path}"
             be = backend(runtime) if callable(backend) else backend
             try:
                 responses = await be.adownload_files([image_path])
@@ -519,20 +834,13 @@ def _make_edit_image_tool(
                 image_bytes = responses[0].content
             except Exception as e:
                 return f"Failed to read source image: {e}"
-        else:
-            return f"Failed to read source image: file not found at {image_path}"
 
         # Determine file type from path
-        suffix = Path(image_path).suffix.lower()
-        file_type = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".webp": "image/webp",
-            ".gif": "image/gif",
-        }.get(suffix, "image/jpeg")
+        file_type = _MIME_BY_SUFFIX.get(Path(image_path).suffix.lower(), "image/jpeg")
 
         result = await _edit_image(
+            http,
+            base64_cache,
             image_bytes=image_bytes,
             instruction=instruction,
             additional_images=None,
@@ -546,50 +854,27 @@ def _make_edit_image_tool(
 
         image_data = result["image_data"]
 
-        # Decode image data
-        try:
-            if not image_data.startswith("http"):
+        # Decode inline image data; remote URLs are streamed to disk when saving
+        img_bytes: bytes | None = None
+        if not image_data.startswith("http"):
+            try:
                 img_bytes = base64.b64decode(image_data)
-            else:
-                async with httpx.AsyncClient() as client:
-                    resp = await client.get(image_data)
-                    img_bytes = resp.content
-        except Exception as e:
-            return f"Image edited but failed to decode: {e}"
+            except Exception as e:
+                return f"Image edited but failed to decode: {e}"
 
         # Determine save path - use workspace if no output_path specified
-        workspace = get_workspace_path()
-        if output_path:
-            # Expand ~ to user home and handle relative paths
-            save_file = Path(output_path).expanduser()
-
-            # Handle Unix-style root paths on Windows (e.g., /ww3_assessment.html)
-            # These should be relative to workspace, not C:\
-            if os.name == "nt" and str(output_path).startswith("/"):
-                # Strip leading slash and make relative to workspace
-                relative_path = output_path.lstrip("/")
-                save_file = workspace / relative_path
-            elif not save_file.is_absolute():
-                # For relative paths, resolve relative to workspace
-                save_file = workspace / output_path
-            # For absolute paths, try to use them directly but fall back to workspace
-            elif save_file.is_absolute():
-                try:
-                    # Test if we can write to the parent directory
-                    save_file.parent.mkdir(parents=True, exist_ok=True)
-                except PermissionError:
-                    # Fall back to workspace with just the filename
-                    save_file = workspace / save_file.name
-        else:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            short_id = uuid.uuid4().hex[:6]
-            save_file = workspace / f"edited_{timestamp}_{short_id}.png"
+        save_file = _resolve_save_path(output_path, get_workspace_path(), "edited")
 
         # Save directly to filesystem
         try:
             save_file.parent.mkdir(parents=True, exist_ok=True)
-            save_file.write_bytes(img_bytes)
+            if img_bytes is None:
+                await _download_image(http, image_data, save_file)
+            else:
+                await _run_save(save_file.write_bytes, img_bytes)
             return f"Image edited and saved to: {save_file}"
+        except httpx.HTTPError as e:
+            return f"Image edited but failed to download: {e}"
         except Exception as e:
             return f"Image edited but failed to save: {e}"
 
@@ -602,9 +887,7 @@ def _make_edit_image_tool(
         runtime: ToolRuntime = None,
     ) -> str:
         """Sync version of edit_image."""
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_edit_image(image_path, instruction, aspect_ratio, image_size, output_path, runtime))
+        return _run_sync(async_edit_image(image_path, instruction, aspect_ratio, image_size, output_path, runtime))
 
     return StructuredTool.from_function(
         name="edit_image",
@@ -619,12 +902,16 @@ def _make_edit_image_tool(
 
 def _get_image_tools(
     backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol],
+    http: _ImageHTTPClient,
+    base64_cache: _Base64Cache,
     enabled_tools: list[str] | None = None,
 ) -> list[BaseTool]:
     """Get image generation tools.
 
     Args:
         backend: Backend for file operations.
+        http: HTTP client shared by the tools.
+        base64_cache: Cache of recent source image encodings for edit_image.
         enabled_tools: Optional list of tool names to enable.
 
     Returns:
@@ -634,10 +921,10 @@ def _get_image_tools(
     tools: list[BaseTool] = []
 
     if "generate_image" in tools_to_generate:
-        tools.append(_make_generate_image_tool(backend))
+        tools.append(_make_generate_image_tool(backend, http))
 
     if "edit_image" in tools_to_generate:
-        tools.append(_make_edit_image_tool(backend))
+        tools.append(_make_edit_image_tool(backend, http, base64_cache))
 
     return tools
 
@@ -682,6 +969,7 @@ class ImageGenerationMiddleware(AgentMiddleware):
         backend: BackendProtocol | Callable[[ToolRuntime], BackendProtocol] | None = None,
         system_prompt: str | None = None,
         enabled_tools: list[str] | None = None,
+        image_cache_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
     ) -> None:
         """Initialize the image generation middleware.
 
@@ -689,6 +977,8 @@ class ImageGenerationMiddleware(AgentMiddleware):
             backend: Backend for file operations. Defaults to StateBackend.
             system_prompt: Optional custom system prompt override.
             enabled_tools: Optional list of tool names to enable.
+            image_cache_bytes: Memory budget for base64 encodings of recently
+                edited source images. 0 disables the cache.
         """
         from deepagents.backends import StateBackend
 
@@ -696,8 +986,20 @@ class ImageGenerationMiddleware(AgentMiddleware):
         self._custom_system_prompt = system_prompt
         enabled = enabled_tools or ["generate_image", "edit_image"]
 
+        # HTTP client and encoding cache shared by this middleware's tools, see `aclose`
+        self._http = _ImageHTTPClient()
+        self._base64_cache = _Base64Cache(image_cache_bytes)
+
         # Build tools list and store in self.tools (used by create_agent)
-        self.tools = _get_image_tools(self.backend, enabled)
+        self.tools = _get_image_tools(self.backend, self._http, self._base64_cache, enabled)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections and drop the cached image encodings.
+
+        The tools keep working afterwards; their next call opens a new client.
+        """
+        self._base64_cache.clear()
+        await self._http.aclose()
 
     def wrap_model_call(
         self,
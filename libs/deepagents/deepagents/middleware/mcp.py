@@ -28,9 +28,16 @@ Example:
 from __future__ import annotations
 
 import asyncio
+import base64
+import codecs
+import functools
+import inspect
+import io
 import logging
+import threading
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -42,7 +49,14 @@ from langchain.agents.middleware.types import (
 from langchain_core.tools import BaseTool, StructuredTool
 
 from deepagents.mcp.config import FailBehavior, MCPConfig, MCPServerConfig
-from deepagents.mcp.naming import ToolNameRegistry
+from deepagents.mcp.naming import ToolNameRegistry, resolve_tool_name
+
+try:
+    from langchain_mcp_adapters.prompts import load_mcp_prompt
+    from langchain_mcp_adapters.resources import load_mcp_resources
+except ImportError:
+    load_mcp_prompt = None  # type: ignore[assignment]
+    load_mcp_resources = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -84,25 +98,247 @@ class ToolCallResult:
     """Call latency in milliseconds."""
 
     output_size: int
-    """Approximate output size in bytes."""
+    """Best-effort approximation of the output size (characters for text, bytes for binary)."""
 
     error: str | None = None
     """Error message if failed."""
 
+    latency_ns: int = 0
+    """Call latency in nanoseconds, at full timer resolution."""
+
 
 # Audit hook type definitions
 BeforeToolCallHook = Callable[[ToolCallAuditInfo], Awaitable[None] | None]
 AfterToolCallHook = Callable[[ToolCallAuditInfo, ToolCallResult], Awaitable[None] | None]
 
 
-def _check_mcp_available() -> bool:
-    """Check if MCP dependencies are available."""
-    try:
-        from langchain_mcp_adapters.client import MultiServerMCPClient  # noqa: F401
+def _estimate_output_size(output: Any) -> int:
+    """Estimate the size of a tool output.
 
-        return True
-    except ImportError:
+    Strings, bytes, and containers of them are measured without building a
+    combined string; any other value falls back to the length of its `str()`.
+    """
+    if isinstance(output, str | bytes | bytearray):
+        return len(output)
+    if isinstance(output, list | tuple):
+        return sum(_estimate_output_size(item) for item in output)
+    if isinstance(output, dict):
+        return sum(_estimate_output_size(value) for value in output.values())
+    if isinstance(output, memoryview):
+        return output.nbytes
+    if output is None:
+        return 0
+    return len(str(output))
+
+
+def _is_async_callable(func: Callable[..., Any] | None) -> bool:
+    """Check whether calling `func` always returns a coroutine."""
+    if not callable(func):
         return False
+    # Callable instances define the coroutine on their class's __call__
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(type(func).__call__)
+
+
+def _format_resource_content(data: str | bytes, max_bytes: int | None) -> str:
+    """Render resource data as text, truncating it to `max_bytes` before decoding.
+
+    Binary data that isn't valid UTF-8 is base64 encoded. Only the retained
+    prefix is ever decoded or encoded.
+    """
+    size = len(data)
+    truncated = max_bytes is not None and size > max_bytes
+    if isinstance(data, str):
+        content = data[:max_bytes] if truncated else data
+    else:
+        view = memoryview(data)[:max_bytes] if truncated else memoryview(data)
+        try:
+            # Incremental decoding tolerates a multi-byte character cut at the truncation point
+            content = codecs.getincrementaldecoder("utf-8")().decode(view, final=not truncated)
+        except UnicodeDecodeError:
+            content = f"[Binary content, base64 encoded]\n{base64.b64encode(view).decode('ascii')}"
+    if truncated:
+        unit = "characters" if isinstance(data, str) else "bytes"
+        content += f"\n\n[Truncated: resource is {size} {unit}, showing the first {max_bytes}]"
+    return content
+
+
+def _format_prompt(name: str, arguments: dict[str, str] | None, messages: list[Any]) -> str:
+    """Render prompt messages as readable text, one `[role]` block per message."""
+    buf = io.StringIO()
+    write = buf.write
+    write("Prompt: ")
+    write(name)
+    if arguments:
+        write("\nArguments: ")
+        write(str(arguments))
+    write("\n")
+    for msg in messages:
+        role = getattr(msg, "type", "message")
+        content = getattr(msg, "content", msg)
+        write("\n[")
+        write(role)
+        write("]\n")
+        write(content if isinstance(content, str) else str(content))
+    return buf.getvalue()
+
+
+def _rebind_tool(original_tool: BaseTool, name: str, coroutine: Callable[..., Awaitable[Any]]) -> BaseTool:
+    """Expose `coroutine` under `name` with the original tool's description and schema.
+
+    The schema is already known, so this constructs the tool directly instead
+    of going through `StructuredTool.from_function`, which inspects the source
+    function for a name, docstring, and schema it would not use.
+    """
+    return StructuredTool(
+        name=name,
+        description=original_tool.description,
+        args_schema=original_tool.args_schema,
+        coroutine=coroutine,
+    )
+
+
+# Background audit queue bounds
+_AUDIT_QUEUE_SIZE = 1024
+_AUDIT_BATCH_SIZE = 64
+
+
+@functools.cache
+def _get_mcp_client_class() -> type | None:
+    """Get the MultiServerMCPClient class, or None if MCP dependencies are not installed."""
+    try:
+        from langchain_mcp_adapters.client import MultiServerMCPClient
+    except ImportError:
+        return None
+    return MultiServerMCPClient
+
+
+# --- Session Pooling ---
+
+
+class _PooledSession:
+    """An MCP session held open by a background task so it can be reused.
+
+    The session context manager must be entered and exited by the same task
+    (anyio cancel scopes), so a dedicated owner task keeps it open until the
+    entry is closed or has sat idle for `idle_timeout_s`.
+    """
+
+    def __init__(self, client: Any, server_name: str, idle_timeout_s: float) -> None:
+        self.uses = 0
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self._idle_timeout_s = idle_timeout_s
+        self._closed = asyncio.Event()
+        self._ready: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(client, server_name))
+
+    @property
+    def alive(self) -> bool:
+        """Whether the owner task still holds the session open."""
+        return not self._task.done() and not self._closed.is_set()
+
+    async def _run(self, client: Any, server_name: str) -> None:
+        try:
+            async with client.session(server_name) as session:
+                self._ready.set_result(session)
+                while True:
+                    try:
+                        await asyncio.wait_for(self._closed.wait(), timeout=self._idle_timeout_s or None)
+                    except TimeoutError:
+                        if not self.in_use and time.monotonic() - self.last_used >= self._idle_timeout_s:
+                            break
+                    else:
+                        break
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.debug("Pooled MCP session for %s closed with error: %s", server_name, e)
+        finally:
+            self._closed.set()
+            if not self._ready.done():
+                self._ready.cancel()
+
+    async def get(self) -> Any:
+        """Wait for the session to open and return it."""
+        return await asyncio.shield(self._ready)
+
+    def close(self) -> None:
+        """Ask the owner task to close the session."""
+        self._closed.set()
+
+    async def wait_closed(self) -> None:
+        """Wait for the owner task to close the session."""
+        await asyncio.wait({self._task})
+
+
+class _SessionPool:
+    """Bounded pool of reusable sessions for one MCP server.
+
+    Sessions are bound to the event loop they were opened on; calls from any
+    other loop fall back to a one-off session.
+    """
+
+    def __init__(self, client: Any, server_name: str, server_config: MCPServerConfig) -> None:
+        self._client = client
+        self._server_name = server_name
+        self._idle_timeout_s = server_config.session_idle_timeout_s
+        self._max_reuse = server_config.session_max_reuse
+        self._slots = asyncio.Semaphore(server_config.session_pool_size)
+        self._idle: list[_PooledSession] = []
+        self._closed = False
+        self.loop = asyncio.get_running_loop()
+
+    def _checkout(self) -> _PooledSession:
+        now = time.monotonic()
+        while self._idle:
+            entry = self._idle.pop()
+            # Cheap health check: drop entries whose owner task has exited or that went stale
+            if entry.alive and now - entry.last_used < self._idle_timeout_s:
+                return entry
+            entry.close()
+        return _PooledSession(self._client, self._server_name, self._idle_timeout_s)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Borrow a session, returning it to the pool when the block exits cleanly."""
+        if asyncio.get_running_loop() is not self.loop:
+            async with self._client.session(self._server_name) as session:
+                yield session
+            return
+
+        async with self._slots:
+            entry = self._checkout()
+            entry.in_use = True
+            reusable = False
+            try:
+                yield await entry.get()
+                reusable = True
+            finally:
+                entry.in_use = False
+                entry.uses += 1
+                entry.last_used = time.monotonic()
+                if (
+                    reusable
+                    and not self._closed
+                    and entry.alive
+                    and self._idle_timeout_s > 0
+                    and (self._max_reuse is None or entry.uses < self._max_reuse)
+                ):
+                    self._idle.append(entry)
+                else:
+                    entry.close()
+
+    async def aclose(self) -> None:
+        """Close the idle sessions and wait for them to shut down.
+
+        Sessions still borrowed are closed when they are returned.
+        """
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for entry in idle:
+            entry.close()
+        await asyncio.gather(*(entry.wait_closed() for entry in idle))
 
 
 MCP_SYSTEM_PROMPT = """## MCP Tools
@@ -127,6 +363,9 @@ class MCPMiddleware(AgentMiddleware):
         before_tool_call: Optional async callback before each tool call.
         after_tool_call: Optional async callback after each tool call.
         system_prompt: Optional custom system prompt override.
+        background_audit: Deliver `after_tool_call` records from a background
+            queue instead of awaiting the hook inline, so slow hooks don't add
+            to tool latency. Call `flush_audit()` before shutdown.
 
     Raises:
         ImportError: If MCP dependencies are not installed.
@@ -139,46 +378,67 @@ class MCPMiddleware(AgentMiddleware):
         before_tool_call: BeforeToolCallHook | None = None,
         after_tool_call: AfterToolCallHook | None = None,
         system_prompt: str | None = None,
+        background_audit: bool = False,
     ) -> None:
         """Initialize MCP middleware."""
-        if not _check_mcp_available():
+        if _get_mcp_client_class() is None:
             msg = "MCP dependencies not installed. Install with: pip install deepagents[mcp]"
             raise ImportError(msg)
 
         self.config = config
         self._before_tool_call = before_tool_call
         self._after_tool_call = after_tool_call
+        self._after_is_async = _is_async_callable(after_tool_call)
         self._custom_system_prompt = system_prompt
         self._name_registry = ToolNameRegistry()
 
         # Tools will be loaded lazily or eagerly depending on usage
         self._tools: list[BaseTool] = []
         self._tools_loaded = False
+        self._load_lock = threading.Lock()
         self._load_errors: list[str] = []
 
         # Server metadata for wrapped tools
         self._tool_metadata: dict[str, tuple[str, str]] = {}  # prefixed_name -> (server, original)
+        self._tools_by_server: dict[str, list[BaseTool]] = {}
 
         # MCP client for resource/prompt access (set during load_tools_async)
         self._client: Any = None
+        self._session_pools: dict[str, _SessionPool] = {}
+
+        # Tools of lazy servers, materialized on first use: server -> original name -> tool
+        self._lazy_tools: dict[str, dict[str, BaseTool]] = {}
+        self._lazy_locks: dict[str, asyncio.Lock] = {}
+
+        # Background audit delivery, bound to the loop the queue was created on
+        self._background_audit = background_audit
+        self._audit_queue: asyncio.Queue[tuple[ToolCallAuditInfo, ToolCallResult]] | None = None
+        self._audit_task: asyncio.Task[None] | None = None
+        self._audit_loop: asyncio.AbstractEventLoop | None = None
+        self._audit_dropped = 0
 
     @property
     def tools(self) -> list[BaseTool]:
         """Get loaded MCP tools.
 
-        Triggers synchronous tool loading if not already loaded.
+        Triggers synchronous tool loading if not already loaded. Inside a
+        running event loop tools cannot be loaded synchronously; call
+        `await load_tools_async()` first, otherwise this warns and returns
+        the tools loaded so far.
         """
-        if not self._tools_loaded:
-            # Run async loading in sync context
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # We're in an async context, can't block
-                    logger.warning("MCP tools not loaded yet - call load_tools_async() first in async context")
-                else:
-                    loop.run_until_complete(self.load_tools_async())
-            except RuntimeError:
-                # No event loop, create one
+        if self._tools_loaded:
+            return self._tools
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            logger.warning("MCP tools not loaded yet - call await load_tools_async() first in async context")
+            return self._tools
+
+        with self._load_lock:
+            if not self._tools_loaded:
                 asyncio.run(self.load_tools_async())
         return self._tools
 
@@ -191,8 +451,6 @@ class MCPMiddleware(AgentMiddleware):
         if self._tools_loaded:
             return self._tools
 
-        from langchain_mcp_adapters.client import MultiServerMCPClient
-
         # Build server config for MultiServerMCPClient
         client_config: dict[str, dict[str, Any]] = {}
 
@@ -207,29 +465,58 @@ class MCPMiddleware(AgentMiddleware):
             self._tools_loaded = True
             return self._tools
 
+        # Lazy servers are not contacted until the agent first uses them
+        eager_servers = [name for name in client_config if not self.config.servers[name].lazy]
+
         # Connect and load tools
+        server_errors: list[tuple[str, Exception]] = []
         try:
-            client = MultiServerMCPClient(client_config)
+            client_class = _get_mcp_client_class()
+            client = client_class(client_config)
             # Store client for resource/prompt access
             self._client = client
-            raw_tools = await client.get_tools()
+
+            # Connect to servers concurrently, so startup takes the slowest server's time rather than the sum
+            semaphore = asyncio.Semaphore(self.config.max_parallel_connections)
+
+            async def load_server_tools(server_name: str) -> list[BaseTool] | Exception:
+                # One server's failure must not abort the others; it is handled per server below
+                async with semaphore:
+                    try:
+                        return await client.get_tools(server_name=server_name)
+                    except Exception as e:
+                        return e
+
+            results = await asyncio.gather(*(load_server_tools(name) for name in eager_servers))
+            loaded: list[tuple[str, list[BaseTool]]] = []
+            for server_name, result in zip(eager_servers, results, strict=True):
+                if isinstance(result, Exception):
+                    server_errors.append((server_name, result))
+                else:
+                    loaded.append((server_name, result))
 
             # Process and wrap tools
-            for tool in raw_tools:
-                wrapped = self._wrap_tool(tool)
-                if wrapped:
-                    self._tools.append(wrapped)
+            self._wrap_tools(loaded)
+
+            # Add proxy tools for lazy servers
+            for server_name in client_config:
+                server_config = self.config.servers[server_name]
+                if server_config.lazy:
+                    self._tools.extend(self._create_lazy_tools(server_name, server_config))
 
             # Add resource and prompt tools for each server
             for server_name, server_config in self.config.servers.items():
-                self._tools.extend(self._create_resource_tools(server_name, server_config))
-                self._tools.extend(self._create_prompt_tools(server_name, server_config))
+                self._tools.extend(self._create_aux_tools(server_name, server_config))
 
         except Exception as e:
             logger.error("Failed to connect to MCP servers: %s", e)
             if self.config.fail_behavior == FailBehavior.FAIL_CLOSED:
                 raise
 
+        # Apply each failed server's own fail behavior
+        for server_name, error in server_errors:
+            self._handle_server_error(server_name, error)
+
         self._tools_loaded = True
         return self._tools
 
@@ -275,48 +562,41 @@ class MCPMiddleware(AgentMiddleware):
             raise RuntimeError(error_msg) from error
         logger.warning(error_msg)
 
-    def _wrap_tool(self, tool: BaseTool) -> BaseTool | None:
-        """Wrap an MCP tool with naming and audit hooks.
+    def _wrap_tools(self, loaded: list[tuple[str, list[BaseTool]]]) -> None:
+        """Filter, name, and wrap the tools of several servers with audit hooks.
 
-        Args:
-            tool: The original tool from MCP.
+        Names are registered as one batch so collisions across servers are
+        resolved in a single pass.
 
-        Returns:
-            Wrapped tool or None if filtered out.
+        Args:
+            loaded: `(server_name, tools)` pairs, in server order.
         """
-        # Extract server name from tool metadata or name
-        # MultiServerMCPClient prefixes tools with server name
-        parts = tool.name.split("_", 1)
-        if len(parts) == 2:
-            server_name, original_name = parts
-        else:
-            server_name = "unknown"
-            original_name = tool.name
-
-        # Check if server config exists and tool is allowed
-        server_config = self.config.servers.get(server_name)
-        if server_config and not server_config.is_tool_allowed(original_name):
-            logger.debug("Tool '%s' from '%s' filtered by allow/block list", original_name, server_name)
-            return None
-
-        # Register tool name
-        prefix = ""
-        if server_config:
+        candidates: list[tuple[str, BaseTool, str]] = []
+        for server_name, tools in loaded:
+            server_config = self.config.servers[server_name]
             prefix = server_config.get_effective_prefix(server_name)
+            self._tools_by_server.setdefault(server_name, [])
+            # Tools are loaded per server, unprefixed, so each name is the server's own
+            for tool in tools:
+                if server_config.is_tool_allowed(tool.name):
+                    candidates.append((server_name, tool, prefix))
+                else:
+                    logger.debug("Tool '%s' from '%s' filtered by allow/block list", tool.name, server_name)
 
-        try:
-            name_info = self._name_registry.register_tool(original_name, server_name, prefix)
-        except ValueError as e:
-            logger.error("Tool name collision: %s", e)
-            if self.config.fail_behavior == FailBehavior.FAIL_CLOSED:
-                raise
-            return None
+        name_infos = self._name_registry.register_tools([(tool.name, server_name, prefix) for server_name, tool, prefix in candidates])
+        for (server_name, tool, _), name_info in zip(candidates, name_infos, strict=True):
+            if isinstance(name_info, ValueError):
+                logger.error("Tool name collision: %s", name_info)
+                if self.config.fail_behavior == FailBehavior.FAIL_CLOSED:
+                    raise name_info
+                continue
 
-        # Store metadata for audit hooks
-        self._tool_metadata[name_info.prefixed_name] = (server_name, original_name)
+            # Store metadata for audit hooks
+            self._tool_metadata[name_info.prefixed_name] = (server_name, tool.name)
 
-        # Create wrapped tool with audit hooks
-        return self._create_audited_tool(tool, name_info.prefixed_name, server_name, original_name)
+            wrapped = self._create_audited_tool(tool, name_info.prefixed_name, server_name, tool.name)
+            self._tools_by_server[server_name].append(wrapped)
+            self._tools.append(wrapped)
 
     def _create_audited_tool(
         self,
@@ -339,6 +619,44 @@ class MCPMiddleware(AgentMiddleware):
         before_hook = self._before_tool_call
         after_hook = self._after_tool_call
 
+        # Specialize the wrapper once per tool, so each call runs only the branches it needs
+        if hasattr(original_tool, "ainvoke"):
+            call_tool = original_tool.ainvoke
+        else:
+
+            async def call_tool(kwargs: dict[str, Any]) -> Any:
+                return original_tool.invoke(kwargs)
+
+        if before_hook is None and after_hook is None:
+            # Nothing to audit, so skip building audit records entirely
+            async def audited_func(**kwargs: Any) -> Any:
+                """Wrapped tool function without audit hooks."""
+                return await call_tool(kwargs)
+
+            return _rebind_tool(original_tool, prefixed_name, audited_func)
+
+        run_before_hook: Callable[[ToolCallAuditInfo], Awaitable[None]] | None = None
+        if before_hook is not None:
+            if _is_async_callable(before_hook):
+                run_before_hook = before_hook  # type: ignore[assignment]
+            else:
+
+                async def run_before_hook(audit_info: ToolCallAuditInfo) -> None:
+                    result = before_hook(audit_info)
+                    # Sync callables may still hand back an awaitable
+                    if asyncio.iscoroutine(result):
+                        await result
+
+        run_after_hook: Callable[[ToolCallAuditInfo, ToolCallResult], Awaitable[None]] | None = None
+        if after_hook is not None:
+            if self._background_audit:
+
+                async def run_after_hook(audit_info: ToolCallAuditInfo, call_result: ToolCallResult) -> None:
+                    self._enqueue_audit(audit_info, call_result)
+
+            else:
+                run_after_hook = self._run_after_hook
+
         async def audited_func(**kwargs: Any) -> Any:
             """Wrapped tool function with audit hooks."""
             audit_info = ToolCallAuditInfo(
@@ -350,57 +668,118 @@ class MCPMiddleware(AgentMiddleware):
             )
 
             # Before hook
-            if before_hook:
-                result = before_hook(audit_info)
-                if asyncio.iscoroutine(result):
-                    await result
+            if run_before_hook is not None:
+                await run_before_hook(audit_info)
 
             # Execute tool
-            start_time = time.perf_counter()
+            start_ns = time.perf_counter_ns()
             try:
-                if hasattr(original_tool, "ainvoke"):
-                    output = await original_tool.ainvoke(kwargs)
-                else:
-                    output = original_tool.invoke(kwargs)
+                output = await call_tool(kwargs)
 
-                latency_ms = (time.perf_counter() - start_time) * 1000
+                latency_ns = time.perf_counter_ns() - start_ns
 
                 # After hook
-                if after_hook:
+                if run_after_hook is not None:
                     call_result = ToolCallResult(
                         success=True,
-                        latency_ms=latency_ms,
-                        output_size=len(str(output)),
+                        latency_ms=latency_ns / 1_000_000,
+                        output_size=_estimate_output_size(output),
+                        latency_ns=latency_ns,
                     )
-                    result = after_hook(audit_info, call_result)
-                    if asyncio.iscoroutine(result):
-                        await result
+                    await run_after_hook(audit_info, call_result)
 
                 return output
 
             except Exception as e:
-                latency_ms = (time.perf_counter() - start_time) * 1000
+                latency_ns = time.perf_counter_ns() - start_ns
 
-                if after_hook:
+                if run_after_hook is not None:
                     call_result = ToolCallResult(
                         success=False,
-                        latency_ms=latency_ms,
+                        latency_ms=latency_ns / 1_000_000,
                         output_size=0,
                         error=str(e),
+                        latency_ns=latency_ns,
                     )
-                    result = after_hook(audit_info, call_result)
-                    if asyncio.iscoroutine(result):
-                        await result
+                    await run_after_hook(audit_info, call_result)
 
                 raise
 
-        return StructuredTool.from_function(
-            func=None,
-            coroutine=audited_func,
-            name=prefixed_name,
-            description=original_tool.description,
-            args_schema=original_tool.args_schema,
-        )
+        return _rebind_tool(original_tool, prefixed_name, audited_func)
+
+    async def _run_after_hook(self, audit_info: ToolCallAuditInfo, call_result: ToolCallResult) -> None:
+        """Deliver one audit record to the after hook."""
+        if self._after_is_async:
+            await self._after_tool_call(audit_info, call_result)  # type: ignore[misc]
+        else:
+            result = self._after_tool_call(audit_info, call_result)  # type: ignore[misc]
+            # Sync callables may still hand back an awaitable
+            if asyncio.iscoroutine(result):
+                await result
+
+    def _enqueue_audit(self, audit_info: ToolCallAuditInfo, call_result: ToolCallResult) -> None:
+        """Queue an audit record for background delivery, dropping it if the queue is full."""
+        loop = asyncio.get_running_loop()
+        queue = self._audit_queue
+        if queue is None or self._audit_loop is not loop or self._audit_task is None or self._audit_task.done():
+            queue = self._audit_queue = asyncio.Queue(maxsize=_AUDIT_QUEUE_SIZE)
+            self._audit_loop = loop
+            self._audit_task = loop.create_task(self._drain_audit_queue(queue))
+        try:
+            queue.put_nowait((audit_info, call_result))
+        except asyncio.QueueFull:
+            self._audit_dropped += 1
+            logger.warning("MCP audit queue full, dropped record for %s (%d dropped so far)", audit_info.prefixed_name, self._audit_dropped)
+
+    async def _drain_audit_queue(self, queue: asyncio.Queue[tuple[ToolCallAuditInfo, ToolCallResult]]) -> None:
+        """Deliver queued audit records in order, taking whatever has accumulated per wakeup."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            for audit_info, call_result in batch:
+                try:
+                    await self._run_after_hook(audit_info, call_result)
+                except Exception:
+                    logger.exception("after_tool_call hook failed for %s", audit_info.prefixed_name)
+                finally:
+                    queue.task_done()
+
+    async def aclose(self) -> None:
+        """Deliver pending audit records and close the pooled sessions.
+
+        Call it before shutting down, on the loop the tools ran on. It stops
+        the background audit task and closes the sessions used by the resource
+        and prompt tools. Tools called afterwards open new sessions and, with
+        `background_audit=True`, start a new audit task.
+        """
+        loop = asyncio.get_running_loop()
+        await self.flush_audit()
+        task, audit_loop = self._audit_task, self._audit_loop
+        self._audit_task = self._audit_queue = self._audit_loop = None
+        if task is not None and not task.done():
+            if audit_loop is loop:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+            elif audit_loop is not None and not audit_loop.is_closed():
+                audit_loop.call_soon_threadsafe(task.cancel)
+
+        pools, self._session_pools = self._session_pools, {}
+        # Sessions on another loop can't be closed from here; they still close after their idle timeout
+        await asyncio.gather(*(pool.aclose() for pool in pools.values() if pool.loop is loop))
+
+    async def flush_audit(self) -> None:
+        """Wait until every queued audit record has been delivered.
+
+        Only needed with `background_audit=True`; call it before shutting down
+        so pending records reach the after hook.
+        """
+        if self._audit_queue is not None and self._audit_loop is asyncio.get_running_loop():
+            await self._audit_queue.join()
 
     # --- AgentMiddleware Interface ---
 
@@ -454,26 +833,170 @@ class MCPMiddleware(AgentMiddleware):
         """
         return list(self._load_errors)
 
-    def _create_resource_tools(
+    def _acquire_session(self, server_name: str) -> AbstractAsyncContextManager[Any]:
+        """Borrow a pooled session for `server_name`, creating its pool on first use."""
+        pool = self._session_pools.get(server_name)
+        if pool is None or pool.loop.is_closed():
+            pool = self._session_pools[server_name] = _SessionPool(self._client, server_name, self.config.servers[server_name])
+        return pool.acquire()
+
+    async def _materialize_server_tools(self, server_name: str) -> dict[str, BaseTool]:
+        """Load and wrap the tools of a lazy server, once.
+
+        Args:
+            server_name: Name of the MCP server.
+
+        Returns:
+            Dict mapping original tool names to audited tools.
+        """
+        tools = self._lazy_tools.get(server_name)
+        if tools is not None:
+            return tools
+
+        # Concurrent first calls wait for a single load instead of each fetching the tools
+        async with self._lazy_locks.setdefault(server_name, asyncio.Lock()):
+            tools = self._lazy_tools.get(server_name)
+            if tools is not None:
+                return tools
+
+            server_config = self.config.servers[server_name]
+            prefix = server_config.get_effective_prefix(server_name)
+            tools = {}
+            for tool in await self._client.get_tools(server_name=server_name):
+                if not server_config.is_tool_allowed(tool.name):
+                    continue
+                prefixed_name = resolve_tool_name(tool.name, prefix)
+                tools[tool.name] = self._create_audited_tool(tool, prefixed_name, server_name, tool.name)
+
+            self._lazy_tools[server_name] = tools
+        return tools
+
+    def _create_lazy_tools(
         self,
         server_name: str,
         server_config: MCPServerConfig,
     ) -> list[BaseTool]:
-        """Create tools for fetching MCP resources.
+        """Create proxy tools for a lazily loaded MCP server.
 
-        Only created if enable_resources is True in server config.
+        Instead of one tool (and schema) per server tool, the agent gets a
+        compact `list_tools` / `call_tool` pair. The server is only contacted,
+        and its tools materialized, when one of them is first called.
 
         Args:
             server_name: Name of the MCP server.
             server_config: Server configuration.
 
         Returns:
-            List of resource tools (may be empty).
+            List of proxy tools, empty if their names collide with other tools.
         """
-        if not server_config.enable_resources:
+        prefix = server_config.get_effective_prefix(server_name)
+        names: list[str] = []
+        for name_info in self._name_registry.register_tools([("list_tools", server_name, prefix), ("call_tool", server_name, prefix)]):
+            if isinstance(name_info, ValueError):
+                logger.error("Tool name collision: %s", name_info)
+                if self.config.fail_behavior == FailBehavior.FAIL_CLOSED:
+                    raise name_info
+                return []
+            names.append(name_info.prefixed_name)
+        list_name, call_name = names
+
+        # Capture self for closure
+        middleware = self
+
+        async def list_tools() -> str:
+            """List the tools available on the MCP server.
+
+            Returns:
+                One line per tool with its name and a short description.
+            """
+            if middleware._client is None:
+                return f"Error: MCP client not initialized for {server_name}"
+
+            try:
+                tools = await middleware._materialize_server_tools(server_name)
+            except Exception as e:
+                logger.error("Failed to load tools from %s: %s", server_name, e)
+                return f"Error loading tools from {server_name}: {e}"
+
+            if not tools:
+                return f"No tools available on {server_name}"
+            lines = []
+            for name, tool in tools.items():
+                summary = (tool.description or "").strip().split("\n", 1)[0]
+                lines.append(f"- {name}: {summary}" if summary else f"- {name}")
+            return "\n".join(lines)
+
+        async def call_tool(tool_name: str, arguments: dict[str, Any] | None = None) -> Any:
+            """Call a tool on the MCP server.
+
+            Args:
+                tool_name: Name of the tool, as returned by the list tool.
+                arguments: Arguments to pass to the tool.
+
+            Returns:
+                The tool output.
+            """
+            if middleware._client is None:
+                return f"Error: MCP client not initialized for {server_name}"
+
+            try:
+                tools = await middleware._materialize_server_tools(server_name)
+            except Exception as e:
+                logger.error("Failed to load tools from %s: %s", server_name, e)
+                return f"Error loading tools from {server_name}: {e}"
+
+            tool = tools.get(tool_name)
+            if tool is None:
+                return f"Error: Unknown tool '{tool_name}' on {server_name}. Use {list_name} to see available tools."
+            return await tool.ainvoke(arguments or {})
+
+        return [
+            StructuredTool.from_function(
+                func=None,
+                coroutine=list_tools,
+                name=list_name,
+                description=f"List the tools available on the {server_name} MCP server. Call this before {call_name} to discover tool names.",
+            ),
+            StructuredTool.from_function(
+                func=None,
+                coroutine=call_tool,
+                name=call_name,
+                description=f"Call a tool on the {server_name} MCP server by name, passing its arguments as an object.",
+            ),
+        ]
+
+    def _create_aux_tools(self, server_name: str, server_config: MCPServerConfig) -> list[BaseTool]:
+        """Create the resource and prompt tools enabled for a server.
+
+        Args:
+            server_name: Name of the MCP server.
+            server_config: Server configuration.
+
+        Returns:
+            List of resource/prompt tools (may be empty).
+        """
+        if not (server_config.enable_resources or server_config.enable_prompts):
             return []
 
         prefix = server_config.get_effective_prefix(server_name)
+        tools: list[BaseTool] = []
+        if server_config.enable_resources:
+            tools.append(self._create_resource_tool(server_name, server_config, prefix))
+        if server_config.enable_prompts:
+            tools.append(self._create_prompt_tool(server_name, prefix))
+        return tools
+
+    def _create_resource_tool(self, server_name: str, server_config: MCPServerConfig, prefix: str) -> BaseTool:
+        """Create the tool for fetching MCP resources.
+
+        Args:
+            server_name: Name of the MCP server.
+            server_config: Server configuration.
+            prefix: Effective tool name prefix for the server.
+
+        Returns:
+            The resource tool.
+        """
         tool_name = f"{prefix}_read_resource" if prefix else "read_resource"
 
         # Capture self for closure
@@ -492,24 +1015,16 @@ class MCPMiddleware(AgentMiddleware):
                 return f"Error: MCP client not initialized for {server_name}"
 
             try:
-                from langchain_mcp_adapters.resources import load_mcp_resources
-
                 logger.info("Fetching resource %s from %s", uri, server_name)
-                async with middleware._client.session(server_name) as session:
+                async with middleware._acquire_session(server_name) as session:
                     blobs = await load_mcp_resources(session, uris=[uri])
                     if not blobs:
                         return f"No resource found at URI: {uri}"
 
-                    # Convert blob to string content
                     blob = blobs[0]
-                    content_bytes = blob.as_bytes()
-                    # Try to decode as text, fallback to base64 for binary
-                    try:
-                        content = content_bytes.decode("utf-8")
-                    except UnicodeDecodeError:
-                        import base64
-
-                        content = f"[Binary content, base64 encoded]\n{base64.b64encode(content_bytes).decode('ascii')}"
+                    # Text resources arrive as str; avoid round-tripping them through bytes
+                    data = blob.data if isinstance(blob.data, str | bytes) else blob.as_bytes()
+                    content = _format_resource_content(data, server_config.max_resource_bytes)
 
                     return f"Resource: {uri}\nMIME type: {blob.mimetype}\n\n{content}"
 
@@ -517,35 +1032,23 @@ class MCPMiddleware(AgentMiddleware):
                 logger.error("Failed to fetch resource %s from %s: %s", uri, server_name, e)
                 return f"Error fetching resource {uri}: {e}"
 
-        return [
-            StructuredTool.from_function(
-                func=None,
-                coroutine=read_resource,
-                name=tool_name,
-                description=f"Read a resource from the {server_name} MCP server by URI. Resources provide access to data like files, database records, or other content managed by the server.",
-            )
-        ]
-
-    def _create_prompt_tools(
-        self,
-        server_name: str,
-        server_config: MCPServerConfig,
-    ) -> list[BaseTool]:
-        """Create tools for fetching MCP prompts.
+        return StructuredTool.from_function(
+            func=None,
+            coroutine=read_resource,
+            name=tool_name,
+            description=f"Read a resource from the {server_name} MCP server by URI. Resources provide access to data like files, database records, or other content managed by the server.",
+        )
 
-        Only created if enable_prompts is True in server config.
+    def _create_prompt_tool(self, server_name: str, prefix: str) -> BaseTool:
+        """Create the tool for fetching MCP prompts.
 
         Args:
             server_name: Name of the MCP server.
-            server_config: Server configuration.
+            prefix: Effective tool name prefix for the server.
 
         Returns:
-            List of prompt tools (may be empty).
+            The prompt tool.
         """
-        if not server_config.enable_prompts:
-            return []
-
-        prefix = server_config.get_effective_prefix(server_name)
         tool_name = f"{prefix}_get_prompt" if prefix else "get_prompt"
 
         # Capture self for closure
@@ -565,10 +1068,8 @@ class MCPMiddleware(AgentMiddleware):
                 return f"Error: MCP client not initialized for {server_name}"
 
             try:
-                from langchain_mcp_adapters.prompts import load_mcp_prompt
-
                 logger.info("Fetching prompt %s from %s", name, server_name)
-                async with middleware._client.session(server_name) as session:
+                async with middleware._acquire_session(server_name) as session:
                     messages = await load_mcp_prompt(
                         session,
                         name,
@@ -578,28 +1079,15 @@ class MCPMiddleware(AgentMiddleware):
                     if not messages:
                         return f"No prompt found with name: {name}"
 
-                    # Format messages as readable text
-                    output_parts = [f"Prompt: {name}"]
-                    if arguments:
-                        output_parts.append(f"Arguments: {arguments}")
-                    output_parts.append("")
-
-                    for msg in messages:
-                        role = getattr(msg, "type", "message")
-                        content = getattr(msg, "content", str(msg))
-                        output_parts.append(f"[{role}]\n{content}")
-
-                    return "\n".join(output_parts)
+                    return _format_prompt(name, arguments, messages)
 
             except Exception as e:
                 logger.error("Failed to fetch prompt %s from %s: %s", name, server_name, e)
                 return f"Error fetching prompt {name}: {e}"
 
-        return [
-            StructuredTool.from_function(
-                func=None,
-                coroutine=get_prompt,
-                name=tool_name,
-                description=f"Get a prompt template from the {server_name} MCP server. Prompts are reusable templates that can be customized with arguments.",
-            )
-        ]
+        return StructuredTool.from_function(
+            func=None,
+            coroutine=get_prompt,
+            name=tool_name,
+            description=f"Get a prompt template from the {server_name} MCP server. Prompts are reusable templates that can be customized with arguments.",
+        )
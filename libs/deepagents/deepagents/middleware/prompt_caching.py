@@ -7,21 +7,51 @@ implementation but presents a provider-agnostic interface.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal
+import functools
+from typing import Literal
 
-if TYPE_CHECKING:
-    from typing import Self
+from langchain.agents.middleware.types import AgentMiddleware
 
-# Import the underlying Anthropic implementation
-try:
-    from langchain_anthropic.middleware import (
-        AnthropicPromptCachingMiddleware as _AnthropicPromptCachingMiddleware,
-    )
 
-    _HAS_ANTHROPIC = True
-except ImportError:
-    _AnthropicPromptCachingMiddleware = None  # type: ignore[misc, assignment]
-    _HAS_ANTHROPIC = False
+@functools.cache
+def _anthropic_caching_middleware() -> type[AgentMiddleware] | None:
+    """Import the underlying Anthropic implementation on first use, if installed.
+
+    Deferring the import keeps `langchain_anthropic` off the `import deepagents`
+    path; the probe runs at most once per process.
+    """
+    try:
+        from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
+    except ImportError:
+        return None
+    return AnthropicPromptCachingMiddleware
+
+
+class _NoOpCachingMiddleware(AgentMiddleware):
+    """No-op middleware when no prompt caching implementation is available."""
+
+
+def create_prompt_caching_middleware(
+    unsupported_model_behavior: Literal["ignore", "warn", "error"] = "ignore",
+) -> AgentMiddleware:
+    """Create the prompt caching middleware available in this environment.
+
+    Returns the provider-specific implementation, or a no-op middleware if
+    none is installed.
+
+    Args:
+        unsupported_model_behavior: How to handle unsupported models.
+            - "ignore": Silently pass through without caching (default)
+            - "warn": Log a warning but continue
+            - "error": Raise an exception
+
+    Returns:
+        The prompt caching middleware.
+    """
+    anthropic_middleware = _anthropic_caching_middleware()
+    if anthropic_middleware is not None:
+        return anthropic_middleware(unsupported_model_behavior=unsupported_model_behavior)
+    return _NoOpCachingMiddleware()
 
 
 class PromptCachingMiddleware:
@@ -30,6 +60,9 @@ class PromptCachingMiddleware:
     Caches system prompts to reduce API costs and latency for subsequent calls.
     Currently supports Anthropic models with automatic fallback for unsupported providers.
 
+    Constructing it returns the same middleware as
+    `create_prompt_caching_middleware`, which new code should prefer.
+
     Args:
         unsupported_model_behavior: How to handle unsupported models.
             - "ignore": Silently pass through without caching (default)
@@ -49,31 +82,12 @@ class PromptCachingMiddleware:
         ```
     """
 
-    def __new__(
+    def __new__(  # type: ignore[misc]
         cls,
         unsupported_model_behavior: Literal["ignore", "warn", "error"] = "ignore",
-    ) -> Self:
-        """Create a new PromptCachingMiddleware instance.
-
-        Returns the appropriate provider-specific implementation based on
-        what's available in the environment.
-        """
-        if _HAS_ANTHROPIC and _AnthropicPromptCachingMiddleware is not None:
-            # Return the Anthropic implementation directly
-            return _AnthropicPromptCachingMiddleware(  # type: ignore[return-value]
-                unsupported_model_behavior=unsupported_model_behavior
-            )
-        # Return a no-op middleware if no caching implementation is available
-        return object.__new__(_NoOpCachingMiddleware)  # type: ignore[return-value]
-
-
-class _NoOpCachingMiddleware(PromptCachingMiddleware):
-    """No-op middleware when no prompt caching implementation is available."""
-
-    def __new__(cls) -> _NoOpCachingMiddleware:
-        """Create a no-op middleware instance."""
-        return object.__new__(cls)
+    ) -> AgentMiddleware:
+        """Create the provider-specific implementation available in the environment."""
+        return create_prompt_caching_middleware(unsupported_model_behavior)
 
 
-# Export the main class
-__all__ = ["PromptCachingMiddleware"]
+__all__ = ["PromptCachingMiddleware", "create_prompt_caching_middleware"]
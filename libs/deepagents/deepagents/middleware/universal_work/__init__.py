@@ -20,39 +20,92 @@ Example:
     ```
 """
 
-from deepagents.middleware.universal_work.middleware import (
-    UniversalWorkMiddleware,
-)
-from deepagents.middleware.universal_work.models import (
-    ActivityType,
-    AgentActivity,
-    AgentSession,
-    FeedbackEvent,
-    Link,
-    LinkType,
-    OwnerType,
-    PlanStep,
-    PlanStepStatus,
-    SessionState,
-    SuggestionType,
-    TriageSuggestion,
-    TriageSuggestionBundle,
-    WorkItem,
-    WorkItemStatus,
-)
-from deepagents.middleware.universal_work.retrieval import (
-    DuplicateReranker,
-    RelatedReranker,
-    Reranker,
-    RetrievalBackend,
-    RetrievalCandidate,
-    SimpleKeywordRetrieval,
-    TriageEngine,
-)
-from deepagents.middleware.universal_work.storage import (
-    FileBackendStorage,
-    WorkStorageProtocol,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from deepagents.middleware.universal_work.middleware import (
+        UniversalWorkMiddleware,
+    )
+    from deepagents.middleware.universal_work.models import (
+        ActivityType,
+        AgentActivity,
+        AgentSession,
+        FeedbackEvent,
+        Link,
+        LinkType,
+        OwnerType,
+        PlanStep,
+        PlanStepStatus,
+        SessionState,
+        SuggestionType,
+        TriageSuggestion,
+        TriageSuggestionBundle,
+        WorkItem,
+        WorkItemStatus,
+    )
+    from deepagents.middleware.universal_work.retrieval import (
+        DuplicateReranker,
+        RelatedReranker,
+        Reranker,
+        RetrievalBackend,
+        RetrievalCandidate,
+        SimpleKeywordRetrieval,
+        TriageEngine,
+    )
+    from deepagents.middleware.universal_work.storage import (
+        FileBackendStorage,
+        WorkStorageProtocol,
+    )
+
+# Public names resolved on first access (PEP 562), so importing one symbol
+# doesn't pull in the retrieval engine and storage backends as well
+_LAZY_IMPORTS: dict[str, str] = {
+    "ActivityType": "models",
+    "AgentActivity": "models",
+    "AgentSession": "models",
+    "DuplicateReranker": "retrieval",
+    "FeedbackEvent": "models",
+    "FileBackendStorage": "storage",
+    "Link": "models",
+    "LinkType": "models",
+    "OwnerType": "models",
+    "PlanStep": "models",
+    "PlanStepStatus": "models",
+    "RelatedReranker": "retrieval",
+    "Reranker": "retrieval",
+    "RetrievalBackend": "retrieval",
+    "RetrievalCandidate": "retrieval",
+    "SessionState": "models",
+    "SimpleKeywordRetrieval": "retrieval",
+    "SuggestionType": "models",
+    "TriageEngine": "retrieval",
+    "TriageSuggestion": "models",
+    "TriageSuggestionBundle": "models",
+    "UniversalWorkMiddleware": "middleware",
+    "WorkItem": "models",
+    "WorkItemStatus": "models",
+    "WorkStorageProtocol": "storage",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module's attributes, including not-yet-imported public names."""
+    return sorted({*globals(), *_LAZY_IMPORTS})
+
 
 __all__ = [
     "ActivityType",
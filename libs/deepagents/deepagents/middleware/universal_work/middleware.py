@@ -6,10 +6,16 @@ persistent WorkItem and PlanStep models, plus additional universal work tools.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -30,6 +36,7 @@ from deepagents.middleware.universal_work.models import (
     PlanStep,
     PlanStepStatus,
     SuggestionType,
+    TriageSuggestionBundle,
     WorkItem,
     WorkItemStatus,
 )
@@ -44,6 +51,59 @@ from deepagents.middleware.universal_work.storage import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Triage suggestion cache bounds
+_TRIAGE_CACHE_SIZE = 128
+_TRIAGE_CACHE_TTL_S = 30.0
+
+# Value -> member maps for coercing tool arguments without raising on bad input
+_WORK_ITEM_STATUS_MAP: dict[str, WorkItemStatus] = {s.value: s for s in WorkItemStatus}
+_LINK_TYPE_MAP: dict[str, LinkType] = {t.value: t for t in LinkType}
+_ACTIVITY_TYPE_MAP: dict[str, ActivityType] = {t.value: t for t in ActivityType}
+_SUGGESTION_TYPE_MAP: dict[str, SuggestionType] = {t.value: t for t in SuggestionType}
+
+# Executor for the async tools' blocking storage calls, shared by every middleware
+# instance so building many agents does not leave a worker thread behind each one.
+# Its single worker keeps read-modify-write cycles serialized.
+_STORAGE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="universal-work")
+
+
+async def _run_in_executor(executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking tool body on the storage executor, keeping the event loop free."""
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+class _TTLCache(Generic[K, V]):
+    """Small thread-safe LRU cache whose entries expire after `ttl_s` seconds."""
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
 
 # --- Tool Descriptions ---
 
@@ -80,58 +140,69 @@ Use this to:
 # --- Backward-Compatible Todo Tools ---
 
 
-def _create_write_todos_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _status_from_plan(plan_steps: list[PlanStep]) -> WorkItemStatus | None:
+    """Derive a WorkItem status from its plan, or None to leave it unchanged."""
+    # One pass over the steps for both conditions
+    completed = PlanStepStatus.COMPLETED
+    in_progress = PlanStepStatus.IN_PROGRESS
+    all_completed = True
+    for step in plan_steps:
+        status = step.status
+        if status != completed:
+            all_completed = False
+            if status == in_progress:
+                return WorkItemStatus.IN_PROGRESS
+
+    if all_completed and plan_steps:
+        return WorkItemStatus.DONE
+    return None
+
+
+def _create_write_todos_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the write_todos tool backed by persistent storage."""
 
-    async def async_write_todos(
+    def sync_write_todos(
         todos: list[dict[str, Any]],
         runtime: ToolRuntime,
     ) -> str:
         """Write todos to the current WorkItem's plan steps."""
-        # Get or create current WorkItem
-        current_id = storage.get_current_work_item_id()
-
-        if current_id is None:
-            # Auto-create WorkItem from current objective
-            item = WorkItem(
-                title="Current Task",
-                body="Auto-created from agent objective",
-                status=WorkItemStatus.IN_PROGRESS,
-                owner_type=OwnerType.AGENT,
-            )
-            item = storage.create_work_item(item)
-            storage.set_current_work_item_id(item.id)
-            current_id = item.id
-            logger.info(f"Auto-created WorkItem {item.id} for todos")
-
-        # Convert todos to PlanSteps
-        plan_steps = []
-        for i, todo in enumerate(todos):
-            step = PlanStep.from_todo_dict(todo, current_id, position=i)
-            plan_steps.append(step)
-
-        # Replace all plan steps for this work item
-        storage.replace_plan_steps(current_id, plan_steps)
-
-        # Update WorkItem status based on plan step statuses
-        item = storage.get_work_item(current_id)
-        if item:
-            all_completed = all(s.status == PlanStepStatus.COMPLETED for s in plan_steps)
-            any_in_progress = any(s.status == PlanStepStatus.IN_PROGRESS for s in plan_steps)
-
-            if all_completed and plan_steps:
-                item.status = WorkItemStatus.DONE
-            elif any_in_progress:
-                item.status = WorkItemStatus.IN_PROGRESS
-
-            storage.update_work_item(item)
+        # Coalesce the steps' and item's file rewrites into one write each
+        with storage.buffered():
+            # Get or create current WorkItem
+            current_id = storage.get_current_work_item_id()
+
+            if current_id is None:
+                # Auto-create WorkItem from current objective
+                item = WorkItem(
+                    title="Current Task",
+                    body="Auto-created from agent objective",
+                    status=WorkItemStatus.IN_PROGRESS,
+                    owner_type=OwnerType.AGENT,
+                )
+                item = storage.create_work_item(item)
+                storage.set_current_work_item_id(item.id)
+                current_id = item.id
+                logger.info(f"Auto-created WorkItem {item.id} for todos")
+
+            # Convert todos to PlanSteps
+            plan_steps = PlanStep.from_todo_dicts(todos, current_id)
+
+            # Replace all plan steps for this work item
+            storage.replace_plan_steps(current_id, plan_steps)
+
+            # Update WorkItem status based on plan step statuses
+            item = storage.get_work_item(current_id)
+            if item:
+                item.status = _status_from_plan(plan_steps) or item.status
+                storage.update_work_item(item)
 
         return f"Updated {len(plan_steps)} plan steps for WorkItem {current_id}"
 
-    def sync_write_todos(todos: list[dict[str, Any]], runtime: ToolRuntime) -> str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_write_todos(todos, runtime))
+    async def async_write_todos(
+        todos: list[dict[str, Any]],
+        runtime: ToolRuntime,
+    ) -> str:
+        return await _run_in_executor(executor, sync_write_todos, todos, runtime)
 
     return StructuredTool.from_function(
         name="write_todos",
@@ -141,23 +212,20 @@ def _create_write_todos_tool(storage: WorkStorageProtocol) -> BaseTool:
     )
 
 
-def _create_read_todos_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_read_todos_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the read_todos tool backed by persistent storage."""
 
-    async def async_read_todos(runtime: ToolRuntime) -> list[dict[str, Any]]:
+    def sync_read_todos(runtime: ToolRuntime) -> list[dict[str, Any]]:
         """Read todos from the current WorkItem's plan steps."""
         current_id = storage.get_current_work_item_id()
 
         if current_id is None:
             return []
 
-        steps = storage.get_plan_steps(current_id)
-        return [step.to_todo_dict() for step in steps]
+        return storage.get_plan_steps_dicts(current_id)
 
-    def sync_read_todos(runtime: ToolRuntime) -> list[dict[str, Any]]:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_read_todos(runtime))
+    async def async_read_todos(runtime: ToolRuntime) -> list[dict[str, Any]]:
+        return await _run_in_executor(executor, sync_read_todos, runtime)
 
     return StructuredTool.from_function(
         name="read_todos",
@@ -167,6 +235,71 @@ def _create_read_todos_tool(storage: WorkStorageProtocol) -> BaseTool:
     )
 
 
+WRITE_TODOS_BATCH_DESCRIPTION = """Update the plans of several work items at once.
+
+Use this instead of repeated write_todos calls when planning many items,
+for example after triaging the inbox. All plans are saved together.
+
+Parameters:
+- updates: List of plan updates, each with:
+  - work_item_id (str): WorkItem whose plan to replace
+  - todos (list): Todo items, in the same format as write_todos
+
+Returns how many plans were updated and any WorkItem IDs that were not found."""
+
+
+def _create_write_todos_batch_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
+    """Create the write_todos_batch tool backed by persistent storage."""
+
+    def sync_write_todos_batch(
+        updates: list[dict[str, Any]],
+        runtime: ToolRuntime,
+    ) -> str:
+        """Write todos to the plan steps of several WorkItems."""
+        items: dict[str, WorkItem] = {}
+        plans: dict[str, list[PlanStep]] = {}
+        missing: list[str] = []
+        from_todos = PlanStep.from_todo_dicts
+        for update in updates:
+            work_item_id = update.get("work_item_id", "")
+            item = items.get(work_item_id) or storage.get_work_item(work_item_id)
+            if item is None:
+                missing.append(work_item_id)
+                continue
+            items[work_item_id] = item
+            plans[work_item_id] = from_todos(update.get("todos", []), work_item_id)
+
+        if plans:
+            storage.bulk_replace_plan_steps(plans)
+
+        # Only write WorkItems whose status the new plan changes
+        for work_item_id, plan_steps in plans.items():
+            item = items[work_item_id]
+            status = _status_from_plan(plan_steps)
+            if status is not None and status != item.status:
+                item.status = status
+                item.plan_step_ids = [s.id for s in plan_steps]
+                storage.update_work_item(item)
+
+        result = f"Updated plans for {len(plans)} WorkItems"
+        if missing:
+            result += f"; not found: {', '.join(missing)}"
+        return result
+
+    async def async_write_todos_batch(
+        updates: list[dict[str, Any]],
+        runtime: ToolRuntime,
+    ) -> str:
+        return await _run_in_executor(executor, sync_write_todos_batch, updates, runtime)
+
+    return StructuredTool.from_function(
+        name="write_todos_batch",
+        description=WRITE_TODOS_BATCH_DESCRIPTION,
+        func=sync_write_todos_batch,
+        coroutine=async_write_todos_batch,
+    )
+
+
 # --- WorkItem Tools ---
 
 WORK_ITEM_CREATE_DESCRIPTION = """Create a new work item for tracking.
@@ -198,12 +331,13 @@ Parameters:
 Returns a list of WorkItem summaries."""
 
 
-def _create_work_item_create_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_work_item_create_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the work_item_create tool."""
 
-    async def async_create(
+    def sync_create(
         title: str,
         body: str = "",
+        *,
         domain: str = "general",
         labels: list[str] | None = None,
         priority: int = 2,
@@ -220,10 +354,16 @@ def _create_work_item_create_tool(storage: WorkStorageProtocol) -> BaseTool:
         item = storage.create_work_item(item)
         return {"id": item.id, "title": item.title, "status": item.status.value}
 
-    def sync_create(**kwargs) -> dict[str, Any]:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_create(**kwargs))
+    async def async_create(
+        title: str,
+        body: str = "",
+        *,
+        domain: str = "general",
+        labels: list[str] | None = None,
+        priority: int = 2,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any]:
+        return await _run_in_executor(executor, sync_create, title, body, domain=domain, labels=labels, priority=priority, runtime=runtime)
 
     return StructuredTool.from_function(
         name="work_item_create",
@@ -233,16 +373,16 @@ def _create_work_item_create_tool(storage: WorkStorageProtocol) -> BaseTool:
     )
 
 
-def _create_work_item_get_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_work_item_get_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the work_item_get tool."""
 
-    async def async_get(item_id: str, runtime: ToolRuntime = None) -> dict[str, Any] | str:
+    def sync_get(item_id: str, runtime: ToolRuntime = None) -> dict[str, Any] | str:
         item = storage.get_work_item(item_id)
         if item is None:
             return f"WorkItem {item_id} not found"
 
-        steps = storage.get_plan_steps(item_id)
-        links = storage.get_links(item_id)
+        steps = storage.get_plan_steps_dicts(item_id)
+        links = storage.get_links_dicts(item_id)
 
         return {
             "id": item.id,
@@ -255,14 +395,12 @@ def _create_work_item_get_tool(storage: WorkStorageProtocol) -> BaseTool:
             "owner_type": item.owner_type.value,
             "owner_id": item.owner_id,
             "created_at": item.created_at.isoformat(),
-            "plan_steps": [s.to_todo_dict() for s in steps],
-            "links": [{"type": l.link_type.value, "to": l.to_id, "confidence": l.confidence} for l in links],
+            "plan_steps": steps,
+            "links": [{"type": l["type"], "to": l["to"], "confidence": l["confidence"]} for l in links],
         }
 
-    def sync_get(item_id: str, runtime: ToolRuntime = None) -> dict[str, Any] | str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_get(item_id, runtime))
+    async def async_get(item_id: str, runtime: ToolRuntime = None) -> dict[str, Any] | str:
+        return await _run_in_executor(executor, sync_get, item_id, runtime)
 
     return StructuredTool.from_function(
         name="work_item_get",
@@ -272,46 +410,33 @@ def _create_work_item_get_tool(storage: WorkStorageProtocol) -> BaseTool:
     )
 
 
-def _create_inbox_list_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_inbox_list_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the inbox_list tool."""
 
-    async def async_list(
+    def sync_list(
         status: str | None = None,
         domain: str | None = None,
         labels: list[str] | None = None,
         limit: int = 20,
         runtime: ToolRuntime = None,
     ) -> list[dict[str, Any]]:
-        status_filter = None
-        if status:
-            try:
-                status_filter = WorkItemStatus(status)
-            except ValueError:
-                pass
-
-        items = storage.list_work_items(
+        status_filter = _WORK_ITEM_STATUS_MAP.get(status) if status else None
+
+        return storage.list_work_item_summaries(
             status=status_filter,
             domain=domain,
             labels=labels,
             limit=limit,
         )
 
-        return [
-            {
-                "id": item.id,
-                "title": item.title,
-                "status": item.status.value,
-                "priority": item.priority,
-                "domain": item.domain,
-                "created_at": item.created_at.isoformat(),
-            }
-            for item in items
-        ]
-
-    def sync_list(**kwargs) -> list[dict[str, Any]]:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_list(**kwargs))
+    async def async_list(
+        status: str | None = None,
+        domain: str | None = None,
+        labels: list[str] | None = None,
+        limit: int = 20,
+        runtime: ToolRuntime = None,
+    ) -> list[dict[str, Any]]:
+        return await _run_in_executor(executor, sync_list, status, domain, labels, limit, runtime)
 
     return StructuredTool.from_function(
         name="inbox_list",
@@ -338,19 +463,18 @@ Parameters:
 Returns the created Link."""
 
 
-def _create_link_create_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_link_create_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the link_create tool."""
 
-    async def async_create(
+    def sync_create(
         from_id: str,
         to_id: str,
         link_type: str,
         confidence: float = 1.0,
         runtime: ToolRuntime = None,
     ) -> dict[str, Any] | str:
-        try:
-            lt = LinkType(link_type)
-        except ValueError:
+        lt = _LINK_TYPE_MAP.get(link_type)
+        if lt is None:
             return f"Invalid link type: {link_type}. Use: duplicate_of, related_to, blocks, blocked_by"
 
         link = Link(
@@ -362,10 +486,14 @@ def _create_link_create_tool(storage: WorkStorageProtocol) -> BaseTool:
         link = storage.create_link(link)
         return {"id": link.id, "from": from_id, "to": to_id, "type": link_type}
 
-    def sync_create(**kwargs) -> dict[str, Any] | str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_create(**kwargs))
+    async def async_create(
+        from_id: str,
+        to_id: str,
+        link_type: str,
+        confidence: float = 1.0,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any] | str:
+        return await _run_in_executor(executor, sync_create, from_id, to_id, link_type, confidence, runtime)
 
     return StructuredTool.from_function(
         name="link_create",
@@ -383,26 +511,14 @@ Parameters:
 Returns links where this item is either source or target."""
 
 
-def _create_link_list_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_link_list_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the link_list tool."""
 
-    async def async_list(item_id: str, runtime: ToolRuntime = None) -> list[dict[str, Any]]:
-        links = storage.get_links(item_id)
-        return [
-            {
-                "id": l.id,
-                "from": l.from_id,
-                "to": l.to_id,
-                "type": l.link_type.value,
-                "confidence": l.confidence,
-            }
-            for l in links
-        ]
-
     def sync_list(item_id: str, runtime: ToolRuntime = None) -> list[dict[str, Any]]:
-        import asyncio
+        return storage.get_links_dicts(item_id)
 
-        return asyncio.get_event_loop().run_until_complete(async_list(item_id, runtime))
+    async def async_list(item_id: str, runtime: ToolRuntime = None) -> list[dict[str, Any]]:
+        return await _run_in_executor(executor, sync_list, item_id, runtime)
 
     return StructuredTool.from_function(
         name="link_list",
@@ -423,10 +539,10 @@ Parameters:
 Returns the session ID for logging activities."""
 
 
-def _create_session_start_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_session_start_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the agent_session_start tool."""
 
-    async def async_start(
+    def sync_start(
         agent_id: str,
         work_item_id: str,
         runtime: ToolRuntime = None,
@@ -440,23 +556,26 @@ def _create_session_start_tool(storage: WorkStorageProtocol) -> BaseTool:
             agent_id=agent_id,
             work_item_id=work_item_id,
         )
-        session = storage.create_session(session)
+        with storage.buffered():
+            session = storage.create_session(session)
 
-        # Set as current work item
-        storage.set_current_work_item_id(work_item_id)
+            # Set as current work item
+            storage.set_current_work_item_id(work_item_id)
 
-        # Update work item ownership
-        item.owner_type = OwnerType.AGENT
-        item.owner_id = agent_id
-        item.status = WorkItemStatus.IN_PROGRESS
-        storage.update_work_item(item)
+            # Update work item ownership
+            item.owner_type = OwnerType.AGENT
+            item.owner_id = agent_id
+            item.status = WorkItemStatus.IN_PROGRESS
+            storage.update_work_item(item)
 
         return {"session_id": session.id, "work_item_id": work_item_id}
 
-    def sync_start(**kwargs) -> dict[str, Any] | str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_start(**kwargs))
+    async def async_start(
+        agent_id: str,
+        work_item_id: str,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any] | str:
+        return await _run_in_executor(executor, sync_start, agent_id, work_item_id, runtime)
 
     return StructuredTool.from_function(
         name="agent_session_start",
@@ -475,10 +594,10 @@ Parameters:
 - artifacts (list[str], optional): References to related files/outputs"""
 
 
-def _create_activity_log_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_activity_log_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the agent_activity_log tool."""
 
-    async def async_log(
+    def sync_log(
         session_id: str,
         activity_type: str,
         summary: str,
@@ -489,9 +608,8 @@ def _create_activity_log_tool(storage: WorkStorageProtocol) -> BaseTool:
         if session is None:
             return f"Session {session_id} not found"
 
-        try:
-            at = ActivityType(activity_type)
-        except ValueError:
+        at = _ACTIVITY_TYPE_MAP.get(activity_type)
+        if at is None:
             return f"Invalid activity type: {activity_type}"
 
         activity = AgentActivity(
@@ -503,10 +621,14 @@ def _create_activity_log_tool(storage: WorkStorageProtocol) -> BaseTool:
         activity = storage.log_activity(activity)
         return {"activity_id": activity.id}
 
-    def sync_log(**kwargs) -> dict[str, Any] | str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_log(**kwargs))
+    async def async_log(
+        session_id: str,
+        activity_type: str,
+        summary: str,
+        artifacts: list[str] | None = None,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any] | str:
+        return await _run_in_executor(executor, sync_log, session_id, activity_type, summary, artifacts, runtime)
 
     return StructuredTool.from_function(
         name="agent_activity_log",
@@ -531,20 +653,20 @@ Parameters:
 - accepted (bool): Whether the suggestion was accepted as-is"""
 
 
-def _create_feedback_record_tool(storage: WorkStorageProtocol) -> BaseTool:
+def _create_feedback_record_tool(storage: WorkStorageProtocol, executor: Executor) -> BaseTool:
     """Create the feedback_record tool."""
 
-    async def async_record(
+    def sync_record(
         work_item_id: str,
         suggestion_type: str,
+        *,
         suggested_value: Any,
         final_value: Any,
         accepted: bool,
         runtime: ToolRuntime = None,
     ) -> dict[str, Any] | str:
-        try:
-            st = SuggestionType(suggestion_type)
-        except ValueError:
+        st = _SUGGESTION_TYPE_MAP.get(suggestion_type)
+        if st is None:
             return f"Invalid suggestion type: {suggestion_type}"
 
         feedback = FeedbackEvent(
@@ -557,10 +679,25 @@ def _create_feedback_record_tool(storage: WorkStorageProtocol) -> BaseTool:
         feedback = storage.record_feedback(feedback)
         return {"feedback_id": feedback.id, "accepted": accepted}
 
-    def sync_record(**kwargs) -> dict[str, Any] | str:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(async_record(**kwargs))
+    async def async_record(
+        work_item_id: str,
+        suggestion_type: str,
+        *,
+        suggested_value: Any,
+        final_value: Any,
+        accepted: bool,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any] | str:
+        return await _run_in_executor(
+            executor,
+            sync_record,
+            work_item_id,
+            suggestion_type,
+            suggested_value=suggested_value,
+            final_value=final_value,
+            accepted=accepted,
+            runtime=runtime,
+        )
 
     return StructuredTool.from_function(
         name="feedback_record",
@@ -590,54 +727,73 @@ Parameters:
 Returns suggestions with confidence scores and explanations."""
 
 
+def _bundle_to_dict(bundle: TriageSuggestionBundle) -> dict[str, Any]:
+    """Convert a suggestion bundle to the triage tools' output shape."""
+    return {
+        "work_item_id": bundle.work_item_id,
+        "duplicates": [
+            {
+                "item_id": s.suggested_value,
+                "confidence": s.confidence,
+                "reasons": s.reasons,
+            }
+            for s in bundle.duplicates
+        ],
+        "related": [
+            {
+                "item_id": s.suggested_value,
+                "confidence": s.confidence,
+                "reasons": s.reasons,
+            }
+            for s in bundle.related
+        ],
+        "priority": {
+            "suggested": bundle.priority.suggested_value,
+            "confidence": bundle.priority.confidence,
+            "reasons": bundle.priority.reasons,
+        }
+        if bundle.priority
+        else None,
+    }
+
+
 def _create_triage_suggest_tool(
     storage: WorkStorageProtocol,
     triage_engine: TriageEngine,
+    executor: Executor,
 ) -> BaseTool:
     """Create the triage_suggest tool."""
+    # Suggestions only change when storage does, so repeat calls within a turn hit memory
+    cache: _TTLCache[tuple[str, tuple[str, ...], int], TriageSuggestionBundle | str] = _TTLCache(
+        maxsize=_TRIAGE_CACHE_SIZE,
+        ttl_s=_TRIAGE_CACHE_TTL_S,
+    )
 
-    async def async_suggest(
+    def sync_suggest(
         item_id: str,
         modes: list[str] | None = None,
         runtime: ToolRuntime = None,
     ) -> dict[str, Any] | str:
-        result = triage_engine.generate_suggestions(item_id, modes)
+        version = storage.version()
+        key = (item_id, tuple(sorted(modes or ())), version)
+        result = cache.get(key) if version is not None else None
+        if result is None:
+            result = triage_engine.generate_suggestions(item_id, modes)
+            if version is not None:
+                cache.put(key, result)
 
         if isinstance(result, str):
             return result
 
         # Convert to dict for tool output
-        return {
-            "work_item_id": result.work_item_id,
-            "duplicates": [
-                {
-                    "item_id": s.suggested_value,
-                    "confidence": s.confidence,
-                    "reasons": s.reasons,
-                }
-                for s in result.duplicates
-            ],
-            "related": [
-                {
-                    "item_id": s.suggested_value,
-                    "confidence": s.confidence,
-                    "reasons": s.reasons,
-                }
-                for s in result.related
-            ],
-            "priority": {
-                "suggested": result.priority.suggested_value,
-                "confidence": result.priority.confidence,
-                "reasons": result.priority.reasons,
-            }
-            if result.priority
-            else None,
-        }
-
-    def sync_suggest(**kwargs) -> dict[str, Any] | str:
-        import asyncio
+        return _bundle_to_dict(result)
 
-        return asyncio.get_event_loop().run_until_complete(async_suggest(**kwargs))
+    async def async_suggest(
+        item_id: str,
+        modes: list[str] | None = None,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any] | str:
+        return await _run_in_executor(executor, sync_suggest, item_id, modes, runtime)
 
     return StructuredTool.from_function(
         name="triage_suggest",
@@ -647,6 +803,49 @@ def _create_triage_suggest_tool(
     )
 
 
+INBOX_TRIAGE_BATCH_DESCRIPTION = """Get triage suggestions for several work items in one call.
+
+Use this instead of calling triage_suggest once per item when working
+through an inbox.
+
+Parameters:
+- item_ids (list[str]): WorkItem IDs to analyze
+- modes (list[str], optional): Types of suggestions to generate, as for triage_suggest
+  Default: duplicates and related
+
+Returns suggestions keyed by work item ID; unknown IDs map to an error message."""
+
+
+def _create_inbox_triage_batch_tool(
+    storage: WorkStorageProtocol,
+    triage_engine: TriageEngine,
+    executor: Executor,
+) -> BaseTool:
+    """Create the inbox_triage_batch tool."""
+
+    def sync_triage_batch(
+        item_ids: list[str],
+        modes: list[str] | None = None,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any]:
+        results = triage_engine.generate_suggestions_batch(item_ids, modes)
+        return {item_id: result if isinstance(result, str) else _bundle_to_dict(result) for item_id, result in results.items()}
+
+    async def async_triage_batch(
+        item_ids: list[str],
+        modes: list[str] | None = None,
+        runtime: ToolRuntime = None,
+    ) -> dict[str, Any]:
+        return await _run_in_executor(executor, sync_triage_batch, item_ids, modes, runtime)
+
+    return StructuredTool.from_function(
+        name="inbox_triage_batch",
+        description=INBOX_TRIAGE_BATCH_DESCRIPTION,
+        func=sync_triage_batch,
+        coroutine=async_triage_batch,
+    )
+
+
 # --- System Prompt ---
 
 UNIVERSAL_WORK_SYSTEM_PROMPT = """## Universal Work System
@@ -699,7 +898,8 @@ class UniversalWorkMiddleware(AgentMiddleware):
         storage: Storage backend for persistence. Defaults to FileBackendStorage.
         storage_path: Path for file storage (used if storage not provided).
         system_prompt: Optional custom system prompt override.
-        enabled_tools: Optional list of tool names to enable. Defaults to all.
+        enabled_tools: Optional list of tool names to enable. Defaults to
+            `ALL_TOOLS`; the batch tools in `OPTIONAL_TOOLS` are opt-in.
 
     Example:
         ```python
@@ -719,7 +919,7 @@ class UniversalWorkMiddleware(AgentMiddleware):
         ```
     """
 
-    # All available tools
+    # Tools enabled by default
     ALL_TOOLS = [
         "write_todos",
         "read_todos",
@@ -734,6 +934,12 @@ class UniversalWorkMiddleware(AgentMiddleware):
         "feedback_record",
     ]
 
+    # Tools only enabled when listed in enabled_tools
+    OPTIONAL_TOOLS = [
+        "write_todos_batch",
+        "inbox_triage_batch",
+    ]
+
     def __init__(
         self,
         *,
@@ -750,6 +956,12 @@ class UniversalWorkMiddleware(AgentMiddleware):
         self.storage = storage or FileBackendStorage(storage_path)
         self._custom_system_prompt = system_prompt
 
+        # Last (base, addition, combined) system prompt, see `_combine_system_prompt`
+        self._combined_system_prompt: tuple[str, str, str] | None = None
+
+        # Storage calls are blocking file I/O that async tools run off the event loop
+        self._storage_executor = _STORAGE_EXECUTOR
+
         # Initialize triage engine
         self.triage_engine = TriageEngine(
             storage=self.storage,
@@ -758,22 +970,32 @@ class UniversalWorkMiddleware(AgentMiddleware):
 
         # Build tool generators
         self._tool_generators = {
-            "write_todos": lambda: _create_write_todos_tool(self.storage),
-            "read_todos": lambda: _create_read_todos_tool(self.storage),
-            "work_item_create": lambda: _create_work_item_create_tool(self.storage),
-            "work_item_get": lambda: _create_work_item_get_tool(self.storage),
-            "inbox_list": lambda: _create_inbox_list_tool(self.storage),
-            "link_create": lambda: _create_link_create_tool(self.storage),
-            "link_list": lambda: _create_link_list_tool(self.storage),
-            "agent_session_start": lambda: _create_session_start_tool(self.storage),
-            "agent_activity_log": lambda: _create_activity_log_tool(self.storage),
-            "triage_suggest": lambda: _create_triage_suggest_tool(self.storage, self.triage_engine),
-            "feedback_record": lambda: _create_feedback_record_tool(self.storage),
+            "write_todos": lambda: _create_write_todos_tool(self.storage, self._storage_executor),
+            "read_todos": lambda: _create_read_todos_tool(self.storage, self._storage_executor),
+            "write_todos_batch": lambda: _create_write_todos_batch_tool(self.storage, self._storage_executor),
+            "work_item_create": lambda: _create_work_item_create_tool(self.storage, self._storage_executor),
+            "work_item_get": lambda: _create_work_item_get_tool(self.storage, self._storage_executor),
+            "inbox_list": lambda: _create_inbox_list_tool(self.storage, self._storage_executor),
+            "link_create": lambda: _create_link_create_tool(self.storage, self._storage_executor),
+            "link_list": lambda: _create_link_list_tool(self.storage, self._storage_executor),
+            "agent_session_start": lambda: _create_session_start_tool(self.storage, self._storage_executor),
+            "agent_activity_log": lambda: _create_activity_log_tool(self.storage, self._storage_executor),
+            "triage_suggest": lambda: _create_triage_suggest_tool(self.storage, self.triage_engine, self._storage_executor),
+            "inbox_triage_batch": lambda: _create_inbox_triage_batch_tool(self.storage, self.triage_engine, self._storage_executor),
+            "feedback_record": lambda: _create_feedback_record_tool(self.storage, self._storage_executor),
         }
 
-        # Generate enabled tools
+        # Tools are built on first access, so instances that never reach an agent skip it
         tools_to_enable = enabled_tools or self.ALL_TOOLS
-        self.tools = [self._tool_generators[name]() for name in tools_to_enable if name in self._tool_generators]
+        self._enabled_tools = [name for name in tools_to_enable if name in self._tool_generators]
+        self._tools: list[BaseTool] | None = None
+
+    @property
+    def tools(self) -> list[BaseTool]:
+        """Get the enabled tools, building them on first access."""
+        if self._tools is None:
+            self._tools = [self._tool_generators[name]() for name in self._enabled_tools]
+        return self._tools
 
     def wrap_model_call(
         self,
@@ -784,8 +1006,7 @@ class UniversalWorkMiddleware(AgentMiddleware):
         system_prompt = self._custom_system_prompt or UNIVERSAL_WORK_SYSTEM_PROMPT
 
         if system_prompt:
-            new_prompt = request.system_prompt + "\n\n" + system_prompt if request.system_prompt else system_prompt
-            request = request.override(system_prompt=new_prompt)
+            request = request.override(system_prompt=self._combine_system_prompt(request.system_prompt, system_prompt))
 
         return handler(request)
 
@@ -798,7 +1019,29 @@ class UniversalWorkMiddleware(AgentMiddleware):
         system_prompt = self._custom_system_prompt or UNIVERSAL_WORK_SYSTEM_PROMPT
 
         if system_prompt:
-            new_prompt = request.system_prompt + "\n\n" + system_prompt if request.system_prompt else system_prompt
-            request = request.override(system_prompt=new_prompt)
+            request = request.override(system_prompt=self._combine_system_prompt(request.system_prompt, system_prompt))
 
         return await handler(request)
+
+    def _combine_system_prompt(self, base: str | None, addition: str) -> str:
+        """Append `addition` to the agent's system prompt.
+
+        The incoming system prompt is usually the same string object on every turn, so
+        the last concatenation is remembered and reused instead of rebuilding a
+        potentially large string per model call.
+
+        Args:
+            base: The system prompt on the incoming request, if any.
+            addition: The Universal Work system prompt to append.
+
+        Returns:
+            The combined system prompt.
+        """
+        if not base:
+            return addition
+        cached = self._combined_system_prompt
+        if cached is not None and cached[0] is base and cached[1] is addition:
+            return cached[2]
+        combined = base + "\n\n" + addition
+        self._combined_system_prompt = (base, addition, combined)
+        return combined
@@ -115,6 +115,27 @@ class PlanStep(BaseModel):
             position=position,
         )
 
+    @classmethod
+    def from_todo_dicts(cls, todos: list[dict[str, Any]], work_item_id: str) -> list[PlanStep]:
+        """Create a whole plan from DeepAgents todos, positioned in list order.
+
+        All steps share a single creation timestamp.
+        """
+        now = utc_now()
+        pending = PlanStepStatus.PENDING.value
+        return [
+            cls(
+                work_item_id=work_item_id,
+                content=todo.get("content", ""),
+                status=PlanStepStatus(todo.get("status", pending)),
+                active_form=todo.get("activeForm"),
+                position=i,
+                created_at=now,
+                updated_at=now,
+            )
+            for i, todo in enumerate(todos)
+        ]
+
 
 class WorkItem(BaseModel):
     """A persistent unit of work across any domain."""
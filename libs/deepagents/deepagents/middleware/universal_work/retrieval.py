@@ -27,6 +27,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Keyword hints for priority suggestions, checked from most to least urgent
+_PRIORITY_KEYWORDS: dict[int, tuple[str, ...]] = {
+    0: ("urgent", "critical", "blocker", "emergency", "asap"),
+    1: ("important", "high", "priority", "soon"),
+    2: (),  # default
+    3: ("low", "minor", "nice-to-have"),
+    4: ("backlog", "someday", "future"),
+}
+
 
 @dataclass
 class RetrievalCandidate:
@@ -323,47 +332,69 @@ class TriageEngine:
         Returns:
             TriageSuggestionBundle with suggestions, or error string
         """
-        item = self.storage.get_work_item(item_id)
-        if item is None:
-            return f"WorkItem {item_id} not found"
+        return self.generate_suggestions_batch([item_id], modes)[item_id]
+
+    def generate_suggestions_batch(
+        self,
+        item_ids: list[str],
+        modes: list[str] | None = None,
+    ) -> dict[str, TriageSuggestionBundle | str]:
+        """Generate triage suggestions for several WorkItems.
 
+        The keyword index is rebuilt once for the whole batch rather than
+        once per item.
+
+        Args:
+            item_ids: WorkItem IDs to generate suggestions for
+            modes: Suggestion types to generate, as for `generate_suggestions`
+
+        Returns:
+            Mapping of each item ID to its suggestion bundle, or error string
+        """
         modes = modes or ["duplicates", "related"]
-        bundle = TriageSuggestionBundle(work_item_id=item_id)
+        # Priority only looks at the item itself, so skip retrieval when it is the sole mode
+        needs_candidates = "duplicates" in modes or "related" in modes
+
+        items = {item_id: self.storage.get_work_item(item_id) for item_id in item_ids}
 
         # Ensure index is current
-        if isinstance(self.retrieval, SimpleKeywordRetrieval):
+        if needs_candidates and isinstance(self.retrieval, SimpleKeywordRetrieval) and any(items.values()):
             self.retrieval.rebuild_index()
 
-        # Generate candidates
+        return {
+            item_id: self._suggest(item, modes, needs_candidates) if item is not None else f"WorkItem {item_id} not found"
+            for item_id, item in items.items()
+        }
+
+    def _suggest(self, item: WorkItem, modes: list[str], needs_candidates: bool) -> TriageSuggestionBundle:
+        """Build the suggestion bundle for one item, assuming the index is current."""
+        item_id = item.id
+        bundle = TriageSuggestionBundle(work_item_id=item_id)
+
         query = f"{item.title} {item.body}"
-        candidates = self.retrieval.search(
-            query,
-            filters={"exclude_id": item_id},
-            limit=20,
-        )
 
-        if "duplicates" in modes:
-            bundle.duplicates = self.duplicate_reranker.rerank(item, candidates, limit=3)
+        if needs_candidates:
+            # Generate candidates
+            candidates = self.retrieval.search(
+                query,
+                filters={"exclude_id": item_id},
+                limit=20,
+            )
+
+            if "duplicates" in modes:
+                bundle.duplicates = self.duplicate_reranker.rerank(item, candidates, limit=3)
 
-        if "related" in modes:
-            bundle.related = self.related_reranker.rerank(item, candidates, limit=5)
+            if "related" in modes:
+                bundle.related = self.related_reranker.rerank(item, candidates, limit=5)
 
         if "priority" in modes:
             # Simple priority suggestion based on keywords
-            priority_keywords = {
-                0: ["urgent", "critical", "blocker", "emergency", "asap"],
-                1: ["important", "high", "priority", "soon"],
-                2: [],  # default
-                3: ["low", "minor", "nice-to-have"],
-                4: ["backlog", "someday", "future"],
-            }
-
-            text = f"{item.title} {item.body}".lower()
+            text = query.lower()
             suggested_priority = 2  # default
             confidence = 0.5
             reasons = ["Default priority"]
 
-            for priority, keywords in priority_keywords.items():
+            for priority, keywords in _PRIORITY_KEYWORDS.items():
                 if any(kw in text for kw in keywords):
                     suggested_priority = priority
                     confidence = 0.8
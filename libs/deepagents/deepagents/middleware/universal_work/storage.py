@@ -11,7 +11,11 @@ import abc
 import asyncio
 import json
 import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
+from enum import Enum
 from pathlib import Path
 from typing import Any
 
@@ -67,6 +71,34 @@ class WorkStorageProtocol(abc.ABC):
         """List WorkItems with optional filters."""
         ...
 
+    def list_work_item_summaries(
+        self,
+        *,
+        status: WorkItemStatus | list[WorkItemStatus] | None = None,
+        owner_id: str | None = None,
+        domain: str | None = None,
+        labels: list[str] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """List WorkItems as `id`/`title`/`status`/`priority`/`domain`/`created_at` dicts.
+
+        Takes the same filters as `list_work_items`. The default converts its
+        results; backends can override it to filter and project stored data
+        without building WorkItem models.
+        """
+        return [
+            {
+                "id": item.id,
+                "title": item.title,
+                "status": item.status.value,
+                "priority": item.priority,
+                "domain": item.domain,
+                "created_at": item.created_at.isoformat(),
+            }
+            for item in self.list_work_items(status=status, owner_id=owner_id, domain=domain, labels=labels, limit=limit, offset=offset)
+        ]
+
     # --- PlanStep Operations ---
 
     @abc.abstractmethod
@@ -89,6 +121,22 @@ class WorkStorageProtocol(abc.ABC):
         """Replace all PlanSteps for a WorkItem (for write_todos compatibility)."""
         ...
 
+    def get_plan_steps_dicts(self, work_item_id: str) -> list[dict[str, Any]]:
+        """Get a WorkItem's PlanSteps in todo format, ordered by position.
+
+        The default converts `get_plan_steps`; backends can override it to
+        serve the dicts without building PlanStep models.
+        """
+        return [step.to_todo_dict() for step in self.get_plan_steps(work_item_id)]
+
+    def bulk_replace_plan_steps(self, plans: dict[str, list[PlanStep]]) -> dict[str, list[PlanStep]]:
+        """Replace the PlanSteps of several WorkItems at once.
+
+        The default applies `replace_plan_steps` per WorkItem; backends can
+        override it to commit all plans in one write.
+        """
+        return {work_item_id: self.replace_plan_steps(work_item_id, steps) for work_item_id, steps in plans.items()}
+
     # --- Link Operations ---
 
     @abc.abstractmethod
@@ -101,6 +149,23 @@ class WorkStorageProtocol(abc.ABC):
         """Get all Links for a WorkItem (both from and to)."""
         ...
 
+    def get_links_dicts(self, work_item_id: str) -> list[dict[str, Any]]:
+        """Get a WorkItem's Links as `id`/`from`/`to`/`type`/`confidence` dicts.
+
+        The default converts `get_links`; backends can override it to serve
+        the dicts without building Link models.
+        """
+        return [
+            {
+                "id": link.id,
+                "from": link.from_id,
+                "to": link.to_id,
+                "type": link.link_type.value,
+                "confidence": link.confidence,
+            }
+            for link in self.get_links(work_item_id)
+        ]
+
     # --- AgentSession Operations ---
 
     @abc.abstractmethod
@@ -149,6 +214,25 @@ class WorkStorageProtocol(abc.ABC):
         """Set the currently active WorkItem ID for this context."""
         ...
 
+    # --- Change Tracking ---
+
+    def version(self) -> int | None:
+        """Get a counter that changes whenever stored data changes.
+
+        Lets callers cache results derived from storage, such as triage
+        suggestions. Backends that don't track changes return None, which
+        disables that caching.
+        """
+        return None
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """Group a sequence of mutations so the backend can persist them together.
+
+        The default does nothing; writes go through immediately.
+        """
+        yield
+
     # --- Async variants (default implementations use asyncio.to_thread) ---
 
     async def acreate_work_item(self, item: WorkItem) -> WorkItem:
@@ -179,6 +263,19 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _raw_value(value: Any) -> Any:
+    """Get the JSON form of a stored value that may be an enum or datetime.
+
+    Data pending in a buffered() block holds enum members and datetimes
+    rather than the strings read back from disk.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
 def datetime_decoder(dct: dict) -> dict:
     """Decode datetime strings in JSON dicts."""
     for key, value in dct.items():
@@ -193,6 +290,12 @@ def datetime_decoder(dct: dict) -> dict:
     return dct
 
 
+class _BufferState(threading.local):
+    """Pending file contents of the current thread's buffered() block, if any."""
+
+    files: dict[str, Any] | None = None
+
+
 class FileBackendStorage(WorkStorageProtocol):
     """File-backed JSON storage for Universal Work System.
 
@@ -219,6 +322,13 @@ class FileBackendStorage(WorkStorageProtocol):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
 
+        # Bumped on every write made through this instance
+        self._version = 0
+
+        # Pending file contents while inside buffered(), flushed on exit. Per
+        # thread, so one thread's block doesn't capture another's writes
+        self._buffer = _BufferState()
+
         # Initialize empty files if they don't exist
         self._ensure_file("work_items.json", {})
         self._ensure_file("plan_steps.json", {})
@@ -237,16 +347,48 @@ class FileBackendStorage(WorkStorageProtocol):
 
     def _read_json(self, filename: str) -> Any:
         """Read and parse a JSON file."""
+        pending = self._buffer.files
+        if pending is not None and filename in pending:
+            return pending[filename]
         filepath = self.base_path / filename
         with open(filepath) as f:
             return json.load(f, object_hook=datetime_decoder)
 
     def _write_json(self, filename: str, data: Any) -> None:
         """Write data to a JSON file."""
+        self._version += 1
+        pending = self._buffer.files
+        if pending is not None:
+            pending[filename] = data
+            return
         filepath = self.base_path / filename
         with open(filepath, "w") as f:
             json.dump(data, f, cls=DateTimeEncoder, indent=2)
 
+    def version(self) -> int:
+        """Get the number of writes made through this instance."""
+        return self._version
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """Keep writes in memory and write each touched file once on exit.
+
+        Reads inside the block see the pending data. Nested blocks are
+        flushed by the outermost one. The buffer belongs to the calling
+        thread; other threads keep reading and writing the files directly.
+        """
+        if self._buffer.files is not None:
+            yield
+            return
+
+        self._buffer.files = {}
+        try:
+            yield
+        finally:
+            pending, self._buffer.files = self._buffer.files, None
+            for filename, data in pending.items():
+                self._write_json(filename, data)
+
     # --- WorkItem Operations ---
 
     def create_work_item(self, item: WorkItem) -> WorkItem:
@@ -301,6 +443,50 @@ class FileBackendStorage(WorkStorageProtocol):
         result.sort(key=lambda x: x.created_at, reverse=True)
         return result[offset : offset + limit]
 
+    def list_work_item_summaries(
+        self,
+        *,
+        status: WorkItemStatus | list[WorkItemStatus] | None = None,
+        owner_id: str | None = None,
+        domain: str | None = None,
+        labels: list[str] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """List WorkItem summaries, filtering the stored JSON without building models."""
+        statuses = None
+        if status is not None:
+            statuses = {s.value for s in ([status] if isinstance(status, WorkItemStatus) else status)}
+
+        result = []
+        for item_data in self._read_json("work_items.json").values():
+            # Apply filters
+            item_status = _raw_value(item_data.get("status", WorkItemStatus.INBOX))
+            item_domain = item_data.get("domain", "general")
+            if statuses is not None and item_status not in statuses:
+                continue
+            if owner_id is not None and item_data.get("owner_id") != owner_id:
+                continue
+            if domain is not None and item_domain != domain:
+                continue
+            if labels is not None and not any(l in item_data.get("labels", ()) for l in labels):
+                continue
+
+            result.append(
+                {
+                    "id": item_data["id"],
+                    "title": item_data["title"],
+                    "status": item_status,
+                    "priority": item_data.get("priority", 2),
+                    "domain": item_domain,
+                    "created_at": _raw_value(item_data["created_at"]),
+                }
+            )
+
+        # Sort by created_at descending, then apply pagination
+        result.sort(key=lambda x: x["created_at"], reverse=True)
+        return result[offset : offset + limit]
+
     # --- PlanStep Operations ---
 
     def create_plan_step(self, step: PlanStep) -> PlanStep:
@@ -315,6 +501,20 @@ class FileBackendStorage(WorkStorageProtocol):
         result.sort(key=lambda x: x.position)
         return result
 
+    def get_plan_steps_dicts(self, work_item_id: str) -> list[dict[str, Any]]:
+        """Get a WorkItem's PlanSteps in todo format straight from the stored JSON."""
+        steps = sorted(
+            (s for s in self._read_json("plan_steps.json").values() if s.get("work_item_id") == work_item_id),
+            key=lambda s: s.get("position", 0),
+        )
+        result = []
+        for s in steps:
+            todo = {"content": s["content"], "status": s.get("status", "pending")}
+            if s.get("active_form"):
+                todo["activeForm"] = s["active_form"]
+            result.append(todo)
+        return result
+
     def update_plan_step(self, step: PlanStep) -> PlanStep:
         steps = self._read_json("plan_steps.json")
         step.updated_at = datetime.now(UTC)
@@ -345,6 +545,34 @@ class FileBackendStorage(WorkStorageProtocol):
 
         return new_steps
 
+    def bulk_replace_plan_steps(self, plans: dict[str, list[PlanStep]]) -> dict[str, list[PlanStep]]:
+        """Replace the PlanSteps of several WorkItems with one write per file."""
+        steps = self._read_json("plan_steps.json")
+
+        # Remove existing steps for these work items
+        steps = {k: v for k, v in steps.items() if v.get("work_item_id") not in plans}
+
+        # Add new steps
+        for work_item_id, new_steps in plans.items():
+            for i, step in enumerate(new_steps):
+                step.work_item_id = work_item_id
+                step.position = i
+                steps[step.id] = step.model_dump()
+
+        self._write_json("plan_steps.json", steps)
+
+        # Update each WorkItem's plan_step_ids
+        items = self._read_json("work_items.json")
+        now = datetime.now(UTC)
+        for work_item_id, new_steps in plans.items():
+            item_data = items.get(work_item_id)
+            if item_data is not None:
+                item_data["plan_step_ids"] = [s.id for s in new_steps]
+                item_data["updated_at"] = now
+        self._write_json("work_items.json", items)
+
+        return plans
+
     # --- Link Operations ---
 
     def create_link(self, link: Link) -> Link:
@@ -357,6 +585,20 @@ class FileBackendStorage(WorkStorageProtocol):
         links = self._read_json("links.json")
         return [Link(**l) for l in links.values() if l.get("from_id") == work_item_id or l.get("to_id") == work_item_id]
 
+    def get_links_dicts(self, work_item_id: str) -> list[dict[str, Any]]:
+        """Get a WorkItem's Links as dicts straight from the stored JSON."""
+        return [
+            {
+                "id": l["id"],
+                "from": l["from_id"],
+                "to": l["to_id"],
+                "type": l["link_type"],
+                "confidence": l.get("confidence", 1.0),
+            }
+            for l in self._read_json("links.json").values()
+            if l.get("from_id") == work_item_id or l.get("to_id") == work_item_id
+        ]
+
     # --- AgentSession Operations ---
 
     def create_session(self, session: AgentSession) -> AgentSession:
@@ -382,7 +382,7 @@ class TestFilesystem:
         assert write_file_message is not None
         file_item = store.get(("filesystem",), "/charmander.txt")
         assert file_item is not None
-        assert any("fiery" in c for c in file_item.value["content"]) or any("Fiery" in c for c in file_item.value["content"])
+        assert "fiery" in file_item.value["content"] or "Fiery" in file_item.value["content"]
 
     def test_write_file_fail_already_exists_in_store(self):
         checkpointer = MemorySaver()
@@ -488,7 +488,7 @@ class TestFilesystem:
         messages = response["messages"]
         edit_file_message = next(message for message in messages if message.type == "tool" and message.name == "edit_file")
         assert edit_file_message is not None
-        assert store.get(("filesystem",), "/charmander.txt").value["content"] == ["The embers burns brightly. The embers burns hot."]
+        assert store.get(("filesystem",), "/charmander.txt").value["content"] == "The embers burns brightly. The embers burns hot."
 
     def test_longterm_memory_multiple_tools(self):
         checkpointer = MemorySaver()
@@ -922,7 +922,7 @@ class TestFilesystem:
         )
 
         assert "/test.txt" in response["files"]
-        assert any("Hello World" in line for line in response["files"]["/test.txt"]["content"])
+        assert "Hello World" in response["files"]["/test.txt"]["content"]
 
         response = agent.invoke(
             {"messages": [HumanMessage(content="Read /test.txt")]},
@@ -1117,7 +1117,7 @@ def assert_longterm_mem_tools(agent, store):
     file_item = store.get(("filesystem",), "/charmander.txt")
     assert file_item is not None
     assert file_item.key == "/charmander.txt"
-    assert any("ember" in c for c in file_item.value["content"]) or any("Ember" in c for c in file_item.value["content"])
+    assert "ember" in file_item.value["content"] or "Ember" in file_item.value["content"]
 
     # Read the longterm memory file
     config5 = {"configurable": {"thread_id": uuid.uuid4()}}
@@ -1165,7 +1165,7 @@ def assert_shortterm_mem_tools(agent):
     )
     files = response["files"]
     assert "/charmander.txt" in files
-    assert any("ember" in c for c in files["/charmander.txt"]["content"]) or any("Ember" in c for c in files["/charmander.txt"]["content"])
+    assert "ember" in files["/charmander.txt"]["content"] or "Ember" in files["/charmander.txt"]["content"]
 
     # Read the shortterm memory file
     response = agent.invoke(
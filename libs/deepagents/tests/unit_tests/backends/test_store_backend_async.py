@@ -293,4 +293,4 @@ async def test_store_backend_intercept_large_tool_result_async():
 
     stored_content = rt.store.get(("filesystem",), "/large_tool_results/test_456")
     assert stored_content is not None
-    assert stored_content.value["content"] == [large_content]
+    assert stored_content.value["content"] == large_content
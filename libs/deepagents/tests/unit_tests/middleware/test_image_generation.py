@@ -0,0 +1,199 @@
+"""Tests for image generation response parsing."""
+
+import asyncio
+import base64
+
+from deepagents.backends import StateBackend
+from deepagents.middleware.image_generation import (
+    DEFAULT_IMAGE_REQUEST_CONCURRENCY,
+    ImageGenerationMiddleware,
+    _Base64Cache,
+    _extract_image_from_response,
+    _fast_extract_image,
+    _image_request_concurrency,
+    _ImageHTTPClient,
+    _run_sync,
+)
+
+
+def _response(message):
+    return {"choices": [{"message": message}]}
+
+
+class TestImageResponseExtraction:
+    """Test the fast and generic image extractors."""
+
+    def test_fast_path_data_url(self):
+        """Test the common OpenRouter layout with an inline data URL."""
+        data = _response({"images": [{"imageUrl": {"url": "data:image/png;base64,QUJD"}}]})
+        expected = {"success": True, "image_data": "QUJD", "error": None}
+        assert _fast_extract_image(data) == expected
+        assert _extract_image_from_response(data) == expected
+
+    def test_fast_path_remote_url(self):
+        """Test the common OpenRouter layout with a remote URL."""
+        data = _response({"images": [{"imageUrl": {"url": "https://example.com/a.png"}}]})
+        assert _fast_extract_image(data) == {"success": True, "image_data": "https://example.com/a.png", "error": None}
+
+    def test_fast_path_falls_back_for_other_layouts(self):
+        """Test that other layouts are left to the generic extractor."""
+        data = _response({"content": [{"type": "image_url", "image_url": {"url": "data:image/png;base64,WFla"}}]})
+        assert _fast_extract_image(data) is None
+        assert _extract_image_from_response(data) == {"success": True, "image_data": "WFla", "error": None}
+        assert _fast_extract_image({}) is None
+        assert _fast_extract_image(_response({"images": ["https://example.com/b.png"]})) is None
+
+    def test_generic_inline_data(self):
+        """Test the Gemini native inline_data layout."""
+        data = _response({"content": [{"type": "text", "text": "here"}, {"inline_data": {"data": "SU1H"}}]})
+        assert _extract_image_from_response(data) == {"success": True, "image_data": "SU1H", "error": None}
+
+    def test_generic_declined(self):
+        """Test that a text refusal is reported as a decline."""
+        result = _extract_image_from_response(_response({"content": "Sorry, I can't create that."}))
+        assert result["success"] is False
+        assert result["error"].startswith("Model declined:")
+
+    def test_generic_no_choices(self):
+        """Test a response without choices."""
+        assert _extract_image_from_response({}) == {"success": False, "image_data": None, "error": "No response from model"}
+
+
+class TestImageHTTPClient:
+    """Test the middleware-owned pooled HTTP client."""
+
+    async def test_reuses_client_on_same_loop(self):
+        """Test that calls on one loop share a client until it is closed."""
+        http = _ImageHTTPClient()
+        async with http.client() as first, http.client() as second:
+            assert first is second
+        await http.aclose()
+        assert first.is_closed
+        async with http.client() as reopened:
+            assert reopened is not first
+        await http.aclose()
+
+    async def test_other_loop_gets_one_off_client(self):
+        """Test that a call from another loop does not reuse the pooled client."""
+        http = _ImageHTTPClient()
+        async with http.client() as pooled:
+            pass
+
+        async def use_client():
+            async with http.client() as client:
+                assert not client.is_closed
+                return client
+
+        one_off = await asyncio.to_thread(asyncio.run, use_client())
+        assert one_off is not pooled
+        assert one_off.is_closed
+        assert not pooled.is_closed
+        await http.aclose()
+
+    async def test_middleware_aclose(self):
+        """Test that the middleware closes the client its tools share."""
+        middleware = ImageGenerationMiddleware(backend=StateBackend)
+        async with middleware._http.client() as client:
+            pass
+        await middleware.aclose()
+        assert client.is_closed
+
+    async def test_limited_calls_share_semaphore(self, monkeypatch):
+        """Test that limited calls wait for a request slot on the pooled client."""
+        monkeypatch.setenv("DEEPAGENTS_IMAGE_CONCURRENCY", "1")
+        http = _ImageHTTPClient()
+        entered = asyncio.Event()
+
+        async def second_call():
+            async with http.client(limited=True):
+                entered.set()
+
+        async with http.client(limited=True):
+            task = asyncio.create_task(second_call())
+            await asyncio.sleep(0)
+            assert not entered.is_set()
+        await task
+        assert entered.is_set()
+        await http.aclose()
+
+    async def test_run_sync_uses_one_off_client(self):
+        """Test that a sync wrapper call inside a running loop leaves the pooled client alone."""
+        http = _ImageHTTPClient()
+        async with http.client() as pooled:
+            pass
+
+        async def use_client():
+            async with http.client() as client:
+                return client
+
+        one_off = _run_sync(use_client())
+        assert one_off is not pooled
+        assert one_off.is_closed
+        async with http.client() as again:
+            assert again is pooled
+        await http.aclose()
+
+    def test_run_sync_without_running_loop(self):
+        """Test that a sync call does not bind the pooled client to its short-lived loop."""
+        http = _ImageHTTPClient()
+
+        async def use_client():
+            async with http.client() as client:
+                return client
+
+        one_off = _run_sync(use_client())
+        assert one_off.is_closed
+        assert http._client is None
+
+
+class TestImageRequestConcurrency:
+    """Test parsing of DEEPAGENTS_IMAGE_CONCURRENCY."""
+
+    def test_default(self, monkeypatch):
+        """Test the default when the variable is unset."""
+        monkeypatch.delenv("DEEPAGENTS_IMAGE_CONCURRENCY", raising=False)
+        assert _image_request_concurrency() == DEFAULT_IMAGE_REQUEST_CONCURRENCY
+
+    def test_valid_value(self, monkeypatch):
+        """Test that a positive integer is used as is."""
+        monkeypatch.setenv("DEEPAGENTS_IMAGE_CONCURRENCY", "3")
+        assert _image_request_concurrency() == 3
+
+    def test_invalid_values_fall_back(self, monkeypatch, caplog):
+        """Test that invalid values log a warning and use the default."""
+        for raw in ("many", "0", "-2"):
+            monkeypatch.setenv("DEEPAGENTS_IMAGE_CONCURRENCY", raw)
+            assert _image_request_concurrency() == DEFAULT_IMAGE_REQUEST_CONCURRENCY
+        assert "DEEPAGENTS_IMAGE_CONCURRENCY" in caplog.text
+
+
+class TestBase64Cache:
+    """Test the per-middleware cache of source image encodings."""
+
+    def test_reuses_encoding(self):
+        """Test that the same bytes return the cached encoding."""
+        cache = _Base64Cache(1024)
+        first = cache.encode(b"image")
+        assert first == base64.b64encode(b"image")
+        assert cache.encode(b"image") is first
+
+    def test_evicts_past_byte_budget(self):
+        """Test that the least recently used encodings are dropped past the budget."""
+        cache = _Base64Cache(16)
+        first = cache.encode(b"a" * 9)
+        cache.encode(b"b" * 9)
+        assert cache.encode(b"a" * 9) is not first
+        assert cache._size <= 16
+
+    def test_disabled(self):
+        """Test that a zero budget encodes without caching."""
+        cache = _Base64Cache(0)
+        assert cache.encode(b"image") == base64.b64encode(b"image")
+        assert not cache._entries
+
+    async def test_middleware_aclose_clears_cache(self):
+        """Test that closing the middleware drops its cached encodings."""
+        middleware = ImageGenerationMiddleware(backend=StateBackend, image_cache_bytes=1024)
+        middleware._base64_cache.encode(b"image")
+        await middleware.aclose()
+        assert not middleware._base64_cache._entries
@@ -0,0 +1,23 @@
+"""Tests for PromptCachingMiddleware."""
+
+from langchain.agents.middleware.types import AgentMiddleware
+
+from deepagents.middleware import PromptCachingMiddleware, create_prompt_caching_middleware, prompt_caching
+
+
+class TestPromptCachingMiddleware:
+    """Test the class and factory entry points."""
+
+    def test_class_and_factory_agree(self):
+        """Test that the class and the factory build the same middleware."""
+        from_class = PromptCachingMiddleware(unsupported_model_behavior="warn")
+        from_factory = create_prompt_caching_middleware(unsupported_model_behavior="warn")
+        assert isinstance(from_class, AgentMiddleware)
+        assert type(from_class) is type(from_factory)
+
+    def test_no_op_without_provider(self, monkeypatch):
+        """Test the no-op fallback when no provider implementation is installed."""
+        monkeypatch.setattr(prompt_caching, "_anthropic_caching_middleware", lambda: None)
+        middleware = PromptCachingMiddleware()
+        assert isinstance(middleware, AgentMiddleware)
+        assert type(middleware) is type(create_prompt_caching_middleware())
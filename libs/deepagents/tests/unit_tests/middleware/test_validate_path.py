@@ -28,6 +28,13 @@ class TestValidatePath:
         assert _validate_path("/./foo//bar") == "/foo/bar"
         assert _validate_path("foo/./bar") == "/foo/bar"
 
+    def test_non_canonical_absolute_paths_still_normalized(self):
+        """Test that absolute paths needing normalization skip the fast path."""
+        assert _validate_path("/foo/bar/") == "/foo/bar"
+        assert _validate_path("/foo/.") == "/foo"
+        assert _validate_path("/foo\\bar") == "/foo/bar"
+        assert _validate_path("/") == "/"
+
     def test_path_traversal_rejected(self):
         """Test that path traversal attempts are rejected."""
         with pytest.raises(ValueError, match="Path traversal not allowed"):
@@ -113,6 +113,30 @@ class TestMCPServerConfig:
         )
         assert config_disabled.get_effective_prefix("math") == ""
 
+    def test_lazy_defaults_to_eager(self):
+        """Servers connect eagerly unless lazy loading is requested."""
+        assert MCPServerConfig(transport="stdio", command="python").lazy is False
+        assert MCPServerConfig(transport="stdio", command="python", lazy=True).lazy is True
+
+    def test_session_pool_settings(self):
+        """Session pool knobs have sensible defaults and reject invalid values."""
+        config = MCPServerConfig(transport="stdio", command="python")
+        assert config.session_pool_size == 4
+        assert config.session_idle_timeout_s == 60.0
+        assert config.session_max_reuse is None
+
+        with pytest.raises(ValidationError):
+            MCPServerConfig(transport="stdio", command="python", session_pool_size=0)
+        with pytest.raises(ValidationError):
+            MCPServerConfig(transport="stdio", command="python", session_max_reuse=0)
+
+    def test_max_resource_bytes(self):
+        """Resources are capped at 10 MiB by default; None disables the cap."""
+        assert MCPServerConfig(transport="stdio", command="python").max_resource_bytes == 10 * 1024 * 1024
+        assert MCPServerConfig(transport="stdio", command="python", max_resource_bytes=None).max_resource_bytes is None
+        with pytest.raises(ValidationError):
+            MCPServerConfig(transport="stdio", command="python", max_resource_bytes=0)
+
 
 class TestMCPConfig:
     """Tests for MCPConfig validation."""
@@ -154,3 +178,11 @@ class TestMCPConfig:
         assert config.get_server_fail_behavior("math") == FailBehavior.FAIL_CLOSED
         # Global default
         assert config.get_server_fail_behavior("api") == FailBehavior.FAIL_OPEN
+
+    def test_max_parallel_connections(self):
+        """Parallel connection limit defaults to 8 and must be positive."""
+        servers = {"math": MCPServerConfig(transport="stdio", command="python")}
+        assert MCPConfig(servers=servers).max_parallel_connections == 8
+        assert MCPConfig(servers=servers, max_parallel_connections=2).max_parallel_connections == 2
+        with pytest.raises(ValidationError):
+            MCPConfig(servers=servers, max_parallel_connections=0)
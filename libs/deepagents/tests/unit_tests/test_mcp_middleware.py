@@ -0,0 +1,347 @@
+"""Tests for MCP middleware."""
+
+import asyncio
+import functools
+import logging
+from contextlib import asynccontextmanager
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from deepagents.mcp.config import FailBehavior, MCPConfig, MCPServerConfig
+from deepagents.middleware import mcp as mcp_module
+from deepagents.middleware.mcp import MCPMiddleware, ToolCallResult, _estimate_output_size, _is_async_callable
+
+
+def _tool(name):
+    def run(x: int = 0) -> str:
+        """Echo the argument."""
+        return f"{name}:{x}"
+
+    return StructuredTool.from_function(run, name=name)
+
+
+def _server(**kwargs):
+    return MCPServerConfig(transport="stdio", command="python", **kwargs)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Install a fake MultiServerMCPClient whose servers return the given tools or raise the given errors."""
+
+    def install(server_tools):
+        class FakeMCPClient:
+            instances = []
+
+            def __init__(self, connections):
+                self.connections = connections
+                self.get_tools_calls = []
+                self.sessions_opened = 0
+                self.sessions_closed = 0
+                FakeMCPClient.instances.append(self)
+
+            async def get_tools(self, *, server_name):
+                self.get_tools_calls.append(server_name)
+                await asyncio.sleep(0)
+                result = server_tools[server_name]
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+            @asynccontextmanager
+            async def session(self, server_name):
+                self.sessions_opened += 1
+                try:
+                    yield f"{server_name}-session-{self.sessions_opened}"
+                finally:
+                    self.sessions_closed += 1
+
+        monkeypatch.setattr(mcp_module, "_get_mcp_client_class", lambda: FakeMCPClient)
+        return FakeMCPClient
+
+    return install
+
+
+class TestIsAsyncCallable:
+    """Tests for audit hook dispatch detection."""
+
+    def test_functions(self):
+        """Coroutine functions are async, plain functions are not."""
+
+        async def async_hook(info):
+            pass
+
+        def sync_hook(info):
+            pass
+
+        assert _is_async_callable(async_hook)
+        assert not _is_async_callable(sync_hook)
+        assert not _is_async_callable(functools.partial(sync_hook))
+
+    def test_callable_instances(self):
+        """Instances are async when their class defines an async __call__."""
+
+        class AsyncHook:
+            async def __call__(self, info):
+                pass
+
+        class SyncHook:
+            def __call__(self, info):
+                pass
+
+        assert _is_async_callable(AsyncHook())
+        assert not _is_async_callable(SyncHook())
+
+    def test_non_callables(self):
+        """None and other non-callables are not async."""
+        assert not _is_async_callable(None)
+        assert not _is_async_callable("hook")
+
+
+class TestEstimateOutputSize:
+    """Tests for audit output size estimation."""
+
+    def test_text_and_binary(self):
+        """Strings count characters, binary data counts bytes."""
+        assert _estimate_output_size("héllo") == 5
+        assert _estimate_output_size(b"\x00\x01") == 2
+        assert _estimate_output_size(memoryview(b"abcd")) == 4
+        assert _estimate_output_size(None) == 0
+
+    def test_containers(self):
+        """Containers sum the sizes of their items and values."""
+        assert _estimate_output_size(["ab", ("cd", b"e")]) == 5
+        assert _estimate_output_size({"key": "value", "n": ["xy"]}) == 7
+
+    def test_other_values_use_str(self):
+        """Other values are measured by their string form."""
+        assert _estimate_output_size(12345) == 5
+        assert _estimate_output_size(1.5) == 3
+
+
+class TestToolsProperty:
+    """Tests for synchronous access to MCP tools."""
+
+    def test_loads_without_running_loop(self, fake_client):
+        """Without a running loop, the property loads tools itself."""
+        fake_client({"math": [_tool("add")]})
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server()}))
+        assert [tool.name for tool in middleware.tools] == ["math_add"]
+
+    async def test_warns_inside_running_loop(self, fake_client, caplog):
+        """Inside a running loop, the property warns instead of blocking on a load."""
+        client_class = fake_client({"math": [_tool("add")]})
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server()}))
+        with caplog.at_level(logging.WARNING, logger=mcp_module.__name__):
+            assert middleware.tools == []
+        assert "load_tools_async" in caplog.text
+        assert client_class.instances == []
+
+        await middleware.load_tools_async()
+        assert [tool.name for tool in middleware.tools] == ["math_add"]
+
+
+class TestLazyServers:
+    """Tests for the list/call proxy tools of lazy servers."""
+
+    async def test_proxies_defer_connection(self, fake_client):
+        """Lazy servers expose registered proxy tools and are not contacted at load."""
+        client_class = fake_client({"math": [_tool("add"), _tool("sub")]})
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server(lazy=True)}))
+        tools = {tool.name: tool for tool in await middleware.load_tools_async()}
+
+        assert set(tools) == {"math_list_tools", "math_call_tool"}
+        assert middleware._name_registry.has_tool("math_list_tools")
+        assert middleware._name_registry.has_tool("math_call_tool")
+        assert client_class.instances[0].get_tools_calls == []
+
+        listing = await tools["math_list_tools"].ainvoke({})
+        assert listing.splitlines() == ["- add: Echo the argument.", "- sub: Echo the argument."]
+        assert await tools["math_call_tool"].ainvoke({"tool_name": "add", "arguments": {"x": 2}}) == "add:2"
+        unknown = await tools["math_call_tool"].ainvoke({"tool_name": "mul"})
+        assert unknown.startswith("Error: Unknown tool 'mul'")
+        assert client_class.instances[0].get_tools_calls == ["math"]
+
+    async def test_concurrent_first_calls_load_once(self, fake_client):
+        """Concurrent first calls share one load of the server's tools."""
+        client_class = fake_client({"math": [_tool("add")]})
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server(lazy=True)}))
+        tools = {tool.name: tool for tool in await middleware.load_tools_async()}
+
+        results = await asyncio.gather(*(tools["math_call_tool"].ainvoke({"tool_name": "add", "arguments": {"x": i}}) for i in range(5)))
+        assert results == [f"add:{i}" for i in range(5)]
+        assert client_class.instances[0].get_tools_calls == ["math"]
+
+    async def test_proxy_name_collision(self, fake_client):
+        """Proxy names that collide with loaded tools are dropped when failing open."""
+        fake_client({"eager": [_tool("math_list_tools")], "math": [_tool("add")]})
+        config = MCPConfig(servers={"eager": _server(tool_name_prefix=False), "math": _server(lazy=True)})
+        middleware = MCPMiddleware(config)
+        tools = await middleware.load_tools_async()
+        assert [tool.name for tool in tools] == ["math_list_tools"]
+        assert middleware._name_registry.get_all_tools()["math_list_tools"].server_name == "eager"
+
+
+class TestServerFailures:
+    """Tests for per-server failure handling while loading tools."""
+
+    async def test_one_server_fails_open(self, fake_client):
+        """A failing server is reported while the other servers' tools still load."""
+        fake_client({"math": [_tool("add")], "broken": ConnectionError("refused"), "text": [_tool("upper")]})
+        config = MCPConfig(servers={"math": _server(), "broken": _server(), "text": _server()})
+        middleware = MCPMiddleware(config)
+
+        tools = await middleware.load_tools_async()
+        assert [tool.name for tool in tools] == ["math_add", "text_upper"]
+        assert middleware.get_load_errors() == ["MCP server 'broken' failed: refused"]
+
+    async def test_fail_closed_propagates(self, fake_client):
+        """With fail_closed, a failing server aborts loading."""
+        fake_client({"math": [_tool("add")], "broken": ConnectionError("refused")})
+        config = MCPConfig(servers={"math": _server(), "broken": _server()}, fail_behavior=FailBehavior.FAIL_CLOSED)
+        middleware = MCPMiddleware(config)
+
+        with pytest.raises(RuntimeError, match="MCP server 'broken' failed: refused") as exc_info:
+            await middleware.load_tools_async()
+        assert isinstance(exc_info.value.__cause__, ConnectionError)
+
+    async def test_server_override_fails_closed(self, fake_client):
+        """A server's own fail_closed setting applies even when the global default fails open."""
+        fake_client({"math": [_tool("add")], "broken": ConnectionError("refused")})
+        config = MCPConfig(servers={"math": _server(), "broken": _server(fail_behavior=FailBehavior.FAIL_CLOSED)})
+
+        with pytest.raises(RuntimeError, match="broken"):
+            await MCPMiddleware(config).load_tools_async()
+
+
+class TestSessionPool:
+    """Tests for reuse of MCP sessions by the resource and prompt tools."""
+
+    async def _middleware(self, fake_client, **server_kwargs):
+        client_class = fake_client({"math": [_tool("add")]})
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server(**server_kwargs)}))
+        await middleware.load_tools_async()
+        return middleware, client_class.instances[0]
+
+    async def _borrow(self, middleware):
+        async with middleware._acquire_session("math") as session:
+            return session
+
+    async def test_reuses_session(self, fake_client):
+        """Sequential calls share one open session."""
+        middleware, client = await self._middleware(fake_client)
+        assert await self._borrow(middleware) == await self._borrow(middleware) == "math-session-1"
+        assert client.sessions_opened == 1
+        assert client.sessions_closed == 0
+        await middleware.aclose()
+
+    async def test_max_reuse_recycles_session(self, fake_client):
+        """A session is replaced after session_max_reuse calls."""
+        middleware, client = await self._middleware(fake_client, session_max_reuse=2)
+        sessions = [await self._borrow(middleware) for _ in range(3)]
+        assert sessions == ["math-session-1", "math-session-1", "math-session-2"]
+        await middleware.aclose()
+        assert client.sessions_closed == 2
+
+    async def test_idle_timeout_closes_session(self, fake_client):
+        """An idle session is closed after session_idle_timeout_s."""
+        middleware, client = await self._middleware(fake_client, session_idle_timeout_s=0.05)
+        assert await self._borrow(middleware) == "math-session-1"
+        await asyncio.sleep(0.2)
+        assert client.sessions_closed == 1
+        assert await self._borrow(middleware) == "math-session-2"
+        await middleware.aclose()
+
+    async def test_discards_session_after_error(self, fake_client):
+        """A session whose call raised is closed instead of returned to the pool."""
+        middleware, client = await self._middleware(fake_client)
+        with pytest.raises(ValueError, match="boom"):
+            async with middleware._acquire_session("math"):
+                raise ValueError("boom")
+        assert await self._borrow(middleware) == "math-session-2"
+        await asyncio.sleep(0.05)
+        assert client.sessions_closed == 1
+        await middleware.aclose()
+
+    async def test_other_loop_uses_one_off_session(self, fake_client):
+        """Calls from another event loop get a session that is closed right away."""
+        middleware, client = await self._middleware(fake_client)
+        assert await self._borrow(middleware) == "math-session-1"
+
+        one_off = await asyncio.to_thread(asyncio.run, self._borrow(middleware))
+        assert one_off == "math-session-2"
+        assert client.sessions_closed == 1
+        assert await self._borrow(middleware) == "math-session-1"
+        await middleware.aclose()
+
+    async def test_aclose_closes_pooled_sessions(self, fake_client):
+        """Closing the middleware shuts down idle sessions, and later calls open new ones."""
+        middleware, client = await self._middleware(fake_client)
+        await self._borrow(middleware)
+        await middleware.aclose()
+        assert client.sessions_closed == client.sessions_opened == 1
+        assert await self._borrow(middleware) == "math-session-2"
+        await middleware.aclose()
+        assert client.sessions_closed == 2
+
+
+class TestAuditRecords:
+    """Tests for the records passed to audit hooks."""
+
+    async def test_hooks_can_annotate_records(self, fake_client):
+        """Hooks may set fields and attach their own attributes to audit records."""
+        fake_client({"math": [_tool("add")]})
+        seen = []
+
+        def before(info):
+            info.caller_identity = "alice"
+            info.trace_id = "trace-1"
+
+        def after(info, result):
+            result.error = "flagged"
+            result.checked = True
+            seen.append((info, result))
+
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server()}), before_tool_call=before, after_tool_call=after)
+        (tool,) = await middleware.load_tools_async()
+        assert await tool.ainvoke({"x": 1}) == "add:1"
+
+        ((info, result),) = seen
+        assert (info.caller_identity, info.trace_id, info.args) == ("alice", "trace-1", {"x": 1})
+        assert result.success
+        assert (result.error, result.checked) == ("flagged", True)
+
+    async def test_aclose_delivers_and_stops_background_audit(self, fake_client):
+        """Closing the middleware delivers queued records and stops the audit task."""
+        fake_client({"math": [_tool("add")]})
+        seen = []
+        middleware = MCPMiddleware(
+            MCPConfig(servers={"math": _server()}),
+            after_tool_call=lambda info, result: seen.append(info.tool_name),
+            background_audit=True,
+        )
+        (tool,) = await middleware.load_tools_async()
+        await tool.ainvoke({})
+        task = middleware._audit_task
+
+        await middleware.aclose()
+        assert seen == ["add"]
+        assert task.cancelled()
+        assert (middleware._audit_task, middleware._audit_queue, middleware._audit_loop) == (None, None, None)
+
+    def test_result_latency_fields(self):
+        """Results keep latency_ms as a positional field, with latency_ns alongside."""
+        result = ToolCallResult(True, 1.5, 10)
+        assert (result.latency_ms, result.output_size, result.error, result.latency_ns) == (1.5, 10, None, 0)
+
+    async def test_hook_receives_both_latencies(self, fake_client):
+        """The after hook gets the latency in both units."""
+        fake_client({"math": [_tool("add")]})
+        results = []
+        middleware = MCPMiddleware(MCPConfig(servers={"math": _server()}), after_tool_call=lambda info, result: results.append(result))
+        (tool,) = await middleware.load_tools_async()
+        await tool.ainvoke({})
+
+        (result,) = results
+        assert result.latency_ns > 0
+        assert result.latency_ms == result.latency_ns / 1_000_000
@@ -113,3 +113,22 @@ class TestToolNameRegistry:
 
         assert registry.has_tool("math_add") is False
         assert len(registry.get_all_tools()) == 0
+
+    def test_register_tools_batch(self):
+        """Batch registration names unique tools and reports collisions in place."""
+        registry = ToolNameRegistry()
+        registry.register_tool("sub", "math0", "")
+        results = registry.register_tools(
+            [
+                ("add", "math1", ""),
+                ("mul", "math1", "math1"),
+                ("add", "math2", ""),
+                ("sub", "math2", ""),
+            ]
+        )
+
+        assert [r.prefixed_name for r in results[:2]] == ["add", "math1_mul"]
+        assert isinstance(results[2], ValueError)
+        assert isinstance(results[3], ValueError)
+        # First registration wins
+        assert registry.get_all_tools()["add"].server_name == "math1"
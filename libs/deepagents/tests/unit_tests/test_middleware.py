@@ -8,7 +8,7 @@ from langchain_core.messages import (
     ToolMessage,
 )
 from langgraph.store.memory import InMemoryStore
-from langgraph.types import Overwrite
+from langgraph.types import Command, Overwrite
 
 from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
 from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
@@ -66,28 +66,28 @@ class TestFilesystemMiddleware:
         middleware = FilesystemMiddleware()
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt is None
-        # ls, read_file, write_file, edit_file, glob, grep, execute, move_file, copy_file, delete_file, mkdir
-        assert len(middleware.tools) == 11
+        # ls, read_file, write_file, edit_file, batch_edit_file, glob, grep, execute, move_file, copy_file, delete_file, mkdir
+        assert len(middleware.tools) == 12
 
     def test_init_with_composite_backend(self):
         backend_factory = lambda rt: build_composite_state_backend(rt, routes={"/memories/": (lambda r: StoreBackend(r))})
         middleware = FilesystemMiddleware(backend=backend_factory)
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt is None
-        assert len(middleware.tools) == 11
+        assert len(middleware.tools) == 12
 
     def test_init_custom_system_prompt_default(self):
         middleware = FilesystemMiddleware(system_prompt="Custom system prompt")
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt == "Custom system prompt"
-        assert len(middleware.tools) == 11
+        assert len(middleware.tools) == 12
 
     def test_init_custom_system_prompt_with_composite(self):
         backend_factory = lambda rt: build_composite_state_backend(rt, routes={"/memories/": (lambda r: StoreBackend(r))})
         middleware = FilesystemMiddleware(backend=backend_factory, system_prompt="Custom system prompt")
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt == "Custom system prompt"
-        assert len(middleware.tools) == 11
+        assert len(middleware.tools) == 12
 
     def test_init_custom_tool_descriptions_default(self):
         middleware = FilesystemMiddleware(custom_tool_descriptions={"ls": "Custom ls tool description"})
@@ -104,6 +104,14 @@ class TestFilesystemMiddleware:
         ls_tool = next(tool for tool in middleware.tools if tool.name == "ls")
         assert ls_tool.description == "Custom ls tool description"
 
+    def test_init_does_not_share_tools_between_middleware(self):
+        backend_factory = lambda rt: StateBackend(rt)
+        first = FilesystemMiddleware(backend=backend_factory)
+        second = FilesystemMiddleware(backend=backend_factory)
+        assert [tool.name for tool in first.tools] == [tool.name for tool in second.tools]
+        assert all(a is not b for a, b in zip(first.tools, second.tools, strict=True))
+        assert not hasattr(backend_factory, "_filesystem_tools_cache")
+
     def test_ls_shortterm(self):
         state = FilesystemState(
             messages=[],
@@ -620,6 +628,64 @@ class TestFilesystemMiddleware:
         )
         assert "Invalid regex pattern" in result
 
+    def test_batch_edit_file_shortterm(self):
+        state = FilesystemState(
+            messages=[],
+            files={
+                "/a.py": FileData(
+                    content="x = 1\ny = 2",
+                    modified_at="2021-01-01",
+                    created_at="2021-01-01",
+                ),
+                "/b.py": FileData(
+                    content="print('hello')",
+                    modified_at="2021-01-01",
+                    created_at="2021-01-01",
+                ),
+            },
+        )
+        middleware = FilesystemMiddleware()
+        batch_edit_tool = next(tool for tool in middleware.tools if tool.name == "batch_edit_file")
+        result = batch_edit_tool.invoke(
+            {
+                "edits": [
+                    {"file_path": "/a.py", "old_string": "x = 1", "new_string": "x = 10"},
+                    {"file_path": "/b.py", "old_string": "missing", "new_string": "found"},
+                ],
+                "runtime": ToolRuntime(state=state, context=None, tool_call_id="batch", store=None, stream_writer=lambda _: None, config={}),
+            }
+        )
+        assert isinstance(result, Command)
+        assert list(result.update["files"]) == ["/a.py"]
+        assert result.update["files"]["/a.py"]["content"] == "x = 10\ny = 2"
+        message = result.update["messages"][0].content
+        assert "Successfully replaced 1 instance(s) of the string in '/a.py'" in message
+        assert "String not found" in message
+
+    def test_batch_edit_file_rejects_duplicate_paths(self):
+        state = FilesystemState(
+            messages=[],
+            files={
+                "/a.py": FileData(
+                    content="x = 1\ny = 2",
+                    modified_at="2021-01-01",
+                    created_at="2021-01-01",
+                ),
+            },
+        )
+        middleware = FilesystemMiddleware()
+        batch_edit_tool = next(tool for tool in middleware.tools if tool.name == "batch_edit_file")
+        result = batch_edit_tool.invoke(
+            {
+                "edits": [
+                    {"file_path": "/a.py", "old_string": "x = 1", "new_string": "x = 10"},
+                    {"file_path": "/a.py", "old_string": "y = 2", "new_string": "y = 20"},
+                ],
+                "runtime": ToolRuntime(state=state, context=None, tool_call_id="batch", store=None, stream_writer=lambda _: None, config={}),
+            }
+        )
+        assert "appears more than once" in result
+
     def test_search_store_paginated_empty(self):
         """Test pagination with no items."""
         store = InMemoryStore()
@@ -735,10 +801,11 @@ class TestFilesystemMiddleware:
 
         file_data = create_file_data(content)
 
-        assert len(file_data["content"]) == 2
-        assert file_data["content"][0] == short_line
-        assert file_data["content"][1] == long_line
-        assert len(file_data["content"][1]) == 3500
+        assert file_data["content"] == content
+        lines = file_data["content"].split("\n")
+        assert lines[0] == short_line
+        assert lines[1] == long_line
+        assert len(lines[1]) == 3500
 
     def test_update_file_data_preserves_long_lines(self):
         """Test that update_file_data stores long lines as-is without splitting."""
@@ -750,10 +817,11 @@ class TestFilesystemMiddleware:
 
         updated_file_data = update_file_data(initial_file_data, new_content)
 
-        assert len(updated_file_data["content"]) == 2
-        assert updated_file_data["content"][0] == short_line
-        assert updated_file_data["content"][1] == long_line
-        assert len(updated_file_data["content"][1]) == 5000
+        assert updated_file_data["content"] == new_content
+        lines = updated_file_data["content"].split("\n")
+        assert lines[0] == short_line
+        assert lines[1] == long_line
+        assert len(lines[1]) == 5000
 
         assert updated_file_data["created_at"] == initial_file_data["created_at"]
 
@@ -822,6 +890,19 @@ class TestFilesystemMiddleware:
         assert "     1\t" in lines[0]
         assert lines[0].count("b") == 10000
 
+    def test_format_content_with_line_numbers_to_buffer_matches_string_output(self):
+        """Test that the buffer writer produces the same output as the string formatter."""
+        import io
+
+        from deepagents.backends.utils import format_content_with_line_numbers, format_content_with_line_numbers_to_buffer
+
+        content = ["short", "c" * 25000, "", "end"]
+        buf = io.StringIO()
+        format_content_with_line_numbers_to_buffer(iter(content), buf, start_line=3)
+
+        assert buf.getvalue() == format_content_with_line_numbers(content, start_line=3)
+        assert "   4.2\t" in buf.getvalue()
+
     def test_read_file_with_long_lines_shows_continuation_markers(self):
         """Test that read_file displays long lines with continuation markers."""
         from deepagents.backends.utils import create_file_data, format_read_response
@@ -839,6 +920,16 @@ class TestFilesystemMiddleware:
         assert lines[2].count("z") == 5000
         assert "     3\tthird line" in lines[3]
 
+    def test_preview_lines_matches_splitlines_prefix(self):
+        """Test that the eviction preview matches a truncated splitlines() prefix."""
+        from deepagents.middleware.filesystem import _preview_lines
+
+        content = "first\r\n" + "p" * 1500 + "\n\nfourth\n" + "\n".join(f"line {i}" for i in range(20))
+        expected = [line[:1000] for line in content.splitlines()[:10]]
+        assert _preview_lines(content) == expected
+        assert _preview_lines("") == []
+        assert _preview_lines("only line\n") == ["only line"]
+
     def test_read_file_with_offset_and_long_lines(self):
         """Test that read_file with offset handles long lines correctly."""
         from deepagents.backends.utils import create_file_data, format_read_response
@@ -935,6 +1026,28 @@ class TestFilesystemMiddleware:
         assert "/large_tool_results/test_123" in result.update["files"]
         assert result.update["custom_key"] == "custom_value"
 
+    def test_intercept_command_with_multiple_long_toolmessages(self):
+        """Test that several large messages in one Command are evicted together."""
+        from langgraph.types import Command
+
+        middleware = FilesystemMiddleware(tool_token_limit_before_evict=1000)
+        state = FilesystemState(messages=[], files={})
+        runtime = ToolRuntime(state=state, context=None, tool_call_id="test_123", store=None, stream_writer=lambda _: None, config={})
+
+        messages = [
+            ToolMessage(content="a" * 5000, tool_call_id="call_a"),
+            ToolMessage(content="short", tool_call_id="call_b"),
+            ToolMessage(content="c" * 5000, tool_call_id="call_c"),
+        ]
+        command = Command(update={"messages": messages, "files": {}})
+        result = middleware._intercept_large_tool_result(command, runtime)
+
+        assert isinstance(result, Command)
+        assert set(result.update["files"]) == {"/large_tool_results/call_a", "/large_tool_results/call_c"}
+        assert "Tool result too large" in result.update["messages"][0].content
+        assert result.update["messages"][1].content == "short"
+        assert "Tool result too large" in result.update["messages"][2].content
+
     def test_sanitize_tool_call_id(self):
         """Test that tool_call_id is sanitized to prevent path traversal."""
         from deepagents.backends.utils import sanitize_tool_call_id
@@ -1042,8 +1155,7 @@ class TestFilesystemMiddleware:
 
         assert isinstance(result, Command)
         # Check that the file contains actual text, not stringified dict
-        file_content = result.update["files"]["/large_tool_results/test_single"]["content"]
-        file_text = "\n".join(file_content)
+        file_text = result.update["files"]["/large_tool_results/test_single"]["content"]
         # Should start with the actual text, not with "[{" which would indicate stringified dict
         assert file_text.startswith("Hello world!")
         assert not file_text.startswith("[{")
@@ -1066,8 +1178,7 @@ class TestFilesystemMiddleware:
 
         assert isinstance(result, Command)
         # Check that the file contains stringified structure (starts with "[")
-        file_content = result.update["files"]["/large_tool_results/test_multi"]["content"]
-        file_text = "\n".join(file_content)
+        file_text = result.update["files"]["/large_tool_results/test_multi"]["content"]
         # Should be stringified list of dicts
         assert file_text.startswith("[{")
 
@@ -1089,8 +1200,7 @@ class TestFilesystemMiddleware:
 
         assert isinstance(result, Command)
         # Check that the file contains stringified structure
-        file_content = result.update["files"]["/large_tool_results/test_mixed"]["content"]
-        file_text = "\n".join(file_content)
+        file_text = result.update["files"]["/large_tool_results/test_mixed"]["content"]
         assert file_text.startswith("[{")
         # Should contain both blocks in the stringified output
         assert "'type': 'text'" in file_text
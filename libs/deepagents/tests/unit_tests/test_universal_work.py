@@ -4,6 +4,7 @@ Tests backward compatibility with TodoListMiddleware and new functionality.
 """
 
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from deepagents.middleware.universal_work import (
@@ -82,6 +83,23 @@ class TestPlanStepModel:
         assert step.work_item_id == "work-item-123"
         assert step.position == 1
 
+    def test_plan_step_from_todo_dicts(self) -> None:
+        """Test creating a whole plan from todo dicts."""
+        todos = [
+            {"content": "First", "status": "completed"},
+            {"content": "Second", "status": "in_progress", "activeForm": "Doing second"},
+            {"content": "Third"},
+        ]
+        steps = PlanStep.from_todo_dicts(todos, "work-item-123")
+
+        assert [s.content for s in steps] == ["First", "Second", "Third"]
+        assert [s.position for s in steps] == [0, 1, 2]
+        assert [s.status for s in steps] == [PlanStepStatus.COMPLETED, PlanStepStatus.IN_PROGRESS, PlanStepStatus.PENDING]
+        assert steps[1].active_form == "Doing second"
+        assert all(s.work_item_id == "work-item-123" for s in steps)
+        assert len({s.id for s in steps}) == 3
+        assert len({s.created_at for s in steps}) == 1
+
     def test_plan_step_to_todo_dict(self) -> None:
         """Test converting PlanStep to todo dict (backward compatibility)."""
         step = PlanStep(
@@ -157,6 +175,96 @@ class TestFileBackendStorage:
             assert retrieved[0].content == "Step 1"
             assert retrieved[1].content == "Step 2"
 
+    def test_dict_reads_match_models(self) -> None:
+        """Dict read paths return the same shapes as converting the models."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            item = storage.create_work_item(WorkItem(title="Item"))
+            other = storage.create_work_item(WorkItem(title="Other"))
+            storage.replace_plan_steps(
+                item.id,
+                [
+                    PlanStep(work_item_id=item.id, content="Done", status=PlanStepStatus.COMPLETED),
+                    PlanStep(work_item_id=item.id, content="Doing", status=PlanStepStatus.IN_PROGRESS, active_form="Doing it"),
+                ],
+            )
+            storage.create_link(Link(from_id=item.id, to_id=other.id, link_type=LinkType.RELATED_TO, confidence=0.5))
+
+            assert storage.get_plan_steps_dicts(item.id) == [s.to_todo_dict() for s in storage.get_plan_steps(item.id)]
+            assert storage.get_links_dicts(other.id) == [
+                {"id": l.id, "from": l.from_id, "to": l.to_id, "type": l.link_type.value, "confidence": l.confidence}
+                for l in storage.get_links(other.id)
+            ]
+
+    def test_work_item_summaries_match_models(self) -> None:
+        """Summaries apply the same filters and ordering as list_work_items."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            storage.create_work_item(WorkItem(title="Auth bug", domain="auth", labels=["bug"]))
+            storage.create_work_item(WorkItem(title="Auth docs", domain="auth", status=WorkItemStatus.IN_PROGRESS))
+            storage.create_work_item(WorkItem(title="DB migration", domain="db", labels=["bug"]))
+
+            def expected(**filters):
+                return [
+                    {
+                        "id": i.id,
+                        "title": i.title,
+                        "status": i.status.value,
+                        "priority": i.priority,
+                        "domain": i.domain,
+                        "created_at": i.created_at.isoformat(),
+                    }
+                    for i in storage.list_work_items(**filters)
+                ]
+
+            for filters in ({}, {"domain": "auth"}, {"labels": ["bug"]}, {"status": WorkItemStatus.IN_PROGRESS}, {"limit": 2}):
+                assert storage.list_work_item_summaries(**filters) == expected(**filters)
+
+            with storage.buffered():
+                storage.create_work_item(WorkItem(title="Pending", status=WorkItemStatus.ACCEPTED))
+                summaries = storage.list_work_item_summaries(status=WorkItemStatus.ACCEPTED)
+                assert [s["title"] for s in summaries] == ["Pending"]
+                assert summaries[0]["status"] == "accepted"
+
+    def test_list_work_item_summaries_fills_model_defaults(self) -> None:
+        """Summaries of stored items missing optional fields use the model defaults."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            item = storage.create_work_item(WorkItem(title="Legacy"))
+            items = storage._read_json("work_items.json")
+            for key in ("status", "priority", "domain", "labels"):
+                del items[item.id][key]
+            storage._write_json("work_items.json", items)
+
+            summaries = storage.list_work_item_summaries(domain="general")
+            assert len(summaries) == 1
+            assert summaries[0]["status"] == "inbox"
+            assert summaries[0]["priority"] == 2
+            assert summaries[0]["domain"] == "general"
+
+    def test_bulk_replace_plan_steps(self) -> None:
+        """Test replacing the plans of several work items at once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            item1 = storage.create_work_item(WorkItem(title="First"))
+            item2 = storage.create_work_item(WorkItem(title="Second"))
+            storage.replace_plan_steps(item1.id, [PlanStep(work_item_id=item1.id, content="Old")])
+
+            storage.bulk_replace_plan_steps(
+                {
+                    item1.id: [PlanStep(work_item_id="", content="New 1")],
+                    item2.id: [
+                        PlanStep(work_item_id="", content="New 2a"),
+                        PlanStep(work_item_id="", content="New 2b"),
+                    ],
+                }
+            )
+
+            assert [s.content for s in storage.get_plan_steps(item1.id)] == ["New 1"]
+            steps2 = storage.get_plan_steps(item2.id)
+            assert [s.content for s in steps2] == ["New 2a", "New 2b"]
+            assert storage.get_work_item(item2.id).plan_step_ids == [s.id for s in steps2]
+
     def test_context_management(self) -> None:
         """Test current work item context."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -170,6 +278,50 @@ class TestFileBackendStorage:
             storage.set_current_work_item_id(None)
             assert storage.get_current_work_item_id() is None
 
+    def test_version_tracks_writes(self) -> None:
+        """Version changes on writes but not on reads."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            before = storage.version()
+
+            item = storage.create_work_item(WorkItem(title="Versioned"))
+            after_create = storage.version()
+            assert after_create != before
+
+            storage.get_work_item(item.id)
+            storage.list_work_items()
+            assert storage.version() == after_create
+
+    def test_buffered_writes(self) -> None:
+        """Buffered writes are visible to reads and persisted on exit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            items_file = Path(tmpdir) / "work_items.json"
+            on_disk = items_file.read_text()
+
+            with storage.buffered():
+                item = storage.create_work_item(WorkItem(title="Buffered"))
+                item.status = WorkItemStatus.IN_PROGRESS
+                storage.update_work_item(item)
+
+                assert storage.get_work_item(item.id).status == WorkItemStatus.IN_PROGRESS
+                assert items_file.read_text() == on_disk
+
+            reloaded = FileBackendStorage(tmpdir).get_work_item(item.id)
+            assert reloaded is not None
+            assert reloaded.status == WorkItemStatus.IN_PROGRESS
+
+    def test_buffered_writes_are_per_thread(self) -> None:
+        """A buffered() block on one thread doesn't capture another thread's writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+
+            with storage.buffered():
+                storage.create_work_item(WorkItem(title="Buffered"))
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    other = executor.submit(storage.create_work_item, WorkItem(title="Direct")).result()
+                assert FileBackendStorage(tmpdir).get_work_item(other.id) is not None
+
 
 class TestLinkOperations:
     """Tests for Link operations."""
@@ -328,6 +480,53 @@ class TestTriageEngine:
             suggested_ids = [s.suggested_value for s in all_suggestions]
             assert item1.id in suggested_ids
 
+    def test_batch_suggestions(self) -> None:
+        """Batch triage covers every requested item and reports unknown IDs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            engine = TriageEngine(storage)
+
+            item1 = storage.create_work_item(WorkItem(title="Fix login page bug", body="Users cannot login"))
+            item2 = storage.create_work_item(WorkItem(title="Login page not working", body="Users cannot login"))
+
+            rebuilds = 0
+            rebuild_index = engine.retrieval.rebuild_index
+
+            def counting_rebuild():
+                nonlocal rebuilds
+                rebuilds += 1
+                rebuild_index()
+
+            engine.retrieval.rebuild_index = counting_rebuild
+
+            results = engine.generate_suggestions_batch([item1.id, item2.id, "missing"], modes=["related"])
+
+            assert rebuilds == 1
+            assert results["missing"] == "WorkItem missing not found"
+            assert item2.id in [s.suggested_value for s in results[item1.id].related]
+            assert item1.id in [s.suggested_value for s in results[item2.id].related]
+
+    def test_priority_only_skips_retrieval(self) -> None:
+        """Priority suggestions don't need candidate retrieval."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = FileBackendStorage(tmpdir)
+            engine = TriageEngine(storage)
+
+            item = WorkItem(title="Urgent outage", body="Production is down")
+            storage.create_work_item(item)
+
+            def fail_search(*args: object, **kwargs: object) -> None:
+                raise AssertionError("retrieval should not run for priority-only triage")
+
+            engine.retrieval.search = fail_search
+
+            bundle = engine.generate_suggestions(item.id, modes=["priority"])
+
+            assert bundle.priority is not None
+            assert bundle.priority.suggested_value == 0
+            assert bundle.duplicates == []
+            assert bundle.related == []
+
 
 class TestUniversalWorkMiddleware:
     """Tests for UniversalWorkMiddleware."""
@@ -364,3 +563,51 @@ class TestUniversalWorkMiddleware:
             assert "write_todos" in tool_names
             assert "read_todos" in tool_names
             assert "work_item_create" not in tool_names
+
+    def test_middleware_batch_tools_opt_in(self) -> None:
+        """Test batch tools are only enabled when requested."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            default_names = [t.name for t in UniversalWorkMiddleware(storage_path=tmpdir).tools]
+            assert not set(UniversalWorkMiddleware.OPTIONAL_TOOLS) & set(default_names)
+
+            middleware = UniversalWorkMiddleware(
+                storage_path=tmpdir,
+                enabled_tools=[*UniversalWorkMiddleware.ALL_TOOLS, *UniversalWorkMiddleware.OPTIONAL_TOOLS],
+            )
+            tool_names = [t.name for t in middleware.tools]
+            assert tool_names == default_names + UniversalWorkMiddleware.OPTIONAL_TOOLS
+
+    def test_middleware_instances_share_storage_executor(self) -> None:
+        """Test middleware instances do not each start their own storage worker."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = UniversalWorkMiddleware(storage_path=tmpdir)
+            second = UniversalWorkMiddleware(storage_path=tmpdir)
+            assert first._storage_executor is second._storage_executor
+
+    def test_combine_system_prompt_reuses_last_result(self) -> None:
+        """Test the combined system prompt is reused while the base prompt object is unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            middleware = UniversalWorkMiddleware(storage_path=tmpdir)
+            base = "Base prompt"
+            combined = middleware._combine_system_prompt(base, "Extra")
+            assert combined == "Base prompt\n\nExtra"
+            assert middleware._combine_system_prompt(base, "Extra") is combined
+            assert middleware._combine_system_prompt("Other", "Extra") == "Other\n\nExtra"
+            assert middleware._combine_system_prompt(None, "Extra") == "Extra"
+
+    def test_read_tools_return_structured_data(self) -> None:
+        """Test read tools return dicts and lists rather than JSON strings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            middleware = UniversalWorkMiddleware(storage_path=tmpdir)
+            tools = {t.name: t for t in middleware.tools}
+
+            assert tools["read_todos"].func(runtime=None) == []
+            tools["write_todos"].func(todos=[{"content": "Step", "status": "in_progress"}], runtime=None)
+            todos = tools["read_todos"].func(runtime=None)
+            assert todos == [{"content": "Step", "status": "in_progress"}]
+
+            item_id = middleware.storage.get_current_work_item_id()
+            item = tools["work_item_get"].func(item_id=item_id)
+            assert item["plan_steps"] == todos
+            assert [summary["id"] for summary in tools["inbox_list"].func(status="in_progress")] == [item_id]
+            assert tools["link_list"].func(item_id=item_id) == []